@@ -1,5 +1,28 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 import streamlit.components.v1 as components
+from streamlit.logger import get_logger
+
+from quimera import metrics
+from quimera.downsample import lttb
+from quimera.fast import MAX_RELATIVE_ERROR
+from quimera.history import ScoreHistory
+from quimera.ingest import read_snapshot
+from quimera.kernel import PHASE_LABELS, PHASE_THRESHOLDS, compute_log_r
+from quimera.profiles import ENGINE_TYPES, encode_engine_types, load_profiles
+from quimera.sample import synthetic_fleet
+from quimera.stream import DEFAULT_CHUNK_ROWS, detect_format, score_chunk, stream_score
+from quimera.sweep import decimate, sweep_r
+from quimera.uncertainty import U_DISTRIBUTIONS, r_uncertainty, sample_inputs, sobol_points
 
 # =====================================================================
 # CONFIGURAÇÃO GLOBAL DO STREAMLIT
@@ -31,904 +54,659 @@ st.markdown(hide_st_style, unsafe_allow_html=True)
 
 # =====================================================================
 # CÓDIGO FONTE DA APLICAÇÃO (SINGLE PAGE APPLICATION)
-# Contém HTML semântico, CSS (Dark/Neon Theme) e JavaScript (Lógica).
-# Utilizamos 'r' antes da string para preservar as barras do LaTeX.
+# O documento HTML (CSS Dark/Neon + JavaScript) vive em frontend/ e é
+# servido como componente declarado: o navegador o baixa por HTTP uma
+# única vez por carga de página e cada rerun envia apenas os argumentos.
 # =====================================================================
-html_code = r"""
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="description" content="Sistema de análise de confiabilidade de propulsores baseado na Equação Quimera.">
-    <title>EngineRel - Dashboard Telemétrico</title>
-
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;800;900&family=JetBrains+Mono:wght@400;700;800&display=swap" rel="stylesheet">
-
-    <script src="https://polyfill.io/v3/polyfill.min.js?features=es6"></script>
-    <script id="MathJax-script" async src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>
-
-    <style>
-        /* =====================================================================
-           SISTEMA DE DESIGN: VARIÁVEIS GLOBAIS
-           Definição de paleta de cores, tipografia e espaçamentos.
-        ===================================================================== */
-        :root {
-            /* Paleta de Cores de Fundo */
-            --bg-base: #09090b;
-            --bg-panel: #18181b;
-            --bg-input: #000000;
-
-            /* Paleta de Cores de Destaque (Neon) */
-            --blue-primary: #00d2ff;
-            --blue-glow: rgba(0, 210, 255, 0.3);
-            
-            --green-primary: #39ff14;
-            --green-glow: rgba(57, 255, 20, 0.2);
-            
-            --red-primary: #ff2a2a;
-            --red-glow: rgba(255, 42, 42, 0.3);
-            
-            --purple-primary: #b026ff;
-            --purple-glow: rgba(176, 38, 255, 0.2);
-            
-            --orange-primary: #ffb86c;
-            --orange-glow: rgba(255, 184, 108, 0.2);
-
-            /* Tipografia e Bordas */
-            --text-main: #e4e4e7;
-            --text-muted: #a1a1aa;
-            --border-color: #27272a;
-
-            --font-ui: 'Inter', sans-serif;
-            --font-code: 'JetBrains Mono', monospace;
-
-            /* Sombras Padrão */
-            --shadow-panel: 0 10px 30px rgba(0, 0, 0, 0.8);
-        }
-
-        /* =====================================================================
-           RESET E CONFIGURAÇÕES BÁSICAS
-        ===================================================================== */
-        * {
-            box-sizing: border-box;
-            margin: 0;
-            padding: 0;
-        }
-
-        body {
-            background-color: var(--bg-base);
-            color: var(--text-main);
-            font-family: var(--font-ui);
-            line-height: 1.6;
-            padding: 20px;
-            overflow-x: hidden;
-            min-height: 100vh;
-            display: flex;
-            flex-direction: column;
-        }
-
-        /* Customização da Barra de Rolagem */
-        ::-webkit-scrollbar {
-            width: 10px;
-        }
-        ::-webkit-scrollbar-track {
-            background: var(--bg-base);
-        }
-        ::-webkit-scrollbar-thumb {
-            background: var(--border-color);
-            border-radius: 5px;
-        }
-        ::-webkit-scrollbar-thumb:hover {
-            background: var(--blue-primary);
-        }
-
-        /* =====================================================================
-           CABEÇALHO E NAVEGAÇÃO (TABS)
-        ===================================================================== */
-        .app-header {
-            text-align: center;
-            margin-bottom: 30px;
-            padding-top: 20px;
-        }
-
-        .nav-tabs {
-            display: flex;
-            justify-content: center;
-            gap: 20px;
-            margin-bottom: 40px;
-            border-bottom: 1px solid var(--border-color);
-            padding-bottom: 10px;
-        }
-
-        .tab-btn {
-            background: transparent;
-            color: var(--text-muted);
-            border: none;
-            font-size: 1.2rem;
-            font-weight: 800;
-            cursor: pointer;
-            padding: 10px 20px;
-            text-transform: uppercase;
-            letter-spacing: 2px;
-            transition: all 0.3s ease;
-            position: relative;
-        }
-
-        .tab-btn:hover {
-            color: var(--text-main);
-        }
-
-        .tab-btn.active {
-            color: var(--blue-primary);
-            text-shadow: 0 0 10px var(--blue-glow);
-        }
-
-        .tab-btn.active::after {
-            content: '';
-            position: absolute;
-            bottom: -11px;
-            left: 0;
-            width: 100%;
-            height: 3px;
-            background: var(--blue-primary);
-            box-shadow: 0 0 10px var(--blue-glow);
-        }
-
-        /* Transições de Conteúdo das Abas */
-        .tab-content {
-            display: none;
-            animation: fadeIn 0.6s cubic-bezier(0.16, 1, 0.3, 1);
-            flex-grow: 1;
-        }
-
-        .tab-content.active {
-            display: block;
-        }
-
-        @keyframes fadeIn {
-            from {
-                opacity: 0;
-                transform: translateY(20px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-
-        /* =====================================================================
-           ESTRUTURA DE GRIDS E PAINÉIS
-        ===================================================================== */
-        .grid-container {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 40px;
-            max-width: 1400px;
-            margin: 0 auto;
-        }
-
-        .single-container {
-            max-width: 1000px;
-            margin: 0 auto;
-        }
-
-        .panel {
-            background-color: var(--bg-panel);
-            border: 1px solid var(--border-color);
-            border-radius: 16px;
-            padding: 40px;
-            box-shadow: var(--shadow-panel);
-            position: relative;
-            overflow: hidden;
-        }
-
-        .panel::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 4px;
-            background: linear-gradient(90deg, var(--blue-primary), var(--purple-primary));
-            opacity: 0.5;
-        }
-
-        .panel-title {
-            color: #ffffff;
-            font-size: 1.8rem;
-            font-weight: 900;
-            margin-bottom: 25px;
-            border-bottom: 2px solid var(--border-color);
-            padding-bottom: 10px;
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-        }
-
-        /* =====================================================================
-           ABA 1: TEORIA E SISTEMAS DINÂMICOS
-        ===================================================================== */
-        .theory-text {
-            font-size: 1.1rem;
-            color: var(--text-muted);
-            margin-bottom: 20px;
-            text-align: justify;
-            line-height: 1.8;
-        }
-
-        .theory-highlight {
-            color: var(--purple-primary);
-            font-weight: 800;
-            text-shadow: 0 0 10px var(--purple-glow);
-        }
-
-        .math-box {
-            background-color: var(--bg-input);
-            padding: 30px;
-            border-radius: 12px;
-            border: 1px solid var(--purple-primary);
-            box-shadow: inset 0 0 30px var(--purple-glow);
-            text-align: center;
-            font-size: 1.5rem;
-            margin: 30px 0;
-            overflow-x: auto;
-        }
-
-        .feature-list {
-            list-style-type: none;
-            margin-top: 20px;
-        }
-
-        .feature-list li {
-            position: relative;
-            padding-left: 25px;
-            margin-bottom: 15px;
-            color: var(--text-muted);
-            font-size: 1.1rem;
-        }
-
-        .feature-list li::before {
-            content: ' ⊳ ';
-            position: absolute;
-            left: 0;
-            color: var(--blue-primary);
-            font-weight: bold;
-        }
-
-        /* =====================================================================
-           ABA 2: DASHBOARD (GALERIA E FORMULÁRIOS)
-        ===================================================================== */
-        .image-gallery {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 15px;
-            margin-bottom: 30px;
-        }
-
-        .image-gallery img {
-            width: 100%;
-            height: 220px;
-            object-fit: cover;
-            border-radius: 8px;
-            border: 1px solid var(--border-color);
-            transition: all 0.4s ease;
-            filter: grayscale(60%) opacity(0.8);
-        }
-
-        .image-gallery img:hover {
-            filter: grayscale(0%) opacity(1);
-            border-color: var(--blue-primary);
-            box-shadow: 0 0 20px var(--blue-glow);
-            transform: scale(1.02);
-        }
-        
-        .alert-box {
-            background: var(--bg-input);
-            padding: 20px;
-            border-radius: 8px;
-            border-left: 4px solid var(--blue-primary);
-            margin-top: 20px;
-        }
-
-        .alert-box p {
-            color: var(--text-muted);
-            font-size: 0.95rem;
-            line-height: 1.5;
-        }
-
-        /* Campos de Formulário */
-        .input-group {
-            margin-bottom: 25px;
-            position: relative;
-        }
-
-        .input-group label {
-            display: block;
-            font-size: 0.85rem;
-            font-weight: 800;
-            color: var(--blue-primary);
-            text-transform: uppercase;
-            margin-bottom: 8px;
-            letter-spacing: 1px;
-        }
-
-        .input-group input,
-        .input-group select {
-            width: 100%;
-            background-color: var(--bg-input);
-            border: 1px solid var(--border-color);
-            color: #ffffff;
-            padding: 16px;
-            border-radius: 8px;
-            font-family: var(--font-code);
-            font-size: 1.1rem;
-            transition: all 0.3s ease;
-        }
-
-        .input-group input:focus,
-        .input-group select:focus {
-            outline: none;
-            border-color: var(--blue-primary);
-            box-shadow: 0 0 15px var(--blue-glow);
-        }
-
-        /* Botão de Processamento */
-        .btn-process {
-            width: 100%;
-            background: transparent;
-            color: var(--blue-primary);
-            border: 2px solid var(--blue-primary);
-            padding: 18px;
-            font-family: var(--font-ui);
-            font-size: 1.2rem;
-            font-weight: 900;
-            text-transform: uppercase;
-            letter-spacing: 2px;
-            border-radius: 8px;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            position: relative;
-            overflow: hidden;
-            margin-top: 10px;
-        }
-
-        .btn-process:hover {
-            background: var(--blue-primary);
-            color: #000000;
-            box-shadow: 0 0 30px var(--blue-glow);
-        }
-
-        .btn-process:disabled {
-            border-color: var(--border-color);
-            color: var(--border-color);
-            cursor: not-allowed;
-            background: transparent;
-            box-shadow: none;
-        }
-
-        /* =====================================================================
-           RESULTADOS TELEMÉTRICOS
-        ===================================================================== */
-        .telemetry-results {
-            display: none;
-            margin-top: 30px;
-            padding: 30px;
-            background-color: var(--bg-input);
-            border-radius: 12px;
-            border-left: 5px solid var(--border-color);
-            transition: all 0.5s ease;
-        }
-
-        .result-r {
-            font-family: var(--font-code);
-            font-size: 4.5rem;
-            font-weight: 900;
-            line-height: 1;
-            margin: 15px 0;
-            text-shadow: 0 0 20px rgba(0,0,0,0.5);
-        }
-
-        .result-status {
-            font-weight: 900;
-            font-size: 1.2rem;
-            padding: 12px 20px;
-            border-radius: 6px;
-            display: inline-block;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-
-        .stats-grid {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 15px;
-            margin-top: 25px;
-            border-top: 1px solid var(--border-color);
-            padding-top: 25px;
-        }
-
-        .stat-box {
-            background: var(--bg-panel);
-            padding: 15px;
-            border-radius: 8px;
-            border: 1px solid var(--border-color);
-        }
-
-        .stat-label {
-            font-size: 0.8rem;
-            color: var(--text-muted);
-            text-transform: uppercase;
-            font-weight: 800;
-        }
-
-        .stat-val {
-            font-family: var(--font-code);
-            font-size: 1.3rem;
-            color: #ffffff;
-            margin-top: 5px;
-            font-weight: 700;
-        }
-
-        /* =====================================================================
-           RODAPÉ E LOADING SIMULATION
-        ===================================================================== */
-        .loading-spinner {
-            display: none;
-            text-align: center;
-            margin-top: 20px;
-            color: var(--blue-primary);
-            font-family: var(--font-code);
-            font-weight: bold;
-            animation: pulse 1s infinite;
-        }
-
-        @keyframes pulse {
-            0% { opacity: 0.5; }
-            50% { opacity: 1; }
-            100% { opacity: 0.5; }
-        }
-
-        footer {
-            text-align: center;
-            padding: 40px 20px;
-            color: var(--border-color);
-            font-size: 0.9rem;
-            margin-top: auto;
-        }
-
-        /* =====================================================================
-           MEDIA QUERIES (RESPONSIVIDADE)
-        ===================================================================== */
-        @media (max-width: 1200px) {
-            .grid-container {
-                gap: 20px;
-            }
-            .panel {
-                padding: 30px;
-            }
-        }
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+
+# Pacote offline gerado por build_assets.py (fontes, imagens e LaTeX locais).
+# ENGINEREL_ASSETS=cdn força a fonte; por padrão (ou com =bundled) usa o
+# pacote se existir e tiver sido gerado a partir do index.html atual.
+BUNDLED_DIR = os.path.join(FRONTEND_DIR, "bundled")
+BUNDLE_MANIFEST = os.path.join(BUNDLED_DIR, "bundle.json")
+
+logger = get_logger(__name__)
+
+
+def resolve_frontend_dir():
+    """Retorna (diretório do documento, aviso ou None).
+
+    O pacote é gerado à mão e fica fora do git: se o hash gravado por
+    build_assets.py não for o do index.html atual, servi-lo esconderia
+    as edições posteriores da página, então a fonte é servida no lugar.
+    """
+    mode = os.environ.get("ENGINEREL_ASSETS", "").strip().lower()
+    if mode == "cdn":
+        return FRONTEND_DIR, None
+    if not os.path.isfile(os.path.join(BUNDLED_DIR, "index.html")):
+        if mode == "bundled":
+            return FRONTEND_DIR, "Pacote offline ausente; servindo frontend/index.html."
+        return FRONTEND_DIR, None
+
+    try:
+        with open(BUNDLE_MANIFEST, encoding="utf-8") as manifest:
+            built_from = json.load(manifest)["source_sha256"]
+    except (OSError, ValueError, KeyError):
+        built_from = None
+    with open(os.path.join(FRONTEND_DIR, "index.html"), "rb") as source:
+        current = hashlib.sha256(source.read()).hexdigest()
+    if built_from != current:
+        return FRONTEND_DIR, (
+            "O pacote offline (frontend/bundled) não corresponde ao frontend/index.html "
+            "atual; servindo a fonte. Gere-o de novo com python build_assets.py."
+        )
+    return BUNDLED_DIR, None
+
+
+@st.cache_resource
+def load_component(frontend_dir):
+    """Registra o componente uma vez por processo, nomeado pelo hash do conteúdo.
+
+    O hash no nome garante que uma nova versão do documento nunca seja
+    confundida com a anterior. Retorna (componente, bytes, digest).
+    """
+    with open(os.path.join(frontend_dir, "index.html"), "rb") as page:
+        payload = page.read()
+    digest = hashlib.sha256(payload).hexdigest()[:12]
+    logger.info(
+        "Componente EngineRel %s: %d bytes na carga a frio (%s)",
+        digest,
+        len(payload),
+        os.path.relpath(os.path.join(frontend_dir, "index.html")),
+    )
+    component = components.declare_component(f"enginerel_{digest}", path=frontend_dir)
+    return component, len(payload), digest
+
+
+@st.cache_resource
+def load_profile_set():
+    """Perfis de engineType (profiles.json), lidos uma vez por processo."""
+    return load_profiles()
+
+
+# Histórico de pontuações (SQLite). ENGINEREL_HISTORY troca o arquivo.
+HISTORY_PATH = os.environ.get(
+    "ENGINEREL_HISTORY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.db"),
+)
 
-        @media (max-width: 992px) {
-            .grid-container {
-                grid-template-columns: 1fr;
-            }
-            .result-r {
-                font-size: 3.5rem;
-            }
-        }
 
-        @media (max-width: 576px) {
-            .nav-tabs {
-                flex-direction: column;
-                align-items: center;
-            }
-            .tab-btn {
-                width: 100%;
-                text-align: center;
-            }
-            .stats-grid {
-                grid-template-columns: 1fr;
-            }
-        }
-    </style>
-</head>
-<body>
-
-    <header class="app-header">
-        <h1 style="font-size: 2.5rem; font-weight: 900; color: #fff;">
-            Engine<span style="color: var(--blue-primary)">Rel</span>
-        </h1>
-    </header>
-
-    <nav class="nav-tabs" aria-label="Navegação Principal">
-        <button class="tab-btn active" onclick="openTab('tab-theory')" id="btn-theory">
-            Visão & Teoria
-        </button>
-        <button class="tab-btn" onclick="openTab('tab-dashboard')" id="btn-dashboard">
-            Dashboard Telemétrico
-        </button>
-    </nav>
-
-    <main id="tab-theory" class="tab-content active" role="tabpanel">
-        <div class="single-container panel">
-            <div class="panel-title">
-                Modelagem Quimera (Multi-Fator)
-                <span style="font-size: 0.9rem; color: var(--text-muted); font-weight: 400;">v4.1.0</span>
-            </div>
-            
-            <p class="theory-text">
-                A fórmula do <strong>EngineRel</strong> transcende a simples métrica de falhas pontuais. 
-                Ela é uma abstração matemática projetada para descrever o comportamento de um 
-                <span class="theory-highlight">Sistema Dinâmico Não-Linear</span>.
-                Sistemas mecânicos de alta complexidade operam em um estado de equilíbrio tênue, 
-                onde o tempo absoluto, o desgaste físico e a consistência de uso interagem de forma caótica.
-            </p>
-
-            <div class="math-box">
-                $$ R = \frac{e^{\alpha \lambda} \cdot \ln(\ln(\Gamma(\alpha + 2))) \cdot \sqrt{t_{cd}} \cdot \left(1 + \frac{1}{t_c}\right)^{t_c}}{u} $$
-            </div>
-
-            <h3 style="color: #ffffff; margin: 40px 0 20px 0; font-weight: 800;">Análise Vetorial do Sistema</h3>
-            
-            <ul class="feature-list">
-                <li>
-                    <strong>O Atrator de Euler:</strong> O termo \( (1 + 1/t_c)^{t_c} \) atua como um atrator de 
-                    estabilidade no espaço de fase. À medida que o tempo (\( t_c \)) passa sem interrupções, 
-                    o sistema converge assintoticamente para a constante de Euler (\( e \)), sugerindo matematicamente 
-                    que as falhas prematuras (mortalidade infantil de engenharia) foram superadas.
-                </li>
-                <li>
-                    <strong>A Raiz de Desgaste (\( \sqrt{t_{cd}} \)):</strong> Introduzida para modelar a fadiga de material a longo prazo, converte os dias corridos (\( t_{cd} \)) num fator de escalada geométrica, suavizando a curva de risco nas fases iniciais.
-                </li>
-                <li>
-                    <strong>Micro-Falhas e Função Gama:</strong> O bloco logarítmico duplo de Gama garante que a taxa de estragos (\( \lambda \)) ponderada pelas condições limítrofes operacionais (\( \alpha \)) amorteça números infinitos sem perder o rasto do estado microscópico da mecânica.
-                </li>
-            </ul>
-        </div>
-    </main>
-
-    <main id="tab-dashboard" class="tab-content" role="tabpanel">
-        <div class="grid-container">
-            
-            <section class="panel">
-                <div class="panel-title">
-                    Alvos de Propulsão 
-                    <span style="font-size: 1.2rem;"> 🚀 </span>
-                </div>
-                
-                <div class="image-gallery">
-                    <img src="https://images.unsplash.com/photo-1486262715619-67b85e0b08d3?auto=format&fit=crop&q=80" alt="Motor de Combustão V8 em operação com alta temperatura">
-                    <img src="https://images.unsplash.com/photo-1541185933-ef5d8ed016c2?auto=format&fit=crop&q=80" alt="Exaustão de um propulsor de foguete espacial durante lançamento">
-                </div>
-
-                <div class="alert-box">
-                    <p>
-                        <strong> ⚠️  Aviso de Restrição do Sistema:</strong><br>
-                        O núcleo algorítmico do índice \( R \) foi atualizado para a arquitetura Quimera. 
-                        A complexidade analítica integra micro-falhas (\( \alpha \) e \( \lambda \)) com a elegância da degradação estrutural em dias (\( \sqrt{t_{cd}} \)). Valide rigorosamente os inputs para evitar cálculos assintóticos imprevistos.
-                    </p>
-                </div>
-            </section>
-
-            <section class="panel">
-                <div class="panel-title">
-                    Console de Telemetria 
-                    <span style="font-size: 1.2rem;"> ⏱️ </span>
-                </div>
-
-                <form id="engineForm" novalidate>
-                    <div class="input-group">
-                        <label for="engineType">Perfil Estrutural do Equipamento</label>
-                        <select id="engineType" name="engineType">
-                            <option value="Combustão">Motor V8 / V6 (Automotivo Pesado)</option>
-                            <option value="Aeroespacial">Turbofã (Aeroespacial Comercial)</option>
-                            <option value="Propulsor">Propulsor Criogênico (Espacial)</option>
-                            <option value="Gerador">Gerador a Diesel (Uso Contínuo)</option>
-                        </select>
-                    </div>
-
-                    <div class="input-group">
-                        <label for="failures">Eventos de Falha (Histórico 365 dias)</label>
-                        <input type="number" id="failures" name="failures" value="3" min="0" step="1" required 
-                               placeholder="Ex: 2">
-                    </div>
-
-                    <div class="input-group">
-                        <label for="tc_days">Ciclo desde o último reparo (Em Dias)</label>
-                        <input type="number" id="tc_days" name="tc_days" value="7000" min="0" step="0.1" required 
-                               placeholder="Ex: 365">
-                    </div>
-
-                    <div class="input-group">
-                        <label for="u_hours">Carga Operacional Diária Média (Em Horas)</label>
-                        <input type="number" id="u_hours" name="u_hours" value="18" min="0.1" max="24" step="0.1" required 
-                               placeholder="Ex: 12.5">
-                    </div>
-
-                    <button type="submit" class="btn-process" id="btnSubmit">
-                        Processar Vetor de Risco (R)
-                    </button>
-
-                    <div class="loading-spinner" id="loadingState">
-                        [ CALIBRANDO MATRIZ DE DADOS... AGUARDE ]
-                    </div>
-                </form>
-
-                <div class="telemetry-results" id="telemetryPanel">
-                    <div style="font-size: 0.9rem; color: var(--text-muted); font-weight: 800; letter-spacing: 2px;">
-                        ÍNDICE GLOBAL DE RISCO ESTRUTURAL
-                    </div>
-                    
-                    <div class="result-r" id="valR">0.000000</div>
-                    <div class="result-status" id="statusMessage">Aguardando telemetria...</div>
-
-                    <div class="stats-grid">
-                        <div class="stat-box">
-                            <div class="stat-label">Minutos Acumulados (tc)</div>
-                            <div class="stat-val" id="valTcMin">0</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-label">Minutos Uso Diário (u)</div>
-                            <div class="stat-val" id="valUMin">0</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-label">Fator de Desvio (α)</div>
-                            <div class="stat-val" id="valAlpha">0.000000</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-label">Taxa Lambda Anual (λ)</div>
-                            <div class="stat-val" id="valLambda">0.000000</div>
-                        </div>
-                    </div>
-                </div>
-            </section>
-        </div>
-    </main>
-
-    <footer>
-        EngineRel Analytics System &copy; 2026. Desenvolvido para modelagem de ambientes extremos.
-    </footer>
-
-    <script>
-        /**
-         * FUNÇÃO DE CONTROLE DE INTERFACE (SPA ROUTING)
-         * Alterna entre as abas alterando as classes CSS ativas.
-         * @param {string} tabId - O ID do elemento <main> a ser exibido.
-         */
-        function openTab(tabId) {
-            try {
-                // Esconde todas as abas de conteúdo
-                const contents = document.querySelectorAll('.tab-content');
-                contents.forEach(tab => {
-                    tab.classList.remove('active');
-                });
-
-                // Remove o estilo ativo de todos os botões
-                const buttons = document.querySelectorAll('.tab-btn');
-                buttons.forEach(btn => {
-                    btn.classList.remove('active');
-                });
-
-                // Ativa a aba solicitada e o botão correspondente
-                document.getElementById(tabId).classList.add('active');
-                event.currentTarget.classList.add('active');
-            } catch (error) {
-                console.error("Erro na navegação de abas: ", error);
-            }
-        }
-
-        /**
-         * APROXIMAÇÃO DE LANCZOS PARA A FUNÇÃO GAMA
-         * A Função Gama estende o fatorial para números complexos e reais.
-         * Essa implementação utiliza coeficientes pré-calculados para alta precisão.
-         * @param {number} z - O valor de entrada.
-         * @returns {number} O valor aproximado de Gama(z).
-         */
-        function gamma(z) {
-            // Constantes de Lanczos para g = 7
-            const p = [
-                0.99999999999980993,
-                676.5203681218851,
-                -1259.1392167224028,
-                771.32342877765313,
-                -176.61502916214059,
-                12.507343278686905,
-                -0.13857109526572012,
-                9.9843695780195716e-6,
-                1.5056327351493116e-7
-            ];
-
-            const g = 7;
-
-            // Fórmula de reflexão se z < 0.5
-            if (z < 0.5) {
-                return Math.PI / (Math.sin(Math.PI * z) * gamma(1 - z));
-            }
+def open_history():
+    """Uma conexão por uso: o Streamlit executa cada sessão em sua thread."""
+    return ScoreHistory(HISTORY_PATH)
+
+
+def record_console_result(value):
+    """Grava no histórico o último envio do console, uma única vez.
+
+    O valor do componente persiste entre reruns; o carimbo 'ts' do envio
+    evita gravar o mesmo resultado de novo. R é recalculado no servidor
+    com os mesmos perfis da frota.
+    """
+    if not value or value.get("ts") == st.session_state.get("last_recorded_ts"):
+        return
+    st.session_state["last_recorded_ts"] = value.get("ts")
+    profiles = load_profile_set()
+    codes = encode_engine_types([value["engine_type"]])
+    _, r = profiles.compute_log_r(
+        value["failures"], value["tc_days"], value["u_hours"], codes
+    )
+    try:
+        with open_history() as history:
+            history.record(
+                [value["engine_id"]],
+                time.time(),
+                value["failures"],
+                value["tc_days"],
+                value["u_hours"],
+                r,
+                profiles.classify_phase(r, codes),
+            )
+    except sqlite3.Error as error:
+        st.warning(f"Resultado não gravado no histórico: {error}")
 
-            z -= 1;
-            let x = p[0];
 
-            for (let i = 1; i < g + 2; i++) {
-                x += p[i] / (z + i);
-            }
+# =====================================================================
+# MODO FROTA EM LOTE (UPLOAD CSV / PARQUET)
+# Pontua um arquivo de frota inteiro em blocos de tamanho fixo, com
+# barra de progresso, gravando o resultado em disco de forma incremental.
+# =====================================================================
+MODE_CONSOLE = "Console Interativo"
+MODE_FLEET = "Frota em Lote (Arquivo)"
+MODE_SWEEP = "Mapa de Sensibilidade"
+MODE_UNCERTAINTY = "Incerteza (Monte Carlo)"
+MODE_HISTORY = "Histórico"
+MODE_LIVE = "Telemetria ao Vivo"
+MODE_DIAGNOSTICS = "Diagnóstico"
+
+# Acima deste tamanho o resultado fica apenas em disco (sem download)
+MAX_DOWNLOAD_BYTES = 200 * 1024 * 1024
+
+
+def render_fleet_mode():
+    st.subheader("Pontuação de Frota em Lote")
+    st.caption(
+        "Colunas esperadas: engine_id, engineType, failures, tc_days, u_hours. "
+        "Para exportações de vários GB, informe o caminho do arquivo no servidor."
+    )
+
+    uploaded = st.file_uploader("Arquivo da frota", type=["csv", "parquet", "pq"])
+    server_path = st.text_input("...ou caminho do arquivo no servidor", "")
+    col_chunk, col_out = st.columns(2)
+    chunk_rows = col_chunk.number_input(
+        "Linhas por bloco", min_value=1_000, value=DEFAULT_CHUNK_ROWS, step=10_000
+    )
+    fmt_out = col_out.selectbox("Formato de saída", ("csv", "parquet"))
+    fast = st.checkbox(
+        "Kernel rápido (aproximado)",
+        help=f"Erro relativo máximo em R de {MAX_RELATIVE_ERROR:.0e} frente ao kernel exato.",
+    )
+    keep_history = st.checkbox(
+        "Registrar no histórico",
+        value=False,
+        help="Grava R por engine_id (arquivos sem essa coluna não são gravados). "
+        "Ids repetidos no arquivo ficam com a última linha.",
+    )
+
+    if uploaded is not None:
+        source, name = uploaded, uploaded.name
+    elif server_path:
+        source, name = server_path, server_path
+    else:
+        return
+
+    if not st.button("Processar Frota"):
+        return
+
+    out_path = os.path.join(
+        tempfile.gettempdir(),
+        os.path.splitext(os.path.basename(name))[0] + "_scored." + fmt_out,
+    )
+    progress_bar = st.progress(0.0, text="Processando blocos...")
+    history = open_history() if keep_history else None
+    rows = 0
+    try:
+        for rows, progress in stream_score(
+            source,
+            out_path,
+            detect_format(name),
+            fmt_out,
+            int(chunk_rows),
+            fast,
+            load_profile_set(),
+            history,
+        ):
+            progress_bar.progress(
+                progress if progress is not None else 0.0,
+                text=f"{rows:,} motores pontuados".replace(",", "."),
+            )
+    except (ValueError, OSError, sqlite3.Error) as error:
+        st.error(f"Falha ao processar a frota: {error}")
+        return
+    finally:
+        if history is not None:
+            history.close()
+
+    progress_bar.progress(1.0, text="Concluído")
+    st.success(f"{rows:,} motores pontuados. Resultado em {out_path}".replace(",", "."))
+    if os.path.getsize(out_path) <= MAX_DOWNLOAD_BYTES:
+        with open(out_path, "rb") as result:
+            st.download_button(
+                "Baixar resultado", result, file_name=os.path.basename(out_path)
+            )
 
-            let t = z + g + 0.5;
-
-            // Equação final de Lanczos
-            return Math.sqrt(2 * Math.PI) * Math.pow(t, z + 0.5) * Math.exp(-t) * x;
-        }
-
-        /**
-         * MOTOR DE CÁLCULO E MANIPULAÇÃO DO DOM
-         * Intercepta o envio do formulário, processa os dados matemáticos,
-         * simula o carregamento e atualiza a interface com as cores apropriadas.
-         */
-        document.getElementById('engineForm').addEventListener('submit', function(e) {
-            // Impede o recarregamento da página padrão do form HTML
-            e.preventDefault();
-
-            // 1. CAPTURA E VALIDAÇÃO DOS DADOS DE ENTRADA
-            const inputFailures = document.getElementById('failures').value;
-            const inputTcDays = document.getElementById('tc_days').value;
-            const inputUHours = document.getElementById('u_hours').value;
-
-            // Verificação de inputs vazios ou inválidos
-            if (!inputFailures || !inputTcDays || !inputUHours) {
-                alert("Erro de Validação: Todos os parâmetros telemétricos são obrigatórios.");
-                return;
-            }
 
-            const failures = parseFloat(inputFailures);
-            const tcDays = parseFloat(inputTcDays);
-            const uHours = parseFloat(inputUHours);
+# =====================================================================
+# MAPA DE SENSIBILIDADE (VARREDURA tc_days × u_hours)
+# A grade completa é calculada no servidor e reduzida por máximo em
+# blocos antes do envio, para que o navegador receba no máximo
+# SWEEP_MAX_CELLS células independentemente da resolução escolhida.
+# =====================================================================
+SWEEP_MAX_CELLS = (400, 300)  # (colunas tc_days, linhas u_hours)
+
+# Cores das fases, as mesmas variáveis neon do front-end
+PHASE_COLORS = ("#00d2ff", "#39ff14", "#ffb86c", "#ff2a2a")
+
+
+@st.cache_data(max_entries=16)
+def compute_sweep(failures, tc_max, resolution):
+    tc_days = np.linspace(1.0, tc_max, resolution)
+    u_hours = np.linspace(0.1, 24.0, resolution)
+    r = sweep_r(failures, tc_days, u_hours)
+    return decimate(r, tc_days, u_hours, *SWEEP_MAX_CELLS)
+
+
+def render_sweep_mode():
+    st.subheader("Mapa de Sensibilidade do Índice R")
+    col_f, col_tc, col_res = st.columns(3)
+    failures = col_f.slider("Eventos de falha (365 dias)", 0, 100, 3)
+    tc_max = col_tc.number_input("tc máximo (dias)", min_value=10, value=9000, step=500)
+    resolution = col_res.select_slider("Resolução da grade", (250, 500, 1000, 2000), 1000)
+
+    r, tc_days, u_hours = compute_sweep(failures, float(tc_max), resolution)
+    with np.errstate(divide="ignore"):
+        log_r = np.log10(r)
+
+    figure = go.Figure(
+        go.Heatmap(
+            x=tc_days,
+            y=u_hours,
+            z=log_r,
+            customdata=r,
+            colorscale="Viridis",
+            colorbar=dict(title="log10 R"),
+            hovertemplate="tc = %{x:.0f} dias<br>u = %{y:.1f} h<br>R = %{customdata:.6f}<extra></extra>",
+        )
+    )
+    # Contornos das fronteiras de fase (0.01 / 0.03 / 0.06)
+    for threshold, label, color in zip(PHASE_THRESHOLDS, PHASE_LABELS[1:], PHASE_COLORS[1:]):
+        level = float(np.log10(threshold))
+        figure.add_trace(
+            go.Contour(
+                x=tc_days,
+                y=u_hours,
+                z=log_r,
+                contours=dict(start=level, end=level, size=1, coloring="none"),
+                line=dict(color=color, width=2),
+                name=f"{label} (R ≥ {threshold:.2f})",
+                showscale=False,
+                showlegend=True,
+                hoverinfo="skip",
+            )
+        )
+    figure.update_layout(
+        template="plotly_dark",
+        xaxis_title="Ciclo desde o último reparo (dias)",
+        yaxis_title="Carga operacional diária (horas)",
+        legend=dict(orientation="h", y=-0.2),
+        height=650,
+    )
+    st.plotly_chart(figure)
+    st.caption(
+        f"Grade {resolution} × {resolution} calculada no servidor e enviada como "
+        f"{r.shape[1]} × {r.shape[0]} células (máximo por bloco)."
+    )
 
-            if (uHours <= 0 || uHours > 24) {
-                alert("Aviso: O uso diário deve ser estritamente maior que 0 e máximo de 24 horas.");
-                return;
-            }
 
-            // Manipulação de UI para iniciar a simulação de processamento
-            const btnSubmit = document.getElementById('btnSubmit');
-            const loadingState = document.getElementById('loadingState');
-            const panel = document.getElementById('telemetryPanel');
-
-            btnSubmit.style.display = 'none';
-            loadingState.style.display = 'block';
-            panel.style.display = 'none';
-
-            // Simulação assíncrona para efeito de processamento de dados (1.5 segundos)
-            setTimeout(() => {
-
-                try {
-                    // 2. CONVERSÃO DE UNIDADES PARA A BASE MATEMÁTICA (MINUTOS E DIAS)
-                    const tc = tcDays * 24 * 60; // Dias transformados em minutos
-                    const u = uHours * 60;       // Horas transformadas em minutos
-
-                    // Cálculo da taxa histórica de falha ao ano (λ)
-                    const lambda = failures / 365.0;
-
-                    // 3. DEFINIÇÃO RIGOROSA DO FATOR ALFA (α) [SEGUNDO AS ESPECIFICAÇÕES DO MODELO]
-                    let numAlpha = 0;
-                    if (tc === 0) {
-                        numAlpha = Math.log(Math.abs(u));
-                    } else if (tc === u) {
-                        numAlpha = 1;
-                    } else {
-                        numAlpha = Math.abs(tc - u);
-                    }
-                    const alpha = numAlpha / (tc + 1);
-
-                    // 4. RESOLUÇÃO DA EQUAÇÃO DE RISCO (R) - MODELO QUIMERA
-                    
-                    // 4.1. Termo de Fadiga Temporal (Raiz de tcd)
-                    const rootTcd = Math.sqrt(tcDays);
-
-                    // 4.2. Termo Estabilizador de Euler
-                    let eulerTerm = 1;
-                    if (tc > 0) {
-                        eulerTerm = Math.pow((1 + (1 / tc)), tc);
-                    }
-
-                    // 4.3. Termo de Micro-Fadiga (Logaritmo Duplo da Função Gama)
-                    const gammaVal = gamma(alpha + 2);
-                    let innerLog = Math.log(gammaVal);
-
-                    // Proteção de domínio para evitar NaN em logaritmos naturais
-                    if (innerLog <= 0) {
-                        innerLog = 0.000001; 
-                    }
-
-                    let logLogTerm = Math.log(innerLog);
-                    if (logLogTerm < 0 && tc === 0) { logLogTerm = 0; } // Trava de segurança no ponto zero
-
-                    // 4.4. Termo Exponencial de Maturação de Falhas
-                    const expTerm = Math.exp(alpha * lambda);
-
-                    // 4.5. Síntese Final do Índice R
-                    let rawR = 0;
-                    if (u > 0) {
-                        rawR = (expTerm * logLogTerm * rootTcd * eulerTerm) / u;
-                    }
-
-                    // 4.6 EXTRAÇÃO DE MAGNITUDE (CORREÇÃO DE SINAL DA EQUAÇÃO)
-                    // Como ln(ln(2)) resulta em um número negativo, extraímos o valor absoluto 
-                    // para alimentar os limiares de risco do sistema.
-                    let R = Math.abs(rawR);
-
-                    // 5. ATUALIZAÇÃO DO FRONT-END E LÓGICA DE CORES
-                    const displayR = document.getElementById('valR');
-                    const statusMsg = document.getElementById('statusMessage');
-
-                    // FORMATO OBRIGATÓRIO: Remoção da notação científica. Forçando 6 casas decimais.
-                    displayR.innerText = R.toFixed(6);
-
-                    // LÓGICA CONDICIONAL DE ALERTAS VISUAIS (AS 4 FASES REQUERIDAS)
-                    if (R >= 0.0600) {
-                        // FASE 4: FALHA IMINENTE (VERMELHO NEON) -> Ex: 7000 dias
-                        displayR.style.color = "var(--red-primary)";
-                        displayR.style.textShadow = "0 0 20px var(--red-glow)";
-                        panel.style.borderLeftColor = "var(--red-primary)";
-                        statusMsg.innerText = "FALHA IMINENTE";
-                        statusMsg.style.backgroundColor = "var(--red-glow)";
-                        statusMsg.style.color = "var(--red-primary)";
-                        statusMsg.style.border = "1px solid var(--red-primary)";
-                    }
-                    else if (R >= 0.0300) {
-                        // FASE 3: ALERTA (LARANJA NEON) -> Ex: Escalonamento entre 2000 e 5000 dias
-                        displayR.style.color = "var(--orange-primary)";
-                        displayR.style.textShadow = "0 0 20px var(--orange-glow)";
-                        panel.style.borderLeftColor = "var(--orange-primary)";
-                        statusMsg.innerText = "ALERTA";
-                        statusMsg.style.backgroundColor = "var(--orange-glow)";
-                        statusMsg.style.color = "var(--orange-primary)";
-                        statusMsg.style.border = "1px solid var(--orange-primary)";
-                    }
-                    else if (R >= 0.0100) {
-                        // FASE 2: SEGURO (VERDE NEON) -> Ex: 700 dias
-                        displayR.style.color = "var(--green-primary)";
-                        displayR.style.textShadow = "0 0 20px var(--green-glow)";
-                        panel.style.borderLeftColor = "var(--green-primary)";
-                        statusMsg.innerText = "SEGURO";
-                        statusMsg.style.backgroundColor = "var(--green-glow)";
-                        statusMsg.style.color = "var(--green-primary)";
-                        statusMsg.style.border = "1px solid var(--green-primary)";
-                    }
-                    else {
-                        // FASE 1: EXTREMAMENTE SEGURO (AZUL NEON) -> Ex: 70 dias
-                        displayR.style.color = "var(--blue-primary)";
-                        displayR.style.textShadow = "0 0 20px var(--blue-glow)";
-                        panel.style.borderLeftColor = "var(--blue-primary)";
-                        statusMsg.innerText = "EXTREMAMENTE SEGURO";
-                        statusMsg.style.backgroundColor = "var(--blue-glow)";
-                        statusMsg.style.color = "var(--blue-primary)";
-                        statusMsg.style.border = "1px solid var(--blue-primary)";
-                    }
-
-                    // Alimentando a grade inferior de estatísticas isoladas
-                    document.getElementById('valTcMin').innerText = tc.toLocaleString('pt-BR');
-                    document.getElementById('valUMin').innerText = u.toLocaleString('pt-BR');
-                    document.getElementById('valAlpha').innerText = alpha.toFixed(6);
-                    document.getElementById('valLambda').innerText = lambda.toFixed(6);
-
-                } catch (error) {
-                    console.error("Falha Crítica no Processador Matemático:", error);
-                    alert("Ocorreu um erro no cálculo do vetor. Verifique o console.");
-                } finally {
-                    // Retorna a UI ao estado interativo, revelando os resultados
-                    loadingState.style.display = 'none';
-                    btnSubmit.style.display = 'block';
-                    panel.style.display = 'block';
-                }
-
-            }, 1500); // Fim do setTimeout (1.5s)
-        });
-    </script>
-</body>
-</html>
-"""
+# =====================================================================
+# FAIXAS DE INCERTEZA (MONTE CARLO QUASI-ALEATÓRIO)
+# Em vez de um R com seis casas decimais, mostra a distribuição de R
+# quando falhas (Poisson) e uso diário (distribuição escolhida) variam
+# em torno dos valores informados.
+# =====================================================================
+UNCERTAINTY_SEED = 2024
+
+
+@st.cache_data(max_entries=32)
+def compute_uncertainty(failures, tc_days, u_hours, samples, u_distribution, u_spread):
+    summary = r_uncertainty(
+        failures, tc_days, u_hours, samples, u_distribution, u_spread, UNCERTAINTY_SEED
+    )
+    points = sobol_points(samples, UNCERTAINTY_SEED)
+    sampled_failures, sampled_u = sample_inputs(
+        failures, u_hours, points, u_distribution, u_spread
+    )
+    log_r, _ = compute_log_r(sampled_failures[:, 0], tc_days, sampled_u[:, 0])
+    return summary, log_r / np.log(10)
+
+
+def render_uncertainty_mode():
+    st.subheader("Faixas de Incerteza do Índice R")
+    col_f, col_tc, col_u = st.columns(3)
+    failures = col_f.number_input("Eventos de falha (365 dias)", min_value=0, value=3)
+    tc_days = col_tc.number_input("Dias desde o último reparo", min_value=0.0, value=700.0)
+    u_hours = col_u.number_input(
+        "Uso diário (horas)", min_value=0.1, max_value=24.0, value=8.0
+    )
+    col_dist, col_spread, col_samples = st.columns(3)
+    u_distribution = col_dist.selectbox("Distribuição do uso diário", tuple(U_DISTRIBUTIONS))
+    u_spread = col_spread.slider("Dispersão relativa do uso", 0.0, 0.5, 0.1, 0.01)
+    samples = col_samples.select_slider("Amostras (Sobol)", (256, 1024, 4096, 16384), 4096)
+
+    summary, log10_r = compute_uncertainty(
+        float(failures), float(tc_days), float(u_hours), samples, u_distribution, u_spread
+    )
+    col_p5, col_p50, col_p95 = st.columns(3)
+    col_p5.metric("P5", f"{summary['P5'][0]:.6f}")
+    col_p50.metric("P50", f"{summary['P50'][0]:.6f}")
+    col_p95.metric("P95", f"{summary['P95'][0]:.6f}")
+
+    col_hist, col_prob = st.columns((2, 1))
+    histogram = go.Figure(
+        go.Histogram(x=log10_r[np.isfinite(log10_r)], nbinsx=60, marker_color="#00d2ff")
+    )
+    for threshold, color in zip(PHASE_THRESHOLDS, PHASE_COLORS[1:]):
+        histogram.add_vline(x=float(np.log10(threshold)), line=dict(color=color, dash="dash"))
+    histogram.update_layout(
+        template="plotly_dark",
+        xaxis_title="log10 R",
+        yaxis_title="Amostras",
+        height=400,
+    )
+    col_hist.plotly_chart(histogram)
+
+    probability = go.Figure(
+        go.Bar(
+            x=list(PHASE_LABELS),
+            y=summary["phase_prob"][0],
+            marker_color=list(PHASE_COLORS),
+            texttemplate="%{y:.1%}",
+        )
+    )
+    probability.update_layout(
+        template="plotly_dark",
+        yaxis=dict(title="Probabilidade", tickformat=".0%", range=[0, 1]),
+        height=400,
+    )
+    col_prob.plotly_chart(probability)
+    st.caption(
+        f"{len(log10_r)} amostras de uma sequência de Sobol embaralhada: falhas ~ "
+        f"Poisson({failures}), uso diário ~ {u_distribution} com dispersão {u_spread:.0%}."
+    )
+
+
+# =====================================================================
+# HISTÓRICO DE PONTUAÇÕES
+# Tendência de R de um motor e contagem diária da frota por fase, lidas
+# do SQLite (varredura pela chave do motor e tabela agregada por dia).
+# A série é reduzida no servidor por LTTB a no máximo MAX_TREND_POINTS
+# pontos; selecionar uma caixa no gráfico busca de novo só aquela janela,
+# com a mesma quantidade de pontos (mais resolução a cada aproximação).
+# =====================================================================
+MAX_TREND_POINTS = 3000
+
+
+@st.cache_data(max_entries=64)
+def fetch_trend(engine_id, start, end, last_ts):
+    """(ts, R, total de linhas) reduzidos por LTTB.
+
+    last_ts entra só na chave do cache: uma pontuação nova invalida a
+    entrada sem que seja preciso reler a série para descobrir isso.
+    """
+    with open_history() as history:
+        ts, r = history.series(engine_id, start, end)
+    keep = lttb(ts, r, MAX_TREND_POINTS)
+    return ts[keep], r[keep], len(ts)
+
+
+def _selected_window(event):
+    """Intervalo (ts inicial, ts final) da caixa selecionada, ou None."""
+    boxes = event.selection.box if event else None
+    if not boxes:
+        return None
+    # O eixo recebe datetimes ingênuos em UTC, e é assim que voltam
+    x0, x1 = sorted(pd.Timestamp(value).timestamp() for value in boxes[0]["x"])
+    return x0, x1
+
+
+def render_history_mode():
+    st.subheader("Histórico de Pontuações")
+    with open_history() as history:
+        daily = history.daily_phase_counts()
+        engine_id = st.text_input(
+            "Identificador do motor", st.session_state.get("history_engine", "MOTOR-001")
+        )
+        if engine_id != st.session_state.get("history_engine"):
+            st.session_state["trend_window"] = None
+        st.session_state["history_engine"] = engine_id
+        last_ts = history.last_ts(engine_id)
+
+    window = st.session_state.get("trend_window")
+    if last_ts is None:
+        st.info(f"Nenhuma pontuação registrada para {engine_id}.")
+    else:
+        ts, r, total = fetch_trend(engine_id, *(window or (None, None)), last_ts)
+        figure = go.Figure(
+            go.Scattergl(
+                x=pd.to_datetime(ts, unit="s"),
+                y=r,
+                mode="lines+markers" if len(ts) < 200 else "lines",
+                line=dict(color="#00d2ff"),
+                name="R",
+            )
+        )
+        for threshold, label, color in zip(PHASE_THRESHOLDS, PHASE_LABELS[1:], PHASE_COLORS[1:]):
+            figure.add_hline(
+                y=float(threshold), line=dict(color=color, dash="dash"), annotation_text=label
+            )
+        figure.update_layout(
+            template="plotly_dark",
+            yaxis_title="Índice R",
+            height=400,
+            showlegend=False,
+            dragmode="select",
+        )
+        # A chave muda a cada janela: a nova figura nasce sem seleção pendente
+        generation = st.session_state.get("trend_generation", 0)
+        event = st.plotly_chart(
+            figure,
+            key=f"trend_{generation}",
+            on_select="rerun",
+            selection_mode="box",
+        )
+        selected = _selected_window(event)
+        if selected is not None:
+            st.session_state["trend_window"] = selected
+            st.session_state["trend_generation"] = generation + 1
+            st.rerun()
+
+        col_caption, col_reset = st.columns((4, 1))
+        col_caption.caption(
+            f"{len(ts):,} de {total:,} pontuações exibidas (LTTB). "
+            "Selecione uma caixa no gráfico para aproximar.".replace(",", ".")
+        )
+        if window is not None and col_reset.button("Ver histórico completo"):
+            st.session_state["trend_window"] = None
+            st.session_state["trend_generation"] = generation + 1
+            st.rerun()
+
+    if daily.empty:
+        return
+    fleet = go.Figure()
+    for label, color in zip(PHASE_LABELS, PHASE_COLORS):
+        fleet.add_trace(
+            go.Scatter(
+                x=daily.index,
+                y=daily[label],
+                name=label,
+                stackgroup="fases",
+                line=dict(color=color),
+            )
+        )
+    fleet.update_layout(
+        template="plotly_dark",
+        yaxis_title="Pontuações por dia",
+        legend=dict(orientation="h", y=-0.2),
+        height=400,
+    )
+    st.plotly_chart(fleet)
+
+
+# =====================================================================
+# MODO TELEMETRIA AO VIVO
+# Lê o instantâneo gravado pelo serviço de ingestão (quimera.ingest) e o
+# reapresenta a cada poucos segundos; só o fragmento é reexecutado.
+# ENGINEREL_LIVE troca o arquivo.
+# =====================================================================
+LIVE_SNAPSHOT_PATH = os.environ.get(
+    "ENGINEREL_LIVE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "live.npz"),
+)
+LIVE_REFRESH_SECONDS = 2
+LIVE_TOP_ENGINES = 20
+
+
+@st.cache_data(max_entries=2)
+def load_live_snapshot(path, mtime):
+    """O instantâneo só é relido quando o serviço troca o arquivo (mtime)."""
+    return read_snapshot(path)
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live_mode():
+    st.subheader("Telemetria ao Vivo")
+    try:
+        mtime = os.path.getmtime(LIVE_SNAPSHOT_PATH)
+    except OSError:
+        st.info(
+            "Nenhum instantâneo encontrado. Inicie o serviço de ingestão com "
+            f"`python -m quimera.ingest serve --snapshot {LIVE_SNAPSHOT_PATH}`."
+        )
+        return
+    live = load_live_snapshot(LIVE_SNAPSHOT_PATH, mtime)
+
+    col_engines, col_pending, col_updated = st.columns(3)
+    col_engines.metric("Motores", f"{len(live):,}".replace(",", "."))
+    col_pending.metric("Sem amostra de uso", int(live["R"].isna().sum()))
+    col_updated.metric("Instantâneo", time.strftime("%H:%M:%S", time.localtime(mtime)))
+
+    counts = np.bincount(live["phase"].to_numpy(), minlength=len(PHASE_LABELS))
+    for column, label, count in zip(st.columns(len(PHASE_LABELS)), PHASE_LABELS, counts):
+        column.metric(label, f"{int(count):,}".replace(",", "."))
+
+    st.caption(f"{LIVE_TOP_ENGINES} motores de maior R")
+    top = live.nlargest(LIVE_TOP_ENGINES, "R").assign(
+        phase=lambda frame: [PHASE_LABELS[code] for code in frame["phase"]]
+    )
+    st.dataframe(top, hide_index=True)
+
+
+# =====================================================================
+# MODO DIAGNÓSTICO
+# Tempo por etapa e contadores de casos especiais (quimera.metrics) deste
+# processo do Streamlit. A instrumentação vale para o processo inteiro e
+# por isso só é ligada na inicialização (ENGINEREL_METRICS=1): uma sessão
+# não liga nem desliga a medição das outras.
+# =====================================================================
+DIAGNOSTICS_SAMPLE_ROWS = 100_000
+
+STAGE_LABELS = {
+    "parsing": "Leitura e validação",
+    "conversion": "Conversão de unidades",
+    "alpha": "Fator α",
+    "exp_term": "Termo exponencial",
+    "gamma_lnln": "Gama / ln ln",
+    "euler": "Termo de Euler",
+    "synthesis": "Síntese de R",
+    "phase": "Classificação de fase",
+    "rendering": "Saída",
+}
+
+
+def render_diagnostics_mode():
+    st.subheader("Diagnóstico do Cálculo")
+    enabled = metrics.is_enabled()
+    if not enabled:
+        st.info(
+            "Instrumentação desligada neste processo. Inicie o app com "
+            "ENGINEREL_METRICS=1 para medir cada etapa."
+        )
+    st.caption(
+        "Cobre os kernels vetorizados (compute_log_r, compute_r e a classificação "
+        "de fase); log_r_scalar, da telemetria ao vivo, não é medido."
+    )
+
+    col_sample, col_reset = st.columns(2)
+    if col_sample.button(
+        f"Pontuar amostra sintética ({DIAGNOSTICS_SAMPLE_ROWS:,} motores)".replace(",", "."),
+        disabled=not enabled,
+    ):
+        failures, tc_days, u_hours = synthetic_fleet(DIAGNOSTICS_SAMPLE_ROWS)
+        sample = pd.DataFrame(
+            {
+                "engineType": np.resize(ENGINE_TYPES, DIAGNOSTICS_SAMPLE_ROWS),
+                "failures": failures,
+                "tc_days": tc_days,
+                "u_hours": u_hours,
+            }
+        )
+        score_chunk(sample, profiles=load_profile_set())
+    if col_reset.button("Zerar métricas"):
+        metrics.REGISTRY.reset()
+
+    snapshot = metrics.REGISTRY.snapshot()
+    stages = pd.DataFrame(
+        [
+            (STAGE_LABELS[stage], calls, seconds)
+            for stage, (calls, seconds) in snapshot["stages"].items()
+        ],
+        columns=["Etapa", "Chamadas", "Segundos"],
+    )
+    total = stages["Segundos"].sum()
+    stages["Média (µs)"] = np.where(
+        stages["Chamadas"] > 0, stages["Segundos"] / stages["Chamadas"].clip(lower=1) * 1e6, 0.0
+    )
+    stages["Participação (%)"] = stages["Segundos"] / total * 100 if total else 0.0
+
+    counters = snapshot["counters"]
+    col_rows, col_floor, col_lock, col_nan, col_inf = st.columns(5)
+    col_rows.metric("Linhas avaliadas", f"{counters['rows']:,}".replace(",", "."))
+    col_floor.metric("Piso de ln Γ", counters["inner_log_floor"])
+    col_lock.metric("Trava tc = 0", counters["tc_zero_lock"])
+    col_nan.metric("R NaN", counters["nan"])
+    col_inf.metric("R infinito", counters["inf"])
+
+    if total:
+        share = go.Figure(
+            go.Bar(
+                x=stages["Participação (%)"],
+                y=stages["Etapa"],
+                orientation="h",
+                marker_color="#00d2ff",
+            )
+        )
+        share.update_layout(
+            template="plotly_dark",
+            xaxis_title="Participação no tempo medido (%)",
+            yaxis=dict(autorange="reversed"),
+            height=360,
+        )
+        st.plotly_chart(share)
+    st.dataframe(stages, hide_index=True)
+
+    with st.expander("Exportação Prometheus"):
+        text = metrics.render_prometheus()
+        st.code(text, language="text")
+        st.download_button("Baixar métricas", text, file_name="enginerel_metrics.prom")
+
+
+mode = st.radio(
+    "Modo",
+    (
+        MODE_CONSOLE,
+        MODE_FLEET,
+        MODE_SWEEP,
+        MODE_UNCERTAINTY,
+        MODE_HISTORY,
+        MODE_LIVE,
+        MODE_DIAGNOSTICS,
+    ),
+    horizontal=True,
+    label_visibility="collapsed",
+)
 
-# Renderização do Componente no Streamlit com altura dinâmica generosa
-components.html(html_code, height=1300, scrolling=True)
+if mode == MODE_FLEET:
+    render_fleet_mode()
+elif mode == MODE_SWEEP:
+    render_sweep_mode()
+elif mode == MODE_UNCERTAINTY:
+    render_uncertainty_mode()
+elif mode == MODE_HISTORY:
+    render_history_mode()
+elif mode == MODE_LIVE:
+    render_live_mode()
+elif mode == MODE_DIAGNOSTICS:
+    render_diagnostics_mode()
+else:
+    # Renderização do Componente (a altura é informada pelo próprio documento)
+    frontend_dir, assets_warning = resolve_frontend_dir()
+    if assets_warning:
+        st.warning(assets_warning)
+    enginerel_component, _, _ = load_component(frontend_dir)
+    # Os perfis seguem como argumento: o console usa os mesmos parâmetros
+    # O valor devolvido é o último envio do formulário, gravado no histórico
+    submitted = enginerel_component(
+        key="enginerel", profiles=load_profile_set().as_dict(), default=None
+    )
+    record_console_result(submitted)
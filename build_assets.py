@@ -0,0 +1,170 @@
+# =====================================================================
+# BUILD DO PACOTE DE ASSETS OFFLINE (REDES ISOLADAS / AIR-GAPPED)
+# Gera frontend/bundled/ a partir de frontend/index.html, sem nenhuma
+# dependência de CDN em tempo de execução:
+#   - fontes do Google Fonts baixadas como woff2 locais;
+#   - imagens do Unsplash baixadas já no tamanho exibido (miniaturas);
+#   - expressões LaTeX pré-renderizadas para SVG (MathJax não é carregado);
+#   - polyfill.io removido (ES6 já é suportado pelos navegadores alvo).
+# O hash do index.html de origem fica em bundled/bundle.json; o app só
+# serve o pacote enquanto ele corresponder à fonte atual.
+#
+# Uso (em uma máquina com internet; depois copie a pasta para a planta):
+#   pip install -r requirements-build.txt
+#   python build_assets.py
+# =====================================================================
+import hashlib
+import html
+import json
+import os
+import re
+import urllib.request
+
+from matplotlib.font_manager import FontProperties
+from matplotlib.mathtext import MathTextParser, math_to_image
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_HTML = os.path.join(ROOT_DIR, "frontend", "index.html")
+BUNDLE_DIR = os.path.join(ROOT_DIR, "frontend", "bundled")
+ASSETS_DIR = os.path.join(BUNDLE_DIR, "assets")
+BUNDLE_MANIFEST = "bundle.json"
+
+# O Google Fonts só entrega woff2 para user-agents modernos
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+FONT_SUBSETS = ("latin", "latin-ext")
+
+# A galeria exibe 2 colunas x 220 px; 800x440 cobre telas de densidade 2x
+THUMB_WIDTH = 800
+THUMB_HEIGHT = 440
+
+# Tamanho de fonte de referência para o LaTeX (em pt = px a 72 dpi)
+MATH_FONT_SIZE = 16
+MATH_COLOR = "#e4e4e7"
+DISPLAY_MATH_COLOR = "#ffffff"
+
+FONTS_LINK_RE = re.compile(r'\s*<link[^>]+fonts\.(?:googleapis|gstatic)\.com[^>]*>')
+FONTS_HREF_RE = re.compile(r'<link href="(https://fonts\.googleapis\.com/css2\?[^"]+)"')
+CDN_SCRIPT_RE = re.compile(r'\s*<script[^>]+(?:polyfill\.io|MathJax-script)[^>]*></script>')
+IMG_RE = re.compile(r'<img src="(https://images\.unsplash\.com/([^"?]+)\?[^"]*)"')
+DISPLAY_MATH_RE = re.compile(r"\$\$(.+?)\$\$", re.S)
+INLINE_MATH_RE = re.compile(r"\\\((.+?)\\\)", re.S)
+
+
+def fetch(url):
+    """Baixa uma URL e devolve os bytes da resposta."""
+    request = urllib.request.Request(url, headers={"User-Agent": BROWSER_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def write_asset(relative_path, payload):
+    """Grava um asset sob frontend/bundled/assets e devolve a URL relativa."""
+    path = os.path.join(ASSETS_DIR, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as asset:
+        asset.write(payload)
+    return "assets/" + relative_path.replace(os.sep, "/")
+
+
+# =====================================================================
+# FONTES
+# =====================================================================
+def bundle_fonts(css_url):
+    """Baixa o CSS do Google Fonts e seus woff2 (apenas latin/latin-ext)."""
+    css = fetch(css_url).decode("utf-8")
+    blocks = re.findall(r"/\* ([\w-]+) \*/\s*(@font-face \{.*?\})", css, re.S)
+
+    local_css = []
+    for subset, block in blocks:
+        if subset not in FONT_SUBSETS:
+            continue
+        for url in re.findall(r"url\((https://[^)]+\.woff2)\)", block):
+            name = hashlib.sha256(url.encode()).hexdigest()[:16] + ".woff2"
+            write_asset(os.path.join("fonts", name), fetch(url))
+            # fonts.css fica em assets/, então o caminho é relativo a ela
+            block = block.replace(url, "fonts/" + name)
+        local_css.append(f"/* {subset} */\n{block}")
+
+    return write_asset("fonts.css", "\n".join(local_css).encode("utf-8"))
+
+
+# =====================================================================
+# IMAGENS
+# =====================================================================
+def bundle_image(match):
+    """Baixa a miniatura no tamanho exibido e troca o src por loading=lazy."""
+    url, photo_id = match.group(1), match.group(2)
+    thumb_url = f"{url}&w={THUMB_WIDTH}&h={THUMB_HEIGHT}&fm=jpg"
+    local = write_asset(os.path.join("img", photo_id + ".jpg"), fetch(thumb_url))
+    return (
+        f'<img src="{local}" width="{THUMB_WIDTH}" height="{THUMB_HEIGHT}" '
+        'loading="lazy" decoding="async"'
+    )
+
+
+# =====================================================================
+# LATEX -> SVG
+# =====================================================================
+def render_math(tex, display):
+    """Renderiza uma expressão LaTeX para SVG e devolve a tag <img>.
+
+    A altura e o alinhamento vertical são dados em 'em' a partir das
+    métricas do mathtext, para que a fórmula acompanhe o texto ao redor.
+    """
+    tex = html.unescape(tex).strip()
+    prop = FontProperties(size=MATH_FONT_SIZE)
+    _, height, depth, _, _ = MathTextParser("path").parse(f"${tex}$", dpi=72, prop=prop)
+
+    name = hashlib.sha256(f"{display}:{tex}".encode()).hexdigest()[:16] + ".svg"
+    path = os.path.join(ASSETS_DIR, "math", name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    color = DISPLAY_MATH_COLOR if display else MATH_COLOR
+    math_to_image(f"${tex}$", path, prop=prop, dpi=72, format="svg", color=color)
+
+    alt = html.escape(tex, quote=True)
+    src = "assets/math/" + name
+    height_em = height / MATH_FONT_SIZE
+    if display:
+        return f'<img src="{src}" alt="{alt}" style="height: {height_em:.3f}em;">'
+    return (
+        f'<img src="{src}" alt="{alt}" '
+        f'style="height: {height_em:.3f}em; vertical-align: {-depth / MATH_FONT_SIZE:.3f}em;">'
+    )
+
+
+def build():
+    with open(SOURCE_HTML, "rb") as source:
+        payload = source.read()
+    page = payload.decode("utf-8")
+
+    fonts_href = FONTS_HREF_RE.search(page).group(1)
+    fonts_css = bundle_fonts(html.unescape(fonts_href))
+    page = FONTS_LINK_RE.sub("", page)
+    page = page.replace(
+        "<style>", f'<link href="{fonts_css}" rel="stylesheet">\n\n    <style>', 1
+    )
+
+    page = CDN_SCRIPT_RE.sub("", page)
+    page = IMG_RE.sub(bundle_image, page)
+    page = DISPLAY_MATH_RE.sub(lambda m: render_math(m.group(1), display=True), page)
+    page = INLINE_MATH_RE.sub(lambda m: render_math(m.group(1), display=False), page)
+
+    os.makedirs(BUNDLE_DIR, exist_ok=True)
+    with open(os.path.join(BUNDLE_DIR, "index.html"), "w", encoding="utf-8") as bundled:
+        bundled.write(page)
+    with open(os.path.join(BUNDLE_DIR, BUNDLE_MANIFEST), "w", encoding="utf-8") as manifest:
+        json.dump({"source_sha256": hashlib.sha256(payload).hexdigest()}, manifest, indent=2)
+
+    total = sum(
+        os.path.getsize(os.path.join(folder, name))
+        for folder, _, names in os.walk(BUNDLE_DIR)
+        for name in names
+    )
+    print(f"Pacote offline gerado em {BUNDLE_DIR} ({total:,} bytes)")
+
+
+if __name__ == "__main__":
+    build()
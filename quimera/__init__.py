@@ -0,0 +1,57 @@
+# =====================================================================
+# PACOTE QUIMERA
+# Implementações em Python do índice de risco R usado pelo EngineRel.
+# =====================================================================
+from quimera.bands import PhaseIndex
+from quimera.downsample import lttb
+from quimera.fast import compute_log_r_fast
+from quimera.history import ScoreHistory
+from quimera.ingest import IngestServer
+from quimera.lut import RLookupTable
+from quimera.forecast import forecast_phases, time_to_threshold
+from quimera.kernel import (
+    MODEL_VERSION,
+    PHASE_LABELS,
+    PHASE_THRESHOLDS,
+    classify_phase,
+    compute_log_r,
+    compute_r,
+    gamma,
+    log_r_scalar,
+)
+from quimera.parallel import SharedColumns, score_parallel, score_shared
+from quimera.profiles import ProfileSet, load_profiles
+from quimera.scheduler import MaintenanceScheduler
+from quimera.sensitivity import compute_sensitivities
+from quimera.state import FleetState
+from quimera.store import FleetStore
+from quimera.uncertainty import r_uncertainty
+
+__all__ = [
+    "FleetState",
+    "FleetStore",
+    "IngestServer",
+    "MODEL_VERSION",
+    "MaintenanceScheduler",
+    "PHASE_LABELS",
+    "PHASE_THRESHOLDS",
+    "PhaseIndex",
+    "ProfileSet",
+    "RLookupTable",
+    "ScoreHistory",
+    "SharedColumns",
+    "classify_phase",
+    "compute_log_r",
+    "compute_log_r_fast",
+    "compute_r",
+    "compute_sensitivities",
+    "forecast_phases",
+    "gamma",
+    "load_profiles",
+    "log_r_scalar",
+    "lttb",
+    "r_uncertainty",
+    "score_parallel",
+    "score_shared",
+    "time_to_threshold",
+]
@@ -0,0 +1,298 @@
+# =====================================================================
+# API HTTP DE PONTUAÇÃO EM LOTE
+# Para clientes de máquina (MES, planejador de manutenção), que não
+# passam pelo engineForm. Roda ao lado do Streamlit, em outro processo:
+#
+#   python -m quimera.api --port 8502
+#
+#   POST /score   colunas failures, tc_days, u_hours e (opcional)
+#                 engineType, em JSON ou Arrow IPC (stream); responde
+#                 R, alpha, lambda e phase por linha, no mesmo formato
+#                 (ou no pedido em Accept)
+#   GET  /health  versão do modelo e digest dos perfis
+#   GET  /metrics tempos por etapa e contadores (Prometheus; --metrics liga)
+#
+# A matemática é a do painel: ProfileSet.compute_log_r e os limiares do
+# perfil de cada linha. Requisições que chegam juntas são agrupadas numa
+# única chamada vetorizada (BatchScorer), sem espera adicional. O corpo
+# JSON custa ~1 µs por número para serializar; para lotes grandes, o
+# formato Arrow é o caminho de baixa latência (10k linhas em ~1 ms).
+# =====================================================================
+import argparse
+import asyncio
+import json
+
+import numpy as np
+import pyarrow as pa
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from quimera import metrics
+from quimera.kernel import MODEL_VERSION, PHASE_LABELS, _alpha
+from quimera.profiles import UNKNOWN_ENGINE_TYPE, encode_engine_types, load_profiles
+from quimera.stream import REQUIRED_COLUMNS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8502
+
+JSON_TYPE = "application/json"
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+
+# Limite de linhas por requisição (~40 MB de entrada em float64)
+MAX_ROWS = 1_000_000
+
+# Conexões ociosas ficam abertas para reuso (keep-alive)
+KEEP_ALIVE_SECONDS = 30
+
+
+class BadRequest(ValueError):
+    """Corpo da requisição inválido (responde 400 com a mensagem)."""
+
+
+# =====================================================================
+# PONTUAÇÃO
+# =====================================================================
+def score_columns(profiles, failures, tc_days, u_hours, codes):
+    """R, alpha, lambda e fase de cada linha, com o perfil de cada uma.
+
+    alpha e lambda usam as conversões do perfil (horas por dia de tc e
+    janela da taxa de falhas), tal como entram no cálculo de R.
+    """
+    _, r = profiles.compute_log_r(failures, tc_days, u_hours, codes)
+    with np.errstate(divide="ignore", invalid="ignore"), metrics.timed("alpha"):
+        alpha = _alpha(tc_days * profiles.hours_per_day[codes] * 60, u_hours * 60)
+        lam = failures / profiles.window_days[codes]
+    return {
+        "R": r,
+        "alpha": alpha,
+        "lambda": lam,
+        "phase": profiles.classify_phase(r, codes),
+    }
+
+
+class BatchScorer:
+    """Agrupa as requisições prontas na mesma volta do laço numa só chamada.
+
+    A primeira requisição agenda a pontuação com call_soon; as que forem
+    lidas antes dela rodar entram no mesmo lote. Nenhum temporizador é
+    usado, de modo que uma requisição isolada não espera por companhia.
+    """
+
+    def __init__(self, profiles):
+        self.profiles = profiles
+        self.pending = []
+        self.stats = {"requests": 0, "batches": 0, "rows": 0}
+
+    async def score(self, failures, tc_days, u_hours, codes):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append(((failures, tc_days, u_hours, codes), future))
+        if len(self.pending) == 1:
+            loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self):
+        pending, self.pending = self.pending, []
+        sizes = [len(columns[0]) for columns, _ in pending]
+        try:
+            if len(pending) == 1:
+                result = score_columns(self.profiles, *pending[0][0])
+            else:
+                result = score_columns(
+                    self.profiles,
+                    *(np.concatenate(column) for column in zip(*(c for c, _ in pending))),
+                )
+        except Exception as error:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        self.stats["requests"] += len(pending)
+        self.stats["batches"] += 1
+        self.stats["rows"] += sum(sizes)
+        offsets = np.cumsum([0] + sizes)
+        for (_, future), start, end in zip(pending, offsets[:-1], offsets[1:]):
+            # A requisição pode ter sido cancelada (cliente desconectou)
+            if not future.done():
+                future.set_result({name: values[start:end] for name, values in result.items()})
+
+
+# =====================================================================
+# FORMATOS DE ENTRADA E SAÍDA
+# =====================================================================
+def _engine_codes(engine_types, n):
+    """Códigos de perfil a partir de engineType (ausente, texto ou lista de textos).
+
+    null, ausente ou um nome desconhecido usam o perfil padrão; qualquer
+    outro tipo (número, objeto, lista aninhada) é BadRequest.
+    """
+    if engine_types is None:
+        return np.full(n, UNKNOWN_ENGINE_TYPE, np.int8)
+    if isinstance(engine_types, str):
+        return np.full(n, encode_engine_types([engine_types])[0], np.int8)
+    if not isinstance(engine_types, list) or not all(
+        value is None or isinstance(value, str) for value in engine_types
+    ):
+        raise BadRequest("engineType deve ser um texto ou uma lista de textos (ou null)")
+    if len(engine_types) != n:
+        raise BadRequest("engineType deve ter o mesmo tamanho das demais colunas")
+    return encode_engine_types(engine_types)
+
+
+def _check_rows(columns):
+    sizes = {len(column) for column in columns}
+    if len(sizes) != 1:
+        raise BadRequest("As colunas failures, tc_days e u_hours devem ter o mesmo tamanho")
+    n = sizes.pop()
+    if n > MAX_ROWS:
+        raise BadRequest(f"Máximo de {MAX_ROWS} linhas por requisição")
+    return n
+
+
+def parse_json(body):
+    """Colunas de um corpo JSON: {"failures": [...], ..., "engineType": ...}."""
+    try:
+        payload = json.loads(body)
+        columns = [
+            np.atleast_1d(np.asarray(payload[name], dtype=np.float64))
+            for name in REQUIRED_COLUMNS
+        ]
+    except KeyError as error:
+        raise BadRequest(f"Coluna obrigatória ausente: {error.args[0]}") from None
+    except (ValueError, TypeError) as error:
+        raise BadRequest(f"JSON inválido: {error}") from None
+    # Listas aninhadas não são achatadas: cada coluna é uma lista de números
+    if any(column.ndim != 1 for column in columns):
+        raise BadRequest("As colunas failures, tc_days e u_hours devem ser listas de números")
+    n = _check_rows(columns)
+    return (*columns, _engine_codes(payload.get("engineType"), n))
+
+
+def parse_arrow(body):
+    """Colunas de um stream Arrow IPC; engineType pode vir como texto ou dicionário."""
+    try:
+        table = pa.ipc.open_stream(body).read_all()
+        columns = [
+            table.column(name).to_numpy().astype(np.float64, copy=False)
+            for name in REQUIRED_COLUMNS
+        ]
+    except KeyError as error:
+        raise BadRequest(f"Coluna obrigatória ausente: {error.args[0]}") from None
+    except (pa.ArrowException, ValueError) as error:
+        raise BadRequest(f"Arrow inválido: {error}") from None
+    n = _check_rows(columns)
+    if "engineType" not in table.column_names:
+        return (*columns, _engine_codes(None, n))
+    # Codifica só os valores distintos; nulos apontam para o perfil padrão
+    engine_types = table.column("engineType")
+    value_type = engine_types.type
+    if pa.types.is_dictionary(value_type):
+        value_type = value_type.value_type
+    if not (
+        pa.types.is_string(value_type)
+        or pa.types.is_large_string(value_type)
+        or pa.types.is_null(value_type)
+    ):
+        raise BadRequest(f"engineType deve ser uma coluna de texto, não {value_type}")
+    encoded = engine_types.combine_chunks().dictionary_encode()
+    dictionary = encoded.dictionary.to_pylist()
+    lookup = np.append(encode_engine_types(dictionary), np.int8(UNKNOWN_ENGINE_TYPE))
+    return (*columns, lookup[encoded.indices.fill_null(len(dictionary)).to_numpy()])
+
+
+def render_json(result):
+    """Resposta JSON; valores não finitos (R inf/NaN) viram null."""
+    payload = {"phase_labels": list(PHASE_LABELS)}
+    for name, values in result.items():
+        if values.dtype.kind == "f" and not np.all(np.isfinite(values)):
+            values = np.where(np.isfinite(values), values, None)
+        payload[name] = values.tolist()
+    return Response(json.dumps(payload).encode("utf-8"), media_type=JSON_TYPE)
+
+
+def render_arrow(result):
+    table = pa.table(result)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Response(sink.getvalue().to_pybytes(), media_type=ARROW_TYPE)
+
+
+# =====================================================================
+# APLICAÇÃO
+# =====================================================================
+def create_app(profiles=None):
+    """Aplicação ASGI; profiles padrão é o profiles.json do pacote."""
+    profiles = load_profiles() if profiles is None else profiles
+    scorer = BatchScorer(profiles)
+
+    async def score(request):
+        content_type = request.headers.get("content-type", JSON_TYPE).split(";")[0].strip()
+        if content_type == ARROW_TYPE:
+            parse = parse_arrow
+        elif content_type == JSON_TYPE:
+            parse = parse_json
+        else:
+            return JSONResponse(
+                {"error": f"Use {JSON_TYPE} ou {ARROW_TYPE}"}, status_code=415
+            )
+        body = await request.body()
+        try:
+            with metrics.timed("parsing"):
+                columns = parse(body)
+        except BadRequest as error:
+            return JSONResponse({"error": str(error)}, status_code=400)
+        result = await scorer.score(*columns)
+        # Sem preferência explícita, responde no formato da requisição
+        accept = request.headers.get("accept", "")
+        render = (
+            render_arrow
+            if ARROW_TYPE in accept or (content_type == ARROW_TYPE and JSON_TYPE not in accept)
+            else render_json
+        )
+        with metrics.timed("rendering"):
+            return render(result)
+
+    async def health(request):
+        return JSONResponse(
+            {"model_version": MODEL_VERSION, "profiles": profiles.digest, **scorer.stats}
+        )
+
+    async def prometheus(request):
+        return Response(metrics.render_prometheus(), media_type=metrics.PROMETHEUS_CONTENT_TYPE)
+
+    app = Starlette(
+        routes=[
+            Route("/score", score, methods=["POST"]),
+            Route("/health", health),
+            Route("/metrics", prometheus),
+        ]
+    )
+    app.state.scorer = scorer
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m quimera.api")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--metrics", action="store_true", help="liga a instrumentação por etapa (/metrics)"
+    )
+    args = parser.parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+    uvicorn.run(
+        create_app(),
+        host=args.host,
+        port=args.port,
+        http="httptools",
+        timeout_keep_alive=KEEP_ALIVE_SECONDS,
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# =====================================================================
+# ÍNDICE DE FAIXAS DE FASE (MOTORES ORDENADOS POR R)
+# Mantém as linhas da frota ordenadas por R em arrays NumPy contíguos:
+#   keys[i]  = i-ésimo menor R         order[i] = linha desse R
+#   value[row] = R indexado da linha (acha a posição por busca binária)
+# As fronteiras das 4 fases são localizadas por busca binária sobre keys,
+# com a mesma regra de classify_phase (R >= limiar sobe de fase; NaN conta
+# como EXTREMAMENTE SEGURO). Contagens custam O(log n), consultas por faixa
+# O(log n + k), e a mudança de score de um motor desloca apenas o trecho
+# entre a posição antiga e a nova (memmove vetorizado).
+# A escada de limiares é uma só por índice: com perfis de engineType de
+# limiares distintos (ProfileSet), mantenha um índice por perfil.
+# =====================================================================
+import numpy as np
+
+from quimera.kernel import PHASE_THRESHOLDS
+
+INITIAL_CAPACITY = 1024
+
+# Lote a partir do qual reordenar tudo sai mais barato que deslocar linha a linha
+REBUILD_FRACTION = 0.01
+
+
+def _keys(r):
+    """Chave de ordenação: NaN vai para o início (fase 0)."""
+    return np.nan_to_num(np.asarray(r, dtype=np.float64), nan=-np.inf, posinf=np.inf)
+
+
+class PhaseIndex:
+    """Índice da frota por R; linhas são inteiros densos 0..n-1.
+
+    As linhas seguem a numeração de FleetState / FleetStore. Uma linha nova
+    entra por update(len(index), r). thresholds é a escada de limiares das
+    fases (ex.: profiles.thresholds[code] para o perfil de um engineType).
+    """
+
+    def __init__(self, r=(), capacity=INITIAL_CAPACITY, thresholds=PHASE_THRESHOLDS):
+        self.thresholds = np.asarray(thresholds, dtype=np.float64)
+        r = _keys(r).reshape(-1)
+        self.size = len(r)
+        capacity = max(capacity, self.size)
+        self.keys = np.empty(capacity)
+        self.order = np.empty(capacity, np.int64)
+        self.value = np.empty(capacity)
+        self._rebuild(r)
+
+    def __len__(self):
+        return self.size
+
+    def _rebuild(self, r):
+        n = self.size
+        order = np.argsort(r, kind="stable")
+        self.order[:n] = order
+        self.keys[:n] = r[order]
+        self.value[:n] = r
+
+    def _grow(self):
+        for name in ("keys", "order", "value"):
+            column = getattr(self, name)
+            grown = np.empty(2 * len(column), column.dtype)
+            grown[: self.size] = column[: self.size]
+            setattr(self, name, grown)
+
+    # -----------------------------------------------------------------
+    # ATUALIZAÇÃO INCREMENTAL
+    # -----------------------------------------------------------------
+    def update(self, row, r):
+        """Atualiza o R de uma linha, deslocando só o trecho afetado."""
+        key = float(_keys(r))
+        if row == self.size:
+            if self.size == len(self.keys):
+                self._grow()
+            self.size += 1
+            self.keys[row] = np.inf  # entra no fim e desce até o lugar certo
+            self.order[row] = row
+            self.value[row] = np.inf
+
+        keys, order = self.keys[: self.size], self.order[: self.size]
+        current = self.value[row]
+        start = np.searchsorted(keys, current, side="left")
+        stop = np.searchsorted(keys, current, side="right")
+        old = start + np.flatnonzero(order[start:stop] == row)[0]
+        if key >= current:
+            new = np.searchsorted(keys, key, side="right") - 1
+            keys[old:new] = keys[old + 1 : new + 1]
+            order[old:new] = order[old + 1 : new + 1]
+        else:
+            new = np.searchsorted(keys, key, side="left")
+            keys[new + 1 : old + 1] = keys[new:old]
+            order[new + 1 : old + 1] = order[new:old]
+        keys[new] = key
+        order[new] = row
+        self.value[row] = key
+
+    def update_many(self, rows, r):
+        """Atualiza várias linhas existentes; lotes grandes reordenam tudo."""
+        rows = np.asarray(rows, dtype=np.int64).reshape(-1)
+        r = np.broadcast_to(_keys(r), rows.shape)
+        if len(rows) < REBUILD_FRACTION * self.size:
+            for row, value in zip(rows.tolist(), r.tolist()):
+                self.update(row, value)
+            return
+        current = self.value[: self.size]
+        current[rows] = r
+        self._rebuild(current.copy())
+
+    # -----------------------------------------------------------------
+    # CONSULTAS
+    # -----------------------------------------------------------------
+    def r(self):
+        """R indexado de cada linha (NaN aparece como -inf)."""
+        return self.value[: self.size].copy()
+
+    def bounds(self):
+        """Posições de início de cada fase em keys/order (5 valores)."""
+        cuts = np.searchsorted(self.keys[: self.size], self.thresholds, side="left")
+        return np.concatenate(([0], cuts, [self.size]))
+
+    def counts(self):
+        """Quantidade de motores em cada uma das 4 fases."""
+        return np.diff(self.bounds())
+
+    def band(self, phase):
+        """Linhas na fase indicada (0-3), em ordem crescente de R."""
+        bounds = self.bounds()
+        return self.order[bounds[phase] : bounds[phase + 1]].copy()
+
+    def range(self, r_min=-np.inf, r_max=np.inf):
+        """Linhas com r_min <= R < r_max, em ordem crescente de R."""
+        keys = self.keys[: self.size]
+        start = np.searchsorted(keys, r_min, side="left")
+        stop = np.searchsorted(keys, r_max, side="left")
+        return self.order[start:stop].copy()
+
+    def top(self, k):
+        """As k linhas de maior R, da mais arriscada para a menos."""
+        k = min(k, self.size)
+        return self.order[self.size - k : self.size][::-1].copy()
@@ -0,0 +1,132 @@
+# =====================================================================
+# BENCHMARK DOS KERNELS DE R
+# Mede cada implementação registrada em golden.KERNELS (a porta escalar
+# do JS como referência e os kernels em lote) em frotas de 1e3 a 1e8
+# motores: linhas/s, ns/linha e pico de memória alocada (tracemalloc,
+# que também enxerga os buffers do NumPy; em score_parallel, só a do
+# processo principal). score_parallel reutiliza um único pool de
+# processos, criado no aquecimento: a medição não inclui criar processos.
+#
+# Frotas maiores que CHUNK_ROWS são avaliadas em blocos, como no
+# pipeline de arquivos (quimera.stream): o mesmo bloco sintético é
+# reavaliado até completar o tamanho pedido, de modo que 1e8 linhas não
+# exigem 2,4 GB de entradas. Kernels escalares avaliam um motor por vez e
+# param em SCALAR_MAX_ROWS; acima disso a linha é omitida do relatório.
+#
+#   python -m quimera.bench
+#   python -m quimera.bench --sizes 1e3 1e6 --kernels reference compute_log_r
+#
+# Rode python -m quimera.golden antes: velocidade só vale com paridade.
+# =====================================================================
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from quimera.golden import KERNELS, SCALAR_KERNELS
+from quimera.sample import synthetic_fleet
+
+DEFAULT_SIZES = (10**3, 10**4, 10**5, 10**6, 10**7, 10**8)
+
+# Linhas por chamada de kernel em lote (~24 MB de entradas float64)
+CHUNK_ROWS = 1_000_000
+
+# Acima disto a porta escalar levaria minutos
+SCALAR_MAX_ROWS = 100_000
+
+# Repetições mínimas e tempo mínimo de medição por (kernel, tamanho)
+MIN_REPEATS = 3
+MIN_SECONDS = 0.5
+
+
+def _run(kernel, chunk, n):
+    """Avalia n linhas, em blocos reaproveitando as entradas de chunk."""
+    size = len(chunk[0])
+    for start in range(0, n, size):
+        rows = min(size, n - start)
+        if rows == size:
+            kernel(*chunk)
+        else:
+            kernel(*(column[:rows] for column in chunk))
+
+
+def measure(name, n, chunk_rows=CHUNK_ROWS, seed=0):
+    """Mede um kernel em n linhas; retorna um dict de resultados."""
+    kernel = KERNELS[name][0]
+    chunk = synthetic_fleet(min(n, chunk_rows), seed)
+
+    # Aquecimento (tabelas, pools de processos) fora da medição
+    _run(kernel, tuple(column[:1000] for column in chunk), min(n, 1000))
+
+    gc.collect()
+    tracemalloc.start()
+    _run(kernel, chunk, min(n, chunk_rows))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings = []
+    while len(timings) < MIN_REPEATS or sum(timings) < MIN_SECONDS:
+        started = time.perf_counter()
+        _run(kernel, chunk, n)
+        timings.append(time.perf_counter() - started)
+        if timings[-1] > MIN_SECONDS:
+            break
+    seconds = min(timings)
+    return {
+        "kernel": name,
+        "rows": n,
+        "seconds": seconds,
+        "rows_per_s": n / seconds,
+        "ns_per_row": seconds / n * 1e9,
+        "peak_mib": peak / 2**20,
+        "repeats": len(timings),
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, names=None, scalar_max_rows=SCALAR_MAX_ROWS):
+    """Mede cada kernel em cada tamanho; kernels escalares param no limite."""
+    results = []
+    for name in names or KERNELS:
+        for n in sizes:
+            if name in SCALAR_KERNELS and n > scalar_max_rows:
+                continue
+            results.append(measure(name, n))
+    return results
+
+
+def format_results(results):
+    """Tabela de texto: uma linha por (kernel, tamanho)."""
+    lines = [
+        f"{'kernel':<20} {'linhas':>12} {'linhas/s':>14} {'ns/linha':>10} {'pico MiB':>9}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result['kernel']:<20} {result['rows']:>12,} {result['rows_per_s']:>14,.0f} "
+            f"{result['ns_per_row']:>10.1f} {result['peak_mib']:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m quimera.bench")
+    parser.add_argument("--sizes", nargs="+", type=float, default=DEFAULT_SIZES)
+    parser.add_argument("--kernels", nargs="+", help=f"subconjunto de: {', '.join(KERNELS)}")
+    parser.add_argument("--scalar-max-rows", type=float, default=SCALAR_MAX_ROWS)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+    unknown = set(args.kernels or ()) - set(KERNELS)
+    if unknown:
+        parser.error(f"kernels desconhecidos: {', '.join(sorted(unknown))}")
+
+    results = run_benchmarks(
+        [int(size) for size in args.sizes], args.kernels, int(args.scalar_max_rows)
+    )
+    print(format_results(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
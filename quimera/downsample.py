@@ -0,0 +1,51 @@
+# =====================================================================
+# REDUÇÃO DE SÉRIES TEMPORAIS (LARGEST-TRIANGLE-THREE-BUCKETS)
+# Mantém o formato visual de uma série longa com no máximo n pontos:
+# o primeiro e o último ponto são preservados e, em cada balde
+# intermediário, fica o ponto que forma o maior triângulo com o ponto
+# escolhido no balde anterior e a média do balde seguinte. Picos de R
+# (que importam para as fases) sobrevivem, ao contrário de uma média.
+# A seleção é sequencial por balde, mas cada balde é resolvido com uma
+# operação vetorizada, e as médias dos baldes vêm de um único reduceat.
+# =====================================================================
+import numpy as np
+
+Y_LIMIT = 1e150
+
+
+def lttb(x, y, n_out):
+    """Índices (crescentes) dos até n_out pontos escolhidos por LTTB.
+
+    x deve estar em ordem crescente. Retornar índices permite levar junto
+    outras colunas da mesma linha (fase, entradas do modelo, ...).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # R pode ser inf ou NaN; para a geometria, limita a valores finitos cujo
+    # produto (área do triângulo) ainda não estoura o float64
+    y = np.clip(np.nan_to_num(y, nan=0.0), -Y_LIMIT, Y_LIMIT)
+
+    # Baldes intermediários: [edges[i], edges[i + 1]) para i em 0..n_out-3
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    sizes = np.diff(edges)
+    # reduceat sobre [:n - 1]: o último balde não pode incluir o ponto final
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / sizes, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / sizes, y[-1])
+
+    selected = np.empty(n_out, np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs(
+            (ax - mean_x[i + 1]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (mean_y[i + 1] - ay)
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
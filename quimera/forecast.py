@@ -0,0 +1,153 @@
+# =====================================================================
+# PREVISÃO DE CRUZAMENTO DE LIMIARES (ALERTA / FALHA IMINENTE)
+# Para cada motor, encontra o tc_days em que R atinge um limiar mantendo
+# as falhas e o uso diário atuais. Toda a frota é resolvida de uma vez:
+#   1. expansão do intervalo (passo dobrando a partir de 1 dia, com a
+#      última sonda no próprio horizonte) até log R - log(limiar) trocar
+#      de sinal ou o horizonte inteiro ficar abaixo do limiar;
+#   2. falsa posição modificada (Illinois) sobre os intervalos, com
+#      recuo para bissecção quando a interpolação não é utilizável.
+# A cada iteração só as linhas ainda não convergidas são reavaliadas.
+# Com um ProfileSet (profiles + codes), R e os limiares de fase seguem o
+# perfil de engineType de cada motor.
+# =====================================================================
+import numpy as np
+
+from quimera.kernel import PHASE_LABELS, PHASE_THRESHOLDS, compute_log_r
+from quimera.profiles import UNKNOWN_ENGINE_TYPE
+
+DEFAULT_HORIZON_DAYS = 365.0 * 100
+DEFAULT_TOL_DAYS = 1e-3
+MAX_ITER = 100
+
+
+def _excess(failures, tc_days, u_hours, target, profiles=None, codes=None):
+    """log R(tc_days) - log(limiar); positivo quando o limiar foi atingido."""
+    if profiles is None:
+        return compute_log_r(failures, tc_days, u_hours)[0] - target
+    return profiles.compute_log_r(failures, tc_days, u_hours, codes)[0] - target
+
+
+def time_to_threshold(
+    failures,
+    tc_days,
+    u_hours,
+    threshold,
+    horizon_days=DEFAULT_HORIZON_DAYS,
+    tol_days=DEFAULT_TOL_DAYS,
+    profiles=None,
+    codes=UNKNOWN_ENGINE_TYPE,
+):
+    """Dias restantes até R >= threshold, para cada motor.
+
+    Retorna 0 para motores já no limiar ou acima, inf quando o limiar não é
+    atingido dentro de horizon_days e NaN para entradas inválidas. O valor
+    é o extremo superior do intervalo final, ou seja, um instante em que o
+    limiar já foi atingido (erro <= tol_days). threshold pode variar por
+    motor; com profiles (ProfileSet), R usa o perfil de cada código.
+
+    A busca supõe R crescente em tc a partir de tc_days. A única exceção
+    do modelo é o pico logarítmico em tc = u (α -> 0, menos de um dia
+    após um reparo), estreito demais para ter sentido físico: a primeira
+    sonda, 1 dia adiante, passa por cima dele de propósito.
+    """
+    arrays = np.broadcast_arrays(
+        np.asarray(failures, dtype=np.float64),
+        np.asarray(tc_days, dtype=np.float64),
+        np.asarray(u_hours, dtype=np.float64),
+        np.asarray(threshold, dtype=np.float64),
+        np.asarray(codes, dtype=np.int8),
+    )
+    shape = arrays[0].shape
+    failures, tc_days, u_hours, threshold, codes = (a.reshape(-1).copy() for a in arrays)
+    target = np.log(threshold)
+
+    def excess(rows, tc):
+        return _excess(
+            failures[rows], tc, u_hours[rows], target[rows], profiles, codes[rows]
+        )
+
+    g0 = excess(slice(None), tc_days)
+    result = np.full(failures.shape, np.nan)
+    result[g0 >= 0] = 0.0
+
+    # 1. Expansão do intervalo: lo sempre abaixo do limiar, hi acima
+    lo, g_lo = tc_days.copy(), g0.copy()
+    hi, g_hi = np.full_like(lo, np.nan), np.full_like(lo, np.nan)
+    step = np.full_like(lo, min(1.0, horizon_days))
+    active = np.flatnonzero(g0 < 0)
+    while active.size:
+        candidate = tc_days[active] + step[active]
+        g = excess(active, candidate)
+        found = g >= 0
+        hit = active[found]
+        hi[hit], g_hi[hit] = candidate[found], g[found]
+
+        miss = active[~found]
+        lo[miss], g_lo[miss] = candidate[~found], g[~found]
+        # Abaixo do limiar no horizonte inteiro: inf; senão dobra o passo,
+        # sem passar do horizonte (a última sonda cai exatamente nele)
+        exhausted = step[miss] >= horizon_days
+        result[miss[exhausted]] = np.inf
+        active = miss[~exhausted]
+        step[active] = np.minimum(2 * step[active], horizon_days)
+
+    # 2. Illinois sobre os intervalos encontrados
+    active = np.flatnonzero(np.isfinite(hi))
+    side = np.zeros(lo.shape, np.int8)  # último extremo substituído: -1 lo, +1 hi
+    for _ in range(MAX_ITER):
+        if not active.size:
+            break
+        a, b = lo[active], hi[active]
+        ga, gb = g_lo[active], g_hi[active]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = b - gb * (b - a) / (gb - ga)
+        usable = np.isfinite(t) & (t > a) & (t < b)
+        t = np.where(usable, t, 0.5 * (a + b))
+
+        g = excess(active, t)
+        upper = g >= 0
+
+        # Extremo superior substituído: se repetir, reduz g_lo pela metade
+        up = active[upper]
+        hi[up], g_hi[up] = t[upper], g[upper]
+        g_lo[up[side[up] == 1]] *= 0.5
+        side[up] = 1
+
+        down = active[~upper]
+        lo[down], g_lo[down] = t[~upper], g[~upper]
+        g_hi[down[side[down] == -1]] *= 0.5
+        side[down] = -1
+
+        active = active[(hi[active] - lo[active]) > tol_days]
+
+    solved = np.isfinite(hi)
+    result[solved] = hi[solved] - tc_days[solved]
+    return result.reshape(shape)
+
+
+def forecast_phases(
+    failures, tc_days, u_hours, profiles=None, codes=UNKNOWN_ENGINE_TYPE, **kwargs
+):
+    """Dias até ALERTA e até FALHA IMINENTE para cada motor.
+
+    Com profiles, cada motor usa os limiares do seu perfil. Retorna um
+    dict {rótulo da fase: array de dias restantes}.
+    """
+    if profiles is None:
+        thresholds = PHASE_THRESHOLDS
+    else:
+        thresholds = np.moveaxis(profiles.thresholds[np.asarray(codes, dtype=np.int8)], -1, 0)
+    return {
+        PHASE_LABELS[phase]: time_to_threshold(
+            failures,
+            tc_days,
+            u_hours,
+            thresholds[phase - 1],
+            profiles=profiles,
+            codes=codes,
+            **kwargs,
+        )
+        for phase in (2, 3)
+    }
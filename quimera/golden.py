@@ -0,0 +1,377 @@
+# =====================================================================
+# VETORES DOURADOS E PARIDADE DOS KERNELS
+# golden_r.csv guarda entradas (failures, tc_days, u_hours) e o R que a
+# própria página calcula: as funções gamma() e computeRisk() são
+# extraídas de frontend/index.html e executadas no Node, sem reescrita.
+# A tabela cobre a grade de casos de borda (ramos tc === 0 e tc === u,
+# u <= 0, tcd negativo, overflow) e uma amostra realista da frota.
+#
+# check_kernels() compara cada implementação de R com a tabela: NaN, inf
+# e zero devem coincidir exatamente; nos demais pontos o erro relativo
+# precisa ficar dentro da tolerância do kernel. Uma otimização que mude o
+# resultado além disso falha aqui, em vez de derivar em silêncio.
+#
+#   python -m quimera.golden              verifica todos os kernels
+#   python -m quimera.golden --regenerate regrava a tabela (requer node)
+# =====================================================================
+import argparse
+import csv
+import functools
+import json
+import math
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from quimera.fast import MAX_RELATIVE_ERROR, compute_log_r_fast
+from quimera.kernel import (
+    LANCZOS_G,
+    LANCZOS_P,
+    _alpha,
+    compute_log_r,
+    compute_r,
+    log_r_scalar,
+)
+from quimera.lut import DEFAULT_TOLERANCE, RLookupTable
+from quimera.parallel import score_parallel
+from quimera.profiles import UNKNOWN_ENGINE_TYPE, load_profiles
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "golden_r.csv")
+FRONTEND_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend", "index.html"
+)
+
+# Trecho da página executado no Node: de gamma() até antes das fases
+JS_START = "function gamma(z)"
+JS_END = "const PHASES"
+
+FLEET_SAMPLES = 2000
+GOLDEN_SEED = 20240601
+
+
+# =====================================================================
+# PORTA ESCALAR DE REFERÊNCIA (SEMÂNTICA DO JAVASCRIPT)
+# Linha a linha igual ao computeRisk() da página, com float do Python.
+# O módulo math levanta exceções onde o JS devolve NaN ou Infinity; os
+# auxiliares abaixo restauram o comportamento do JS.
+# =====================================================================
+def _js_log(x):
+    if x > 0:
+        return math.log(x)
+    return -math.inf if x == 0 else math.nan
+
+
+def _js_sin(x):
+    return math.sin(x) if math.isfinite(x) else math.nan
+
+
+def _js_div(a, b):
+    if b != 0:
+        return a / b
+    if a == 0 or a != a:
+        return math.nan
+    return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+def _js_sqrt(x):
+    return math.sqrt(x) if x >= 0 else math.nan
+
+
+def _js_exp(x):
+    try:
+        return math.exp(x)
+    except OverflowError:
+        return math.inf
+
+
+def _js_pow(base, exponent):
+    try:
+        return math.pow(base, exponent)
+    except OverflowError:
+        return math.inf
+    except ValueError:
+        return math.nan
+
+
+def gamma_scalar(z):
+    """gamma() do front-end (Lanczos, g = 7), em Python puro."""
+    if z < 0.5:
+        return _js_div(math.pi, _js_sin(math.pi * z) * gamma_scalar(1 - z))
+    z -= 1
+    x = LANCZOS_P[0].item()
+    for i in range(1, LANCZOS_G + 2):
+        x += LANCZOS_P[i].item() / (z + i)
+    t = z + LANCZOS_G + 0.5
+    return math.sqrt(2 * math.pi) * _js_pow(t, z + 0.5) * _js_exp(-t) * x
+
+
+def reference_r(failures, tc_days, u_hours):
+    """R de um motor exatamente como o handler do formulário o calcula."""
+    tc = tc_days * 24 * 60
+    u = u_hours * 60
+    lam = failures / 365
+
+    if tc == 0:
+        num_alpha = _js_log(abs(u))
+    elif tc == u:
+        num_alpha = 1
+    else:
+        num_alpha = abs(tc - u)
+    alpha = _js_div(num_alpha, tc + 1)
+
+    root_tcd = _js_sqrt(tc_days)
+    euler_term = _js_pow(1 + 1 / tc, tc) if tc > 0 else 1
+
+    inner_log = _js_log(gamma_scalar(alpha + 2))
+    if inner_log <= 0:
+        inner_log = 0.000001
+    log_log_term = _js_log(inner_log)
+    if log_log_term < 0 and tc == 0:
+        log_log_term = 0
+
+    exp_term = _js_exp(alpha * lam)
+    raw_r = 0
+    if u > 0:
+        raw_r = (exp_term * log_log_term * root_tcd * euler_term) / u
+    return abs(raw_r)
+
+
+# =====================================================================
+# KERNELS VERIFICADOS
+# nome -> (função vetorial (f, t, u) -> R, tolerância relativa frente ao
+# JS, cobre o alcance estendido). Perto de Γ(α + 2) = 1, ln Γ cancela e
+# amplifica em ~1e4 a diferença de último bit entre bibliotecas de
+# matemática (V8 x libm); daí a folga até nas portas fiéis. Os kernels em
+# espaço logarítmico usam log1p e gammaln, mais exatos que o pow/gamma da
+# página; e, onde o JS estoura (inf ou NaN), devolvem o R verdadeiro: essas
+# linhas ficam fora da comparação para eles (alcance estendido).
+# =====================================================================
+def _scalar(function):
+    def kernel(failures, tc_days, u_hours):
+        return np.fromiter(
+            map(function, failures.tolist(), tc_days.tolist(), u_hours.tolist()),
+            np.float64,
+            len(failures),
+        )
+
+    return kernel
+
+
+def _r_from_log(log_r):
+    try:
+        return math.exp(log_r)
+    except OverflowError:
+        return math.inf
+
+
+@functools.lru_cache(maxsize=1)
+def _profile_set():
+    # Lido uma vez: reler e re-hashear profiles.json entraria na medição
+    return load_profiles()
+
+
+def _profiles_kernel(failures, tc_days, u_hours):
+    codes = np.full(len(failures), UNKNOWN_ENGINE_TYPE, np.int8)
+    return _profile_set().compute_log_r(failures, tc_days, u_hours, codes)[1]
+
+
+@functools.lru_cache(maxsize=1)
+def _process_pool():
+    # Um pool por processo: criar processos a cada chamada dominaria o tempo
+    # medido pelo benchmark (quimera.bench aquece o pool fora da medição)
+    return ProcessPoolExecutor()
+
+
+def _parallel_kernel(failures, tc_days, u_hours):
+    return score_parallel(failures, tc_days, u_hours, executor=_process_pool())[0]
+
+
+@functools.lru_cache(maxsize=1)
+def _lookup_table():
+    return RLookupTable.build(DEFAULT_TOLERANCE)
+
+
+def _lut_kernel(failures, tc_days, u_hours):
+    return _lookup_table().compute_log_r(failures, tc_days, u_hours)[1]
+
+
+PORT_TOLERANCE = 1e-10
+LOG_SPACE_TOLERANCE = 1e-6
+
+KERNELS = {
+    "reference": (_scalar(reference_r), PORT_TOLERANCE, False),
+    "log_r_scalar": (
+        _scalar(lambda f, t, u: _r_from_log(log_r_scalar(f, t, u))),
+        LOG_SPACE_TOLERANCE,
+        True,
+    ),
+    "compute_r": (compute_r, PORT_TOLERANCE, False),
+    "compute_log_r": (lambda f, t, u: compute_log_r(f, t, u)[1], LOG_SPACE_TOLERANCE, True),
+    "compute_log_r_fast": (
+        lambda f, t, u: compute_log_r_fast(f, t, u)[1],
+        LOG_SPACE_TOLERANCE + MAX_RELATIVE_ERROR,
+        True,
+    ),
+    "profiles": (_profiles_kernel, LOG_SPACE_TOLERANCE, True),
+    "score_parallel": (_parallel_kernel, LOG_SPACE_TOLERANCE, True),
+    "lut": (_lut_kernel, LOG_SPACE_TOLERANCE + DEFAULT_TOLERANCE, True),
+}
+
+# Kernels que avaliam um motor por vez (o benchmark limita o tamanho)
+SCALAR_KERNELS = ("reference", "log_r_scalar")
+
+
+# =====================================================================
+# TABELA DOURADA
+# =====================================================================
+def golden_inputs(seed=GOLDEN_SEED):
+    """Entradas da tabela: grade de bordas, ramo tc === u e amostra da frota."""
+    failures = (0.0, 1.0, 5.0, 50.0, 5000.0)
+    tc_days = (0.0, 1e-9, 1 / 1440, 0.25, 1.0, 2.0, 70.0, 700.0, 2000.0, 7000.0, 36500.0, 1e7, -1.0)
+    u_hours = (0.0, -2.0, 1e-6, 0.5, 1.0, 8.0, 24.0, 48.0)
+    grid = [(f, t, u) for f in failures for t in tc_days for u in u_hours]
+
+    # tc === u: u_hours = 24·tc_days com frações binárias (conversão exata)
+    equal = [(f, t, 24 * t) for f in failures for t in (0.125, 0.25, 0.5, 1.0, 2.0)]
+    assert all(t * 24 * 60 == u * 60 for _, t, u in equal)
+
+    rng = np.random.default_rng(seed)
+    fleet = zip(
+        rng.integers(0, 21, FLEET_SAMPLES).astype(np.float64).tolist(),
+        np.round(rng.uniform(0, 7000, FLEET_SAMPLES), 2).tolist(),
+        np.round(rng.uniform(0.1, 24, FLEET_SAMPLES), 2).tolist(),
+    )
+    return np.array(grid + equal + list(fleet), dtype=np.float64)
+
+
+def _page_script(html_path):
+    with open(html_path, encoding="utf-8") as handle:
+        page = handle.read()
+    start = page.index(JS_START)
+    return page[start : page.index(JS_END, start)]
+
+
+def run_page_kernel(inputs, html_path=FRONTEND_PATH, node="node"):
+    """R de cada linha (f, t, u) calculado pelo computeRisk() da página, no Node.
+
+    Os resultados voltam como String(R) do JS, que o float() do Python lê
+    sem perda, inclusive Infinity e NaN.
+    """
+    script = _page_script(html_path) + (
+        "\nconst rows = JSON.parse(require('fs').readFileSync(0, 'utf8'));"
+        "\nprocess.stdout.write(rows.map(([f, t, u]) => String(computeRisk(f, t, u).R)).join('\\n'));"
+    )
+    completed = subprocess.run(
+        [node, "-e", script],
+        input=json.dumps(inputs.tolist()),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return np.array([float(value) for value in completed.stdout.split("\n")])
+
+
+def write_golden(path=GOLDEN_PATH, html_path=FRONTEND_PATH):
+    """Regrava a tabela dourada a partir da página atual."""
+    inputs = golden_inputs()
+    r = run_page_kernel(inputs, html_path)
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(("failures", "tc_days", "u_hours", "R"))
+        for (failures, tc_days, u_hours), value in zip(inputs.tolist(), r.tolist()):
+            writer.writerow((repr(failures), repr(tc_days), repr(u_hours), repr(value)))
+    return len(r)
+
+
+def load_golden(path=GOLDEN_PATH):
+    """Colunas (failures, tc_days, u_hours, R) da tabela dourada."""
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = list(csv.reader(handle))[1:]
+    values = np.array([[float(value) for value in row] for row in rows], dtype=np.float64)
+    return values[:, 0].copy(), values[:, 1].copy(), values[:, 2].copy(), values[:, 3].copy()
+
+
+# =====================================================================
+# VERIFICAÇÃO
+# =====================================================================
+# Maior z com Γ(z) finito em float64, e maior expoente de exp()
+GAMMA_OVERFLOW_Z = 171.62437695630272
+EXP_OVERFLOW = 709.782712893384
+
+
+def js_overflow(failures, tc_days, u_hours):
+    """Linhas em que algum termo intermediário do JS estoura o float64."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        alpha = _alpha(tc_days * 24 * 60, u_hours * 60)
+        return (alpha + 2 > GAMMA_OVERFLOW_Z) | (alpha * failures / 365 > EXP_OVERFLOW)
+
+
+def compare(r, expected, tolerance):
+    """(erro relativo máximo, divergências) de r frente aos valores esperados."""
+    special = ~np.isfinite(expected) | (expected == 0)
+    mismatches = int(
+        np.sum(
+            special
+            & ~(
+                (np.isnan(expected) & np.isnan(r))
+                | ((expected == r) & ~np.isnan(expected))
+            )
+        )
+    )
+    regular = ~special
+    with np.errstate(divide="ignore", invalid="ignore"):
+        error = np.abs(r[regular] - expected[regular]) / np.abs(expected[regular])
+    error = np.where(np.isnan(error), np.inf, error)
+    mismatches += int(np.sum(error > tolerance))
+    return (float(error.max()) if error.size else 0.0), mismatches
+
+
+def check_kernels(names=None, path=GOLDEN_PATH):
+    """Compara cada kernel com a tabela dourada; retorna um resultado por kernel."""
+    failures, tc_days, u_hours, expected = load_golden(path)
+    overflow = js_overflow(failures, tc_days, u_hours)
+    results = []
+    for name in names or KERNELS:
+        kernel, tolerance, extended = KERNELS[name]
+        compared = ~overflow if extended else np.ones(len(expected), bool)
+        r = kernel(failures, tc_days, u_hours)
+        max_error, mismatches = compare(r[compared], expected[compared], tolerance)
+        results.append(
+            {
+                "kernel": name,
+                "rows": int(compared.sum()),
+                "max_rel_error": max_error,
+                "tolerance": tolerance,
+                "mismatches": mismatches,
+                "ok": mismatches == 0,
+            }
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m quimera.golden")
+    parser.add_argument("--regenerate", action="store_true", help="regrava a tabela via node")
+    parser.add_argument("kernels", nargs="*", help=f"subconjunto de: {', '.join(KERNELS)}")
+    args = parser.parse_args(argv)
+    unknown = set(args.kernels) - set(KERNELS)
+    if unknown:
+        parser.error(f"kernels desconhecidos: {', '.join(sorted(unknown))}")
+
+    if args.regenerate:
+        print(f"{write_golden()} vetores gravados em {GOLDEN_PATH}")
+    results = check_kernels(args.kernels or None)
+    for result in results:
+        print(
+            f"{result['kernel']:<20} {'ok' if result['ok'] else 'DIVERGE':<8} "
+            f"erro máx {result['max_rel_error']:.2e} (tolerância {result['tolerance']:.0e}), "
+            f"{result['mismatches']} de {result['rows']} fora"
+        )
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+# =====================================================================
+# HISTÓRICO DE PONTUAÇÕES EM SQLITE
+# Cada R calculado vira uma linha de 'scores', gravada em lotes dentro de
+# uma transação (journal WAL: leitores não bloqueiam o gravador). O
+# esquema é pensado para centenas de milhões de linhas:
+#   engines             engine_id (texto) -> inteiro compacto
+#   scores              WITHOUT ROWID, chave (engine, ts): a série de um
+#                       motor fica contígua e a tendência é uma varredura
+#                       de intervalo sobre a própria chave
+#   daily_phase_counts  contagem por (dia, fase), atualizada no mesmo
+#                       lote; a visão da frota nunca varre 'scores'
+# Regravar um par (motor, ts) substitui a pontuação anterior, e o rollup
+# troca a fase antiga pela nova: um arquivo de frota com ids repetidos
+# (todos com o mesmo ts) guarda a última linha de cada motor.
+# =====================================================================
+import logging
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from quimera.kernel import PHASE_LABELS, classify_phase
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86_400
+
+# Linhas por transação nas gravações em lote
+BATCH_ROWS = 50_000
+
+# Cache de páginas por conexão (KiB)
+CACHE_KIB = 65_536
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS engines (
+    id INTEGER PRIMARY KEY,
+    engine_id TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS scores (
+    engine INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    failures REAL,
+    tc_days REAL,
+    u_hours REAL,
+    r REAL,
+    phase INTEGER NOT NULL,
+    PRIMARY KEY (engine, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily_phase_counts (
+    day INTEGER NOT NULL,
+    phase INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, phase)
+) WITHOUT ROWID;
+"""
+
+
+class ScoreHistory:
+    """Histórico de R por motor em um arquivo SQLite.
+
+    Timestamps são segundos Unix; dias são contados em UTC. Uma mesma
+    conexão não deve ser usada por várias threads: abra uma por thread
+    (a abertura é barata) ou use o objeto como context manager.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(
+            "CREATE TEMP TABLE incoming (engine INTEGER, ts REAL, PRIMARY KEY (engine, ts)) "
+            "WITHOUT ROWID"
+        )
+        self.engine_rows = {}
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------------------------------------------------
+    # GRAVAÇÃO EM LOTE
+    # -----------------------------------------------------------------
+    def _engine_rows(self, engine_ids):
+        """Inteiros dos motores, cadastrando os que ainda não existem."""
+        missing = [
+            engine_id for engine_id in dict.fromkeys(engine_ids)
+            if engine_id not in self.engine_rows
+        ]
+        if missing:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO engines (engine_id) VALUES (?)",
+                ((engine_id,) for engine_id in missing),
+            )
+            for start in range(0, len(missing), 900):
+                batch = missing[start : start + 900]
+                placeholders = ",".join("?" * len(batch))
+                self.engine_rows.update(
+                    self.connection.execute(
+                        f"SELECT engine_id, id FROM engines WHERE engine_id IN ({placeholders})",
+                        batch,
+                    )
+                )
+        return np.fromiter((self.engine_rows[e] for e in engine_ids), np.int64, len(engine_ids))
+
+    def _existing_scores(self, engines, ts):
+        """(ts, fase) das pontuações já gravadas com os pares (motor, ts).
+
+        Os pares vão para uma tabela temporária e a junção percorre a
+        chave primária de 'scores' (uma busca por par).
+        """
+        self.connection.execute("DELETE FROM temp.incoming")
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO temp.incoming VALUES (?, ?)",
+            zip(engines.tolist(), ts.tolist()),
+        )
+        found = self.connection.execute(
+            "SELECT s.ts, s.phase FROM temp.incoming AS i "
+            "JOIN scores AS s ON s.engine = i.engine AND s.ts = i.ts"
+        ).fetchall()
+        return np.array(found, dtype=np.float64).reshape(-1, 2)
+
+    def record(self, engine_ids, ts, failures, tc_days, u_hours, r, phase=None):
+        """Grava um lote de pontuações (escalares são replicados).
+
+        Cada bloco de BATCH_ROWS linhas é uma transação: as linhas e a
+        contagem diária por fase entram juntas ou não entram. Um par
+        (motor, ts) repetido, no lote ou já gravado, fica com a última
+        pontuação.
+        """
+        engine_ids = [str(e) for e in np.atleast_1d(engine_ids).tolist()]
+        n = len(engine_ids)
+        ts, failures, tc_days, u_hours, r = (
+            np.broadcast_to(np.asarray(column, dtype=np.float64), (n,))
+            for column in (ts, failures, tc_days, u_hours, r)
+        )
+        phase = classify_phase(r) if phase is None else np.broadcast_to(phase, (n,))
+        day = np.floor(ts / SECONDS_PER_DAY).astype(np.int64)
+        phase = phase.astype(np.int64)
+
+        for start in range(0, n, BATCH_ROWS):
+            block = slice(start, min(start + BATCH_ROWS, n))
+            with self.connection:
+                engines = self._engine_rows(engine_ids[block])
+                # Inserir na ordem da chave (motor, ts) mantém as escritas locais na árvore
+                order = np.lexsort((ts[block], engines))
+                # Chaves repetidas no lote: a ordenação é estável, fica a última
+                sorted_engines, sorted_ts = engines[order], ts[block][order]
+                last = np.append(
+                    (sorted_engines[1:] != sorted_engines[:-1]) | (sorted_ts[1:] != sorted_ts[:-1]),
+                    True,
+                )
+                order = order[last]
+                replaced = self._existing_scores(engines[order], ts[block][order])
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    zip(
+                        engines[order].tolist(),
+                        ts[block][order].tolist(),
+                        failures[block][order].tolist(),
+                        tc_days[block][order].tolist(),
+                        u_hours[block][order].tolist(),
+                        r[block][order].tolist(),
+                        phase[block][order].tolist(),
+                    ),
+                )
+                # Agrega o lote em (dia, fase) antes de tocar o rollup; as
+                # pontuações substituídas saem da contagem da sua fase antiga
+                added = day[block][order] * len(PHASE_LABELS) + phase[block][order]
+                removed = (
+                    np.floor(replaced[:, 0] / SECONDS_PER_DAY).astype(np.int64)
+                    * len(PHASE_LABELS)
+                    + replaced[:, 1].astype(np.int64)
+                )
+                keys, inverse = np.unique(np.concatenate([added, removed]), return_inverse=True)
+                weights = np.concatenate([np.ones(len(added)), -np.ones(len(removed))])
+                counts = np.bincount(inverse, weights, len(keys)).astype(np.int64)
+                keys, counts = keys[counts != 0], counts[counts != 0]
+                self.connection.executemany(
+                    "INSERT INTO daily_phase_counts VALUES (?, ?, ?) "
+                    "ON CONFLICT (day, phase) DO UPDATE SET count = count + excluded.count",
+                    zip(
+                        (keys // len(PHASE_LABELS)).tolist(),
+                        (keys % len(PHASE_LABELS)).tolist(),
+                        counts.tolist(),
+                    ),
+                )
+        return n
+
+    def record_chunks(self, scored, ts, id_column="engine_id"):
+        """Grava blocos de stream.score_chunks e os repassa adiante.
+
+        Gerador de passagem: encaixa entre score_chunks e write_scored.
+        Blocos sem a coluna de identificação não são gravados: o número da
+        linha não identifica o motor entre um arquivo e outro.
+        """
+        warned = False
+        for chunk, progress in scored:
+            if id_column not in chunk.columns:
+                if not warned:
+                    logger.warning("Coluna %s ausente: blocos fora do histórico", id_column)
+                    warned = True
+                yield chunk, progress
+                continue
+            self.record(
+                chunk[id_column].astype(str).tolist(),
+                ts,
+                chunk["failures"].to_numpy(np.float64),
+                chunk["tc_days"].to_numpy(np.float64),
+                chunk["u_hours"].to_numpy(np.float64),
+                chunk["R"].to_numpy(np.float64),
+                chunk["phase"].to_numpy(np.int8),
+            )
+            yield chunk, progress
+
+    # -----------------------------------------------------------------
+    # CONSULTAS
+    # -----------------------------------------------------------------
+    def engine_ids(self):
+        return [row[0] for row in self.connection.execute("SELECT engine_id FROM engines")]
+
+    def _engine_scores(self, engine_id, columns, start, end):
+        """Linhas de 'scores' de um motor entre start e end, em ordem de ts."""
+        row = self.connection.execute(
+            "SELECT id FROM engines WHERE engine_id = ?", (str(engine_id),)
+        ).fetchone()
+        if row is None:
+            return []
+        return self.connection.execute(
+            f"SELECT {', '.join(columns)} FROM scores "
+            "WHERE engine = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+            (
+                row[0],
+                -np.inf if start is None else float(start),
+                np.inf if end is None else float(end),
+            ),
+        ).fetchall()
+
+    def trend(self, engine_id, start=None, end=None):
+        """Série de um motor entre start e end (timestamps), em ordem de ts."""
+        records = self._engine_scores(
+            engine_id, ("ts", "failures", "tc_days", "u_hours", "r", "phase"), start, end
+        )
+        return pd.DataFrame.from_records(
+            records, columns=["ts", "failures", "tc_days", "u_hours", "R", "phase"]
+        )
+
+    def last_ts(self, engine_id):
+        """Timestamp da pontuação mais recente do motor (None se não houver)."""
+        row = self.connection.execute(
+            "SELECT max(ts) FROM scores WHERE engine = "
+            "(SELECT id FROM engines WHERE engine_id = ?)",
+            (str(engine_id),),
+        ).fetchone()
+        return row[0]
+
+    def series(self, engine_id, start=None, end=None):
+        """Apenas (ts, R) de um motor, como arrays: o caminho leve dos gráficos."""
+        records = self._engine_scores(engine_id, ("ts", "r"), start, end)
+        values = np.array(records, dtype=np.float64).reshape(-1, 2)
+        return values[:, 0], values[:, 1]
+
+    def daily_phase_counts(self, start_day=None, end_day=None):
+        """Contagem diária por fase: linhas = dia (UTC), colunas = PHASE_LABELS."""
+        records = self.connection.execute(
+            "SELECT day, phase, count FROM daily_phase_counts "
+            "WHERE day >= ? AND day <= ? ORDER BY day",
+            (
+                -(2**62) if start_day is None else int(start_day),
+                2**62 if end_day is None else int(end_day),
+            ),
+        ).fetchall()
+        counts = pd.DataFrame.from_records(records, columns=["day", "phase", "count"])
+        table = counts.pivot(index="day", columns="phase", values="count")
+        table = table.reindex(columns=range(len(PHASE_LABELS)), fill_value=0).fillna(0)
+        table.columns = list(PHASE_LABELS)
+        table.index = pd.to_datetime(table.index * SECONDS_PER_DAY, unit="s")
+        return table.astype(np.int64)
@@ -0,0 +1,404 @@
+# =====================================================================
+# SERVIÇO DE INGESTÃO DE TELEMETRIA (asyncio, NDJSON)
+# Recebe eventos de motores por TCP ou socket Unix, um objeto JSON por
+# linha:
+#   {"event": "failure", "engine_id": "M-1", "ts": 1718000000.0}
+#   {"event": "repair",  "engine_id": "M-1"}                (ts = agora)
+#   {"event": "usage",   "engine_id": "M-1", "u_hours": 14.5}
+# Cada leitura do socket vira um lote de eventos numa fila limitada: se o
+# consumidor atrasa, a fila enche, a conexão deixa de ser lida e o TCP
+# segura o cliente (backpressure de ponta a ponta, sem descartar nada).
+# Só linhas inválidas são descartadas (e contadas), inclusive as maiores
+# que MAX_LINE_BYTES, para que uma conexão sem '\n' não acumule memória.
+# O consumidor junta os lotes pendentes num microlote, aplica-o ao
+# FleetState e reavalia cada motor afetado uma só vez, vetorizado. O
+# painel lê um instantâneo (.npz) regravado atomicamente a cada segundo.
+#
+#   python -m quimera.ingest serve --port 7878 --snapshot live.npz
+#   python -m quimera.ingest loadgen --port 7878 --events 1000000
+# =====================================================================
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from quimera import metrics
+from quimera.kernel import classify_phase
+from quimera.state import SECONDS_PER_DAY, FleetState, check_event
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7878
+
+# Bytes por leitura do socket (~800 eventos por lote)
+READ_BYTES = 64 * 1024
+
+# Maior linha aceita; um evento válido tem menos de 200 bytes
+MAX_LINE_BYTES = 4 * 1024
+
+# Lotes de leitura pendentes antes de as conexões pararem de ser lidas
+QUEUE_BATCHES = 256
+
+# Eventos máximos por microlote aplicado ao estado
+MICRO_BATCH_EVENTS = 50_000
+
+# Intervalo entre instantâneos para o painel e entre linhas de log
+SNAPSHOT_SECONDS = 1.0
+STATS_SECONDS = 5.0
+
+
+def parse_events(lines, now):
+    """Converte linhas NDJSON em tuplas (kind, engine_id, ts, u_hours).
+
+    Linhas vazias são ignoradas; linhas inválidas (JSON malformado, evento
+    desconhecido, campos ausentes, ts ou u_hours não finitos) são contadas
+    e descartadas sem derrubar a conexão. Retorna (eventos, rejeitadas).
+    """
+    events = []
+    rejected = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            message = json.loads(line)
+            kind = message["event"]
+            ts = float(message.get("ts", now))
+            u_hours = float(message["u_hours"]) if kind == "usage" else math.nan
+            # Mesma validação de FleetState.apply_events, evento a evento
+            check_event(kind, ts, u_hours)
+            events.append((kind, str(message["engine_id"]), ts, u_hours))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            rejected += 1
+    return events, rejected
+
+
+def write_snapshot(state, path):
+    """Grava o R corrente de cada motor em .npz, trocando o arquivo atomicamente."""
+    n = len(state)
+    columns = state.columns
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as handle:
+        np.savez(
+            handle,
+            engine_id=np.array(state.engine_ids[:n], dtype=str),
+            failures=columns["failures"][:n],
+            tc_days=np.maximum(columns["updated"][:n] - columns["last_repair"][:n], 0.0)
+            / SECONDS_PER_DAY,
+            u_hours=columns["u_hours"][:n],
+            r=columns["r"][:n],
+            updated=columns["updated"][:n],
+        )
+    os.replace(temporary, path)
+
+
+def read_snapshot(path):
+    """Instantâneo gravado pelo serviço como DataFrame (uma linha por motor)."""
+    with np.load(path) as snapshot:
+        frame = pd.DataFrame(
+            {
+                "engine_id": snapshot["engine_id"],
+                "failures": snapshot["failures"],
+                "tc_days": snapshot["tc_days"],
+                "u_hours": snapshot["u_hours"],
+                "R": snapshot["r"],
+                "updated": pd.to_datetime(snapshot["updated"], unit="s"),
+            }
+        )
+    frame["phase"] = classify_phase(frame["R"].to_numpy())
+    return frame
+
+
+class IngestServer:
+    """Serviço asyncio que mantém o R corrente da frota a partir de eventos."""
+
+    def __init__(
+        self,
+        state=None,
+        snapshot_path=None,
+        queue_batches=QUEUE_BATCHES,
+        micro_batch_events=MICRO_BATCH_EVENTS,
+    ):
+        self.state = FleetState() if state is None else state
+        self.snapshot_path = snapshot_path
+        self.queue = asyncio.Queue(maxsize=queue_batches)
+        self.micro_batch_events = micro_batch_events
+        self.stats = {
+            "events": 0,
+            "rejected": 0,    # linhas inválidas ou longas demais
+            "failed": 0,      # eventos de microlotes que não puderam ser aplicados
+            "batches": 0,
+            "connections": 0,
+        }
+        self.version = 0       # microlotes aplicados
+        self.published = 0     # versão do último instantâneo
+        self.server = None
+        self.tasks = []
+
+    # -----------------------------------------------------------------
+    # CONEXÕES
+    # -----------------------------------------------------------------
+    async def handle(self, reader, writer):
+        """Lê NDJSON de uma conexão até o EOF, enfileirando um lote por leitura.
+
+        A linha incompleta que fica entre leituras é limitada a
+        MAX_LINE_BYTES: acima disso é descartada até o próximo '\\n' e
+        conta como rejeitada.
+        """
+        self.stats["connections"] += 1
+        pending = b""
+        discarding = False
+        try:
+            while True:
+                chunk = await reader.read(READ_BYTES)
+                if not chunk:
+                    break
+                *lines, pending = (pending + chunk).split(b"\n")
+                if discarding:
+                    if not lines:
+                        pending = b""  # ainda dentro da linha longa
+                        continue
+                    lines = lines[1:]  # fim da linha longa
+                    discarding = False
+                if len(pending) > MAX_LINE_BYTES:
+                    self.stats["rejected"] += 1
+                    pending = b""
+                    discarding = True
+                await self._enqueue(lines)
+            if not discarding:
+                await self._enqueue([pending])
+        except ConnectionError:
+            pass
+        finally:
+            self.stats["connections"] -= 1
+            writer.close()
+
+    async def _enqueue(self, lines):
+        with metrics.timed("parsing"):
+            events, rejected = parse_events(lines, time.time())
+        self.stats["rejected"] += rejected
+        if events:
+            # Fila cheia: espera aqui, e a conexão deixa de ser lida
+            await self.queue.put(events)
+
+    # -----------------------------------------------------------------
+    # CONSUMO EM MICROLOTES
+    # -----------------------------------------------------------------
+    async def consume(self):
+        while True:
+            batch = await self.queue.get()
+            taken = 1
+            # Junta o que já estiver na fila, sem esperar por mais
+            while len(batch) < self.micro_batch_events and not self.queue.empty():
+                batch += self.queue.get_nowait()
+                taken += 1
+            try:
+                self.state.apply_events(batch)
+            except Exception:
+                # apply_events valida o lote antes de mudar o estado: nada
+                # do microlote ficou aplicado pela metade
+                self.stats["failed"] += len(batch)
+                logger.exception("Falha ao aplicar microlote de %d eventos", len(batch))
+            else:
+                self.stats["events"] += len(batch)
+                self.stats["batches"] += 1
+                self.version += 1
+            for _ in range(taken):
+                self.queue.task_done()
+            # Cede o laço para as conexões entre microlotes
+            await asyncio.sleep(0)
+
+    def publish(self):
+        """Regrava o instantâneo se houve microlotes desde o último."""
+        if self.snapshot_path is None or self.published == self.version:
+            return
+        write_snapshot(self.state, self.snapshot_path)
+        self.published = self.version
+
+    async def _publish_loop(self):
+        while True:
+            await asyncio.sleep(SNAPSHOT_SECONDS)
+            self.publish()
+
+    async def _stats_loop(self):
+        last_events, last_time = 0, time.perf_counter()
+        while True:
+            await asyncio.sleep(STATS_SECONDS)
+            now = time.perf_counter()
+            events = self.stats["events"]
+            logger.info(
+                "%.0f eventos/s, %d motores, fila %d/%d, %d rejeitados, %d com falha",
+                (events - last_events) / (now - last_time),
+                len(self.state),
+                self.queue.qsize(),
+                self.queue.maxsize,
+                self.stats["rejected"],
+                self.stats["failed"],
+            )
+            last_events, last_time = events, now
+
+    # -----------------------------------------------------------------
+    # CICLO DE VIDA
+    # -----------------------------------------------------------------
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        """Abre o socket (Unix se unix_path for dado) e inicia o consumidor."""
+        if unix_path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, unix_path)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port)
+        self.tasks = [
+            asyncio.create_task(self.consume()),
+            asyncio.create_task(self._publish_loop()),
+            asyncio.create_task(self._stats_loop()),
+        ]
+        return self.server
+
+    async def drain(self, poll_seconds=0.01):
+        """Espera as conexões abertas terminarem e a fila ser toda aplicada."""
+        while self.stats["connections"]:
+            await asyncio.sleep(poll_seconds)
+        await self.queue.join()
+
+    async def stop(self):
+        """Para de aceitar conexões, termina as abertas e grava o instantâneo final."""
+        self.server.close()
+        await self.server.wait_closed()
+        await self.drain()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.publish()
+
+
+# =====================================================================
+# GERADOR DE CARGA
+# Simula uma frota mandando eventos pelo mesmo protocolo: cada motor
+# começa com uma amostra de uso e depois recebe uma mistura de amostras,
+# falhas e reparos com timestamps crescentes. writer.drain() respeita o
+# backpressure do serviço.
+# =====================================================================
+EVENT_MIX = {"usage": 0.80, "failure": 0.15, "repair": 0.05}
+
+
+def generate_lines(engines, events, start_ts, step_seconds=60.0, seed=None):
+    """Linhas NDJSON (bytes) de uma carga sintética."""
+    rng = np.random.default_rng(seed)
+    ids = [f"M-{i:06d}" for i in range(engines)]
+    kinds = list(EVENT_MIX)
+    lines = [
+        f'{{"event": "usage", "engine_id": "{engine_id}", "ts": {start_ts}, "u_hours": 8.0}}\n'
+        for engine_id in ids
+    ]
+    remaining = max(0, events - engines)
+    choice = rng.choice(len(kinds), remaining, p=list(EVENT_MIX.values())).tolist()
+    engine = rng.integers(0, engines, remaining).tolist()
+    usage = np.round(rng.uniform(0.5, 24.0, remaining), 2).tolist()
+    for i in range(remaining):
+        kind = kinds[choice[i]]
+        ts = start_ts + (i + 1) * step_seconds / engines
+        extra = f', "u_hours": {usage[i]}' if kind == "usage" else ""
+        lines.append(
+            f'{{"event": "{kind}", "engine_id": "{ids[engine[i]]}", "ts": {ts:.3f}{extra}}}\n'
+        )
+    return [line.encode("ascii") for line in lines]
+
+
+async def send_lines(lines, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None, block=1000):
+    """Envia linhas por uma conexão, em blocos, respeitando o backpressure."""
+    if unix_path is not None:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    for start in range(0, len(lines), block):
+        writer.write(b"".join(lines[start : start + block]))
+        await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+
+
+async def generate_load(
+    engines=10_000,
+    events=1_000_000,
+    connections=4,
+    host=DEFAULT_HOST,
+    port=DEFAULT_PORT,
+    unix_path=None,
+    seed=None,
+):
+    """Manda a carga sintética por várias conexões; retorna (eventos, segundos).
+
+    Motores são repartidos entre as conexões, para que os eventos de um
+    mesmo motor cheguem em ordem.
+    """
+    start_ts = time.time() - 365 * SECONDS_PER_DAY
+    lines = generate_lines(engines, events, start_ts, seed=seed)
+    shards = [[] for _ in range(connections)]
+    for line in lines:
+        # O número do motor está em posição fixa no texto da linha
+        engine = int(line[line.index(b'"M-') + 3 : line.index(b'"M-') + 9])
+        shards[engine % connections].append(line)
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(send_lines(shard, host, port, unix_path) for shard in shards if shard)
+    )
+    return len(lines), time.perf_counter() - started
+
+
+# =====================================================================
+# LINHA DE COMANDO
+# =====================================================================
+async def _serve(args):
+    server = IngestServer(snapshot_path=args.snapshot)
+    await server.start(args.host, args.port, args.unix)
+    logger.info("Ouvindo em %s", args.unix or f"{args.host}:{args.port}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m quimera.ingest")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="serviço de ingestão")
+    load = commands.add_parser("loadgen", help="gerador de carga sintética")
+    for command in (serve, load):
+        command.add_argument("--host", default=DEFAULT_HOST)
+        command.add_argument("--port", type=int, default=DEFAULT_PORT)
+        command.add_argument("--unix", help="caminho de socket Unix (no lugar de TCP)")
+    serve.add_argument("--snapshot", help="arquivo .npz lido pelo painel")
+    load.add_argument("--engines", type=int, default=10_000)
+    load.add_argument("--events", type=int, default=1_000_000)
+    load.add_argument("--connections", type=int, default=4)
+    load.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+    else:
+        sent, seconds = asyncio.run(
+            generate_load(
+                args.engines,
+                args.events,
+                args.connections,
+                args.host,
+                args.port,
+                args.unix,
+                args.seed,
+            )
+        )
+        print(f"{sent:,} eventos em {seconds:.2f} s ({sent / seconds:,.0f} eventos/s)")
+
+
+if __name__ == "__main__":
+    main()
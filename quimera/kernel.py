@@ -0,0 +1,272 @@
+# =====================================================================
+# NÚCLEO VETORIZADO DA EQUAÇÃO QUIMERA
+# Porta fiel, sobre arrays NumPy, da lógica do handler 'submit' embutido
+# em 'html_code' (app_0.py). Cada etapa mantém a numeração do JavaScript
+# para facilitar a auditoria lado a lado.
+# =====================================================================
+import math
+
+import numpy as np
+from scipy.special import gammaln, gammasgn
+
+from quimera import metrics
+
+# Constantes de Lanczos para g = 7 (idênticas à função gamma() do front-end)
+LANCZOS_G = 7
+LANCZOS_P = np.array([
+    0.99999999999980993,
+    676.5203681218851,
+    -1259.1392167224028,
+    771.32342877765313,
+    -176.61502916214059,
+    12.507343278686905,
+    -0.13857109526572012,
+    9.9843695780195716e-6,
+    1.5056327351493116e-7,
+])
+
+# Proteção de domínio aplicada quando ln(Γ(α + 2)) <= 0
+INNER_LOG_FLOOR = 0.000001
+
+# Versão do modelo exibida na aba "Visão & Teoria" (artefatos derivados,
+# como tabelas pré-calculadas, são invalidados quando ela muda)
+MODEL_VERSION = "4.1.0"
+
+# Conversões padrão do modelo: horas de operação contadas por dia de tc e
+# janela (em dias) da taxa de falhas λ. Perfis de equipamento podem
+# sobrescrevê-las (quimera.profiles).
+HOURS_PER_DAY = 24
+WINDOW_DAYS = 365.0
+
+
+def _lanczos_core(z):
+    """Série de Lanczos para z >= 0.5 (sem a fórmula de reflexão)."""
+    z = z - 1
+    x = np.full_like(z, LANCZOS_P[0])
+    for i in range(1, LANCZOS_G + 2):
+        x += LANCZOS_P[i] / (z + i)
+    t = z + LANCZOS_G + 0.5
+    return np.sqrt(2 * np.pi) * np.power(t, z + 0.5) * np.exp(-t) * x
+
+
+def gamma(z):
+    """Aproximação de Lanczos para Γ(z), vetorizada.
+
+    Reproduz a recursão do JavaScript: para z < 0.5 aplica a fórmula de
+    reflexão Γ(z) = π / (sin(πz) · Γ(1 - z)).
+    """
+    z = np.asarray(z, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        reflect = z < 0.5
+        zz = np.where(reflect, 1 - z, z)
+        core = _lanczos_core(zz)
+        return np.where(reflect, np.pi / (np.sin(np.pi * z) * core), core)
+
+
+def _alpha(tc, u):
+    """Fator alfa (α) com os ramos tc === 0 e tc === u do front-end."""
+    num_alpha = np.where(
+        tc == 0,
+        np.log(np.abs(u)),
+        np.where(tc == u, 1.0, np.abs(tc - u)),
+    )
+    return num_alpha / (tc + 1)
+
+
+def compute_r(failures, tc_days, u_hours):
+    """Calcula o índice de risco R da Equação Quimera para cada motor.
+
+    Os três argumentos são escalares ou arrays compatíveis por broadcasting
+    (falhas nos últimos 365 dias, dias desde o último reparo e horas de uso
+    diário). Retorna um ndarray float64 com |R|, exatamente como o front-end.
+    """
+    # Instrumentação (quimera.metrics): None quando desligada
+    timer = metrics.stage_timer()
+    failures = np.asarray(failures, dtype=np.float64)
+    tc_days = np.asarray(tc_days, dtype=np.float64)
+    u_hours = np.asarray(u_hours, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # 2. Conversão de unidades (dias -> minutos, horas -> minutos)
+        tc = tc_days * 24 * 60
+        u = u_hours * 60
+
+        # Taxa histórica de falha ao ano (λ)
+        lam = failures / 365.0
+        if timer:
+            timer.mark("conversion")
+
+        # 3. Fator alfa (α) com os ramos tc === 0 e tc === u
+        tc_zero = tc == 0
+        alpha = _alpha(tc, u)
+        if timer:
+            timer.mark("alpha")
+
+        # 4.4. Termo exponencial de maturação de falhas
+        exp_term = np.exp(alpha * lam)
+        if timer:
+            timer.mark("exp_term")
+
+        # 4.3. Logaritmo duplo da função gama, com a proteção de domínio
+        inner_log = np.log(gamma(alpha + 2))
+        floor = inner_log <= 0
+        inner_log = np.where(floor, INNER_LOG_FLOOR, inner_log)
+        log_log_term = np.log(inner_log)
+        lock = (log_log_term < 0) & tc_zero
+        log_log_term = np.where(lock, 0.0, log_log_term)
+        if timer:
+            timer.mark("gamma_lnln")
+
+        # 4.2. Termo estabilizador de Euler
+        euler_term = np.where(tc > 0, np.power(1 + 1 / tc, tc), 1.0)
+        if timer:
+            timer.mark("euler")
+
+        # 4.1. Termo de fadiga temporal (raiz de tcd)
+        root_tcd = np.sqrt(tc_days)
+
+        # 4.5. Síntese final (R = 0 quando u <= 0)
+        raw_r = np.where(
+            u > 0, (exp_term * log_log_term * root_tcd * euler_term) / u, 0.0
+        )
+
+    # 4.6. Extração de magnitude
+    r = np.abs(raw_r)
+    if timer:
+        timer.mark("synthesis")
+        metrics.count_kernel(r, floor, lock)
+    return r
+
+
+# =====================================================================
+# AVALIAÇÃO EM ESPAÇO LOGARÍTMICO
+# Mesma equação, mas somando log|R| termo a termo. Nenhum termo
+# intermediário estoura, de modo que faixas extremas de entrada seguem
+# 100% vetorizadas, sem caminho de resgate elemento a elemento em Python.
+# =====================================================================
+def compute_log_r(
+    failures, tc_days, u_hours, hours_per_day=HOURS_PER_DAY, window_days=WINDOW_DAYS
+):
+    """Calcula (log R, R) em espaço logarítmico.
+
+    log R = α·λ + ln|ln ln Γ(α + 2)| + ½·ln(tcd) + tc·log1p(1/tc) - ln(u)
+
+    ln Γ vem de gammaln (sem overflow para α grande) e o termo de Euler de
+    log1p (sem perda de precisão para tc em milhões de minutos). Quando R
+    é exatamente zero (tcd = 0, u <= 0 ou trava no ponto zero), log R é
+    -inf. R = exp(log R) pode ser inf quando o índice excede o float64;
+    log R continua finito nesse caso. hours_per_day e window_days trocam
+    as conversões padrão (tc = tcd · 24 · 60 e λ = falhas / 365).
+    """
+    # Instrumentação (quimera.metrics): None quando desligada
+    timer = metrics.stage_timer()
+    failures = np.asarray(failures, dtype=np.float64)
+    tc_days = np.asarray(tc_days, dtype=np.float64)
+    u_hours = np.asarray(u_hours, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        tc = tc_days * hours_per_day * 60
+        u = u_hours * 60
+        lam = failures / window_days
+        if timer:
+            timer.mark("conversion")
+        alpha = _alpha(tc, u)
+        if timer:
+            timer.mark("alpha")
+
+        # Termo exponencial: já é um expoente, entra somado
+        log_exp_term = alpha * lam
+        if timer:
+            timer.mark("exp_term")
+
+        # Logaritmo duplo da função gama (Γ negativa gera NaN, como no JS)
+        z = alpha + 2
+        inner_log = np.where(gammasgn(z) < 0, np.nan, gammaln(z))
+        floor = inner_log <= 0
+        inner_log = np.where(floor, INNER_LOG_FLOOR, inner_log)
+        log_log_term = np.log(inner_log)
+        lock = (log_log_term < 0) & (tc == 0)
+        log_log_term = np.where(lock, 0.0, log_log_term)
+        log_abs_log_log = np.log(np.abs(log_log_term))
+        if timer:
+            timer.mark("gamma_lnln")
+
+        # Raiz de tcd e termo de Euler
+        log_euler = np.where(tc > 0, tc * np.log1p(1 / tc), 0.0)
+        if timer:
+            timer.mark("euler")
+        log_root_tcd = 0.5 * np.log(tc_days)
+
+        log_r = log_exp_term + log_abs_log_log + log_root_tcd + log_euler - np.log(u)
+        log_r = np.where(u > 0, log_r, -np.inf)
+        r = np.exp(log_r)
+        if timer:
+            timer.mark("synthesis")
+            metrics.count_kernel(r, floor, lock)
+
+    return log_r, r
+
+
+def log_r_scalar(
+    failures, tc_days, u_hours, hours_per_day=HOURS_PER_DAY, window_days=WINDOW_DAYS
+):
+    """Versão escalar de compute_log_r em Python puro; retorna só log R.
+
+    Para um único motor evita o overhead fixo do NumPy (dezenas de µs por
+    chamada), útil em caminhos orientados a eventos. Não é instrumentada:
+    marcar o relógio custaria mais que o próprio cálculo.
+    """
+    tc = tc_days * hours_per_day * 60
+    u = u_hours * 60
+    # not u > 0 também zera R quando u é NaN, como o `if (u > 0)` do JS
+    if not u > 0:
+        return -math.inf
+    if tc_days < 0:
+        return math.nan
+
+    if tc == 0:
+        alpha = math.log(abs(u))
+    elif tc == u:
+        alpha = 1 / (tc + 1)
+    else:
+        alpha = abs(tc - u) / (tc + 1)
+
+    # Γ(z) negativa (ou polo) gera NaN, como no JS e em compute_log_r
+    z = alpha + 2
+    if z <= 0 and (z == math.floor(z) or math.floor(z) % 2):
+        return math.nan
+    inner_log = math.lgamma(z)
+    if inner_log <= 0:
+        inner_log = INNER_LOG_FLOOR
+    log_log_term = math.log(inner_log)
+    if tc_days == 0 or log_log_term == 0:
+        return -math.inf
+
+    log_euler = tc * math.log1p(1 / tc)
+    return (
+        alpha * (failures / window_days)
+        + math.log(abs(log_log_term))
+        + 0.5 * math.log(tc_days)
+        + log_euler
+        - math.log(u)
+    )
+
+
+# =====================================================================
+# ESCADA DE FASES (AS 4 FASES DO FRONT-END)
+# Limiares R >= 0.01 / 0.03 / 0.06, na mesma ordem do if/else do JS.
+# =====================================================================
+PHASE_THRESHOLDS = np.array([0.0100, 0.0300, 0.0600])
+PHASE_LABELS = ("EXTREMAMENTE SEGURO", "SEGURO", "ALERTA", "FALHA IMINENTE")
+
+
+def classify_phase(r):
+    """Converte R em códigos de fase 0..3 (índices de PHASE_LABELS).
+
+    Valores NaN caem na fase 0, tal como no JavaScript, onde todas as
+    comparações com NaN são falsas e o ladder termina no 'else'.
+    """
+    with metrics.timed("phase"):
+        r = np.asarray(r, dtype=np.float64)
+        codes = np.searchsorted(PHASE_THRESHOLDS, r, side="right")
+        return np.where(np.isnan(r), 0, codes).astype(np.int8)
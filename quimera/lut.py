@@ -0,0 +1,194 @@
+# =====================================================================
+# TABELA PRÉ-CALCULADA DE R (LOOKUP + INTERPOLAÇÃO)
+# Em espaço logarítmico as falhas entram apenas no termo aditivo α·λ e o
+# uso diário entra (além de α) no termo exato -ln(u):
+#
+#   log R = α·λ - ln(u) + h(tc, u),   h = ln|ln ln Γ(α+2)| + ½·ln(tcd) + tc·log1p(1/tc)
+#
+# α = |tc - u| / (tc + 1) é pura aritmética e h é suave no domínio da
+# grade, então a tabela guarda apenas h sobre (ln tcd × u_hours); α·λ e
+# ln(u) são somados na consulta. Qualquer contagem de falhas é suportada
+# sem uma terceira dimensão, e a curvatura de ln(u) perto de 0 não entra
+# no erro de interpolação.
+#
+# A tabela é construída uma vez por MODEL_VERSION, refinada até atingir a
+# tolerância pedida, gravada em .npy + .json e aberta via memory-map.
+# =====================================================================
+import json
+import math
+import os
+
+import numpy as np
+
+from quimera.kernel import MODEL_VERSION, compute_log_r
+
+# Domínio da grade; fora dele a consulta recorre ao kernel exato. A partir
+# de 2 dias α >= 0.5, longe do canto tc ≈ u em que ln ln Γ(α+2) diverge.
+TC_DAYS_RANGE = (2.0, 20_000.0)
+U_HOURS_RANGE = (0.1, 24.0)
+
+DEFAULT_TOLERANCE = 1e-4
+INITIAL_SHAPE = (256, 64)
+VALIDATION_SAMPLES = 200_000
+
+
+def _h_exact(tc_days, u_hours):
+    """Parte de log R tabelada: sem o termo das falhas e sem -ln(u)."""
+    return compute_log_r(0.0, tc_days, u_hours)[0] + np.log(u_hours * 60)
+
+
+class RLookupTable:
+    """Grade de h(ln tcd, u) com interpolação bilinear.
+
+    Use RLookupTable.load_or_build(path) para abrir a tabela persistida
+    (memory-map) ou construí-la quando ausente ou de outra versão.
+    """
+
+    def __init__(self, table, tc_days_range, u_hours_range, max_rel_error):
+        self.table = table
+        self.n_tc, self.n_u = table.shape
+        self.log_tc_lo = math.log(tc_days_range[0])
+        self.log_tc_hi = math.log(tc_days_range[1])
+        self.u_lo, self.u_hi = float(u_hours_range[0]), float(u_hours_range[1])
+        self.log_tc_step = (self.log_tc_hi - self.log_tc_lo) / (self.n_tc - 1)
+        self.u_step = (self.u_hi - self.u_lo) / (self.n_u - 1)
+        self.max_rel_error = max_rel_error
+
+    # -----------------------------------------------------------------
+    # CONSTRUÇÃO E PERSISTÊNCIA
+    # -----------------------------------------------------------------
+    @classmethod
+    def build(cls, tolerance=DEFAULT_TOLERANCE, shape=INITIAL_SHAPE):
+        """Constrói a grade, dobrando a resolução até atingir a tolerância."""
+        n_tc, n_u = shape
+        while True:
+            log_tc = np.linspace(np.log(TC_DAYS_RANGE[0]), np.log(TC_DAYS_RANGE[1]), n_tc)
+            u_hours = np.linspace(U_HOURS_RANGE[0], U_HOURS_RANGE[1], n_u)
+            table = _h_exact(np.exp(log_tc)[:, None], u_hours[None, :])
+            lut = cls(table, TC_DAYS_RANGE, U_HOURS_RANGE, max_rel_error=None)
+            lut.max_rel_error = lut.validate()
+            if lut.max_rel_error <= tolerance:
+                return lut
+            n_tc, n_u = 2 * n_tc - 1, 2 * n_u - 1
+
+    def validate(self, samples=VALIDATION_SAMPLES):
+        """Erro relativo máximo de R frente ao kernel exato, em pontos aleatórios."""
+        rng = np.random.default_rng(0)
+        tc_days = np.exp(rng.uniform(self.log_tc_lo, self.log_tc_hi, samples))
+        u_hours = rng.uniform(self.u_lo, self.u_hi, samples)
+        failures = rng.integers(0, 100, samples).astype(np.float64)
+
+        exact, _ = compute_log_r(failures, tc_days, u_hours)
+        approx, _ = self.compute_log_r(failures, tc_days, u_hours)
+        return float(np.max(np.abs(np.expm1(approx - exact))))
+
+    def save(self, path):
+        """Grava a grade em path (.npy) e os metadados em path + '.json'."""
+        np.save(path, np.ascontiguousarray(self.table))
+        meta = {
+            "model_version": MODEL_VERSION,
+            "tc_days_range": [math.exp(self.log_tc_lo), math.exp(self.log_tc_hi)],
+            "u_hours_range": [self.u_lo, self.u_hi],
+            "max_rel_error": self.max_rel_error,
+        }
+        with open(path + ".json", "w") as handle:
+            json.dump(meta, handle, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Abre a grade via memory-map; retorna None se ausente ou obsoleta."""
+        try:
+            with open(path + ".json") as handle:
+                meta = json.load(handle)
+            table = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if meta.get("model_version") != MODEL_VERSION:
+            return None
+        return cls(table, meta["tc_days_range"], meta["u_hours_range"], meta["max_rel_error"])
+
+    @classmethod
+    def load_or_build(cls, path, tolerance=DEFAULT_TOLERANCE):
+        """Carrega a tabela de path ou a constrói (e grava) para esta versão."""
+        lut = cls.load(path)
+        if lut is not None and lut.max_rel_error <= tolerance:
+            return lut
+        lut = cls.build(tolerance)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        lut.save(path)
+        return cls.load(path)
+
+    # -----------------------------------------------------------------
+    # CONSULTA
+    # -----------------------------------------------------------------
+    def compute_log_r(self, failures, tc_days, u_hours):
+        """Mesma interface de kernel.compute_log_r: retorna (log R, R)."""
+        failures, tc_days, u_hours = np.broadcast_arrays(
+            np.asarray(failures, dtype=np.float64),
+            np.asarray(tc_days, dtype=np.float64),
+            np.asarray(u_hours, dtype=np.float64),
+        )
+        # Operações in-place exigem arrays (escalares 0-d viram 1-d)
+        shape = failures.shape
+        failures, tc_days, u_hours = (a.reshape(-1) for a in (failures, tc_days, u_hours))
+
+        n_tc, n_u = self.n_tc, self.n_u
+        flat = self.table.reshape(-1)
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            # Coordenadas fracionárias na grade (presas ao domínio)
+            x = np.log(tc_days)
+            x -= self.log_tc_lo
+            x /= self.log_tc_step
+            y = (u_hours - self.u_lo) / self.u_step
+            inside = (x >= 0) & (x <= n_tc - 1) & (y >= 0) & (y <= n_u - 1)
+            # NaN (ex.: tcd < 0) já está fora; só precisa de um índice válido
+            np.copyto(x, 0.0, where=np.isnan(x))
+            np.copyto(y, 0.0, where=np.isnan(y))
+            np.clip(x, 0, n_tc - 1, out=x)
+            np.clip(y, 0, n_u - 1, out=y)
+
+            i = np.minimum(x.astype(np.intp), n_tc - 2)
+            j = np.minimum(y.astype(np.intp), n_u - 2)
+            x -= i
+            y -= j
+
+            # Interpolação bilinear com gathers sobre a grade achatada
+            k = i * n_u
+            k += j
+            h00 = flat.take(k)
+            h01 = flat.take(k + 1)
+            k += n_u
+            h10 = flat.take(k)
+            h11 = flat.take(k + 1)
+            h01 -= h00
+            h11 -= h10
+            h01 *= y
+            h11 *= y
+            h00 += h01
+            h10 += h11
+            h10 -= h00
+            h10 *= x
+            log_r = h00 + h10
+
+            # Dentro da grade tc > u, então α = (tc - u) / (tc + 1) sem ramos
+            tc = tc_days * (24 * 60)
+            u = u_hours * 60
+            alpha = tc - u
+            alpha /= tc + 1
+            alpha *= failures
+            alpha /= 365.0
+            log_r += alpha
+            log_r -= np.log(u)
+
+            if not inside.all():
+                outside = ~inside
+                log_r[outside] = compute_log_r(
+                    failures[outside], tc_days[outside], u_hours[outside]
+                )[0]
+
+            log_r = log_r.reshape(shape)
+            r = np.exp(log_r)
+
+        return log_r, r
+
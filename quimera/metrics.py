@@ -0,0 +1,219 @@
+# =====================================================================
+# INSTRUMENTAÇÃO DO CAMINHO DE PONTUAÇÃO
+# Tempo gasto em cada etapa e contadores de casos especiais, num registro
+# único por processo, exportável em texto no formato do Prometheus:
+#   parsing     leitura e validação das entradas (arquivo, JSON, Arrow)
+#   conversion  conversão de unidades (dias/horas -> minutos, λ)
+#   alpha       fator α e seus ramos
+#   exp_term    termo exponencial α·λ
+#   gamma_lnln  logaritmo duplo da função gama (e proteções de domínio)
+#   euler       termo de Euler tc·log1p(1/tc)
+#   synthesis   raiz de tcd, soma dos termos e exp(log R)
+#   phase       classificação nas fases
+#   rendering   serialização da saída (arquivo, JSON, Arrow)
+#
+# Desligada (o padrão; ENGINEREL_METRICS=1 liga na importação), a
+# instrumentação custa uma chamada e alguns testes de None por chamada de
+# kernel, não por linha. Ligada, os kernels marcam o relógio entre as
+# etapas (StageTimer.mark) e contam as máscaras que já calculam.
+#
+# Cobre os kernels vetorizados (compute_log_r, compute_r, classify_phase)
+# e as etapas de entrada e saída de quem os chama. log_r_scalar, um motor
+# por chamada no estado por eventos, fica de fora. O estado vale para o
+# processo inteiro: ligue-o na inicialização, não a cada requisição.
+# =====================================================================
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+STAGES = (
+    "parsing",
+    "conversion",
+    "alpha",
+    "exp_term",
+    "gamma_lnln",
+    "euler",
+    "synthesis",
+    "phase",
+    "rendering",
+)
+
+# Contadores: nome -> (métrica Prometheus, rótulo)
+COUNTERS = {
+    "rows": ("enginerel_rows_total", None),
+    "inner_log_floor": ("enginerel_clamped_total", 'case="inner_log_floor"'),
+    "tc_zero_lock": ("enginerel_clamped_total", 'case="tc_zero_lock"'),
+    "nan": ("enginerel_outcomes_total", 'outcome="nan"'),
+    "inf": ("enginerel_outcomes_total", 'outcome="inf"'),
+}
+
+HELP = {
+    "enginerel_stage_seconds_total": "Tempo acumulado em cada etapa da pontuação.",
+    "enginerel_stage_calls_total": "Execuções de cada etapa da pontuação.",
+    "enginerel_rows_total": "Linhas avaliadas pelos kernels.",
+    "enginerel_clamped_total": "Linhas em que uma proteção de domínio atuou.",
+    "enginerel_outcomes_total": "Valores de R não finitos produzidos.",
+}
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsRegistry:
+    """Acumuladores de tempo por etapa e contadores, seguros entre threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stage_ns = dict.fromkeys(STAGES, 0)
+            self.stage_calls = dict.fromkeys(STAGES, 0)
+            self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def observe(self, stage, ns):
+        with self.lock:
+            self.stage_ns[stage] += ns
+            self.stage_calls[stage] += 1
+
+    def increment(self, counts):
+        with self.lock:
+            for name, value in counts.items():
+                self.counters[name] += value
+
+    def snapshot(self):
+        """Cópia consistente: {'stages': {etapa: (chamadas, segundos)}, 'counters': {...}}."""
+        with self.lock:
+            return {
+                "stages": {
+                    stage: (self.stage_calls[stage], self.stage_ns[stage] / 1e9)
+                    for stage in STAGES
+                },
+                "counters": dict(self.counters),
+            }
+
+    def render_prometheus(self):
+        """Texto no formato de exposição do Prometheus (versão 0.0.4)."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def header(metric, kind):
+            lines.append(f"# HELP {metric} {HELP[metric]}")
+            lines.append(f"# TYPE {metric} {kind}")
+
+        header("enginerel_stage_seconds_total", "counter")
+        for stage, (_, seconds) in snapshot["stages"].items():
+            lines.append(f'enginerel_stage_seconds_total{{stage="{stage}"}} {seconds!r}')
+        header("enginerel_stage_calls_total", "counter")
+        for stage, (calls, _) in snapshot["stages"].items():
+            lines.append(f'enginerel_stage_calls_total{{stage="{stage}"}} {calls}')
+
+        declared = set()
+        for name, (metric, label) in COUNTERS.items():
+            if metric not in declared:
+                header(metric, "counter")
+                declared.add(metric)
+            labels = f"{{{label}}}" if label else ""
+            lines.append(f"{metric}{labels} {snapshot['counters'][name]}")
+
+        lines.append("# HELP enginerel_metrics_enabled 1 se a instrumentação está ligada.")
+        lines.append("# TYPE enginerel_metrics_enabled gauge")
+        lines.append(f"enginerel_metrics_enabled {int(_enabled)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+_enabled = os.environ.get("ENGINEREL_METRICS", "") == "1"
+
+
+def enable(flag=True):
+    global _enabled
+    _enabled = bool(flag)
+
+
+def disable():
+    enable(False)
+
+
+def is_enabled():
+    return _enabled
+
+
+class StageTimer:
+    """Relógio de uma chamada de kernel: mark(etapa) registra o tempo desde a marca anterior."""
+
+    __slots__ = ("last",)
+
+    def __init__(self):
+        self.last = time.perf_counter_ns()
+
+    def mark(self, stage):
+        now = time.perf_counter_ns()
+        REGISTRY.observe(stage, now - self.last)
+        self.last = now
+
+    def restart(self):
+        """Descarta o tempo desde a última marca (ex.: trecho medido por outro kernel)."""
+        self.last = time.perf_counter_ns()
+
+
+def stage_timer():
+    """Um StageTimer, ou None quando a instrumentação está desligada."""
+    return StageTimer() if _enabled else None
+
+
+class _Timed:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.observe(self.stage, time.perf_counter_ns() - self.start)
+
+
+_NULL = nullcontext()
+
+
+def timed(stage):
+    """Context manager que mede um bloco como a etapa dada (nulo se desligado)."""
+    return _Timed(stage) if _enabled else _NULL
+
+
+def timed_iter(iterable, stage):
+    """Mede o tempo de produção de cada item (ex.: blocos lidos de um arquivo)."""
+    if not _enabled:
+        yield from iterable
+        return
+    iterator = iter(iterable)
+    while True:
+        with _Timed(stage):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def count_kernel(r, inner_log_floor, tc_zero_lock):
+    """Contadores de uma chamada de kernel, a partir das máscaras já calculadas."""
+    REGISTRY.increment(
+        {
+            "rows": r.size,
+            "inner_log_floor": int(np.count_nonzero(inner_log_floor)),
+            "tc_zero_lock": int(np.count_nonzero(tc_zero_lock)),
+            "nan": int(np.count_nonzero(np.isnan(r))),
+            "inf": int(np.count_nonzero(np.isinf(r))),
+        }
+    )
+
+
+def render_prometheus():
+    return REGISTRY.render_prometheus()
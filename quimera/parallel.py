@@ -0,0 +1,149 @@
+# =====================================================================
+# PONTUAÇÃO MULTI-NÚCLEO COM MEMÓRIA COMPARTILHADA
+# As colunas failures / tc_days / u_hours e as saídas R / fase ficam em um
+# único bloco de multiprocessing.shared_memory. Cada processo do pool
+# recebe apenas (nome do bloco, n, início, fim) e escreve seu trecho de R
+# e de fase diretamente no bloco: nenhum array é serializado por pickle.
+# Com um ProfileSet, o bloco leva também o código de engineType de cada
+# linha e as tarefas pontuam com o perfil correspondente.
+# =====================================================================
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from quimera.fast import compute_log_r_fast
+from quimera.kernel import classify_phase, compute_log_r
+from quimera.profiles import UNKNOWN_ENGINE_TYPE
+
+# Linhas por tarefa: pequeno o bastante para balancear a carga entre os
+# núcleos, grande o bastante para diluir o custo de despacho
+TASK_ROWS = 1_000_000
+
+# Layout do bloco: 4 colunas float64 seguidas de 2 colunas int8
+FLOAT_COLUMNS = ("failures", "tc_days", "u_hours", "r")
+INT8_COLUMNS = ("phase", "codes")
+
+
+class SharedColumns:
+    """Colunas de entrada e saída da frota em um bloco de memória compartilhada.
+
+    Sem name, cria um bloco novo para n linhas; com name, anexa-se a um
+    bloco existente. Os atributos failures, tc_days, u_hours, r, phase e
+    codes (engineType) são views NumPy sobre o bloco.
+    """
+
+    def __init__(self, n, name=None):
+        size = max(n * (8 * len(FLOAT_COLUMNS) + len(INT8_COLUMNS)), 1)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.n = n
+        for position, column in enumerate(FLOAT_COLUMNS):
+            view = np.ndarray((n,), np.float64, self.shm.buf, offset=position * 8 * n)
+            setattr(self, column, view)
+        for position, column in enumerate(INT8_COLUMNS):
+            offset = len(FLOAT_COLUMNS) * 8 * n + position * n
+            setattr(self, column, np.ndarray((n,), np.int8, self.shm.buf, offset=offset))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        # As views precisam ser liberadas antes de fechar o buffer
+        for column in FLOAT_COLUMNS + INT8_COLUMNS:
+            setattr(self, column, None)
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        self.unlink()
+
+
+def _score_slice(name, n, start, stop, fast, profiles=None):
+    """Tarefa do pool: pontua as linhas [start, stop) direto no bloco."""
+    columns = SharedColumns(n, name)
+    try:
+        inputs = (
+            columns.failures[start:stop],
+            columns.tc_days[start:stop],
+            columns.u_hours[start:stop],
+        )
+        if profiles is None:
+            kernel = compute_log_r_fast if fast else compute_log_r
+            _, r = kernel(*inputs)
+            phase = classify_phase(r)
+        else:
+            codes = columns.codes[start:stop]
+            _, r = profiles.compute_log_r(*inputs, codes, fast)
+            phase = profiles.classify_phase(r, codes)
+        columns.r[start:stop] = r
+        columns.phase[start:stop] = phase
+    finally:
+        columns.close()
+    return stop - start
+
+
+def score_shared(columns, workers=None, fast=False, executor=None, profiles=None):
+    """Pontua, em paralelo e in-place, as colunas de um SharedColumns.
+
+    Reutilize um ProcessPoolExecutor via executor para evitar o custo de
+    criar processos a cada chamada. Com profiles (ProfileSet), cada linha
+    usa o perfil de columns.codes; o ProfileSet segue por pickle a cada
+    tarefa (algumas tabelas pequenas).
+    """
+    workers = workers or os.cpu_count() or 1
+    n = columns.n
+    task_rows = max(1, min(TASK_ROWS, -(-n // workers)))
+    bounds = [(start, min(start + task_rows, n)) for start in range(0, n, task_rows)]
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            executor.submit(_score_slice, columns.name, n, start, stop, fast, profiles)
+            for start, stop in bounds
+        ]
+        return sum(future.result() for future in futures)
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def score_parallel(
+    failures,
+    tc_days,
+    u_hours,
+    workers=None,
+    fast=False,
+    executor=None,
+    profiles=None,
+    codes=UNKNOWN_ENGINE_TYPE,
+):
+    """Atalho: copia as colunas para memória compartilhada e retorna (R, fase)."""
+    failures, tc_days, u_hours, codes = np.broadcast_arrays(
+        np.asarray(failures, dtype=np.float64),
+        np.asarray(tc_days, dtype=np.float64),
+        np.asarray(u_hours, dtype=np.float64),
+        np.asarray(codes, dtype=np.int8),
+    )
+    n = failures.size
+    with SharedColumns(n) as columns:
+        columns.failures[:] = failures.reshape(-1)
+        columns.tc_days[:] = tc_days.reshape(-1)
+        columns.u_hours[:] = u_hours.reshape(-1)
+        columns.codes[:] = codes.reshape(-1)
+        score_shared(columns, workers, fast, executor, profiles)
+        r = columns.r.reshape(failures.shape).copy()
+        phase = columns.phase.reshape(failures.shape).copy()
+    return r, phase
@@ -0,0 +1,150 @@
+# =====================================================================
+# PERFIS DE EQUIPAMENTO (engineType)
+# Cada valor do select 'engineType' tem seu conjunto de parâmetros,
+# lido de profiles.json:
+#   hours_per_day  horas de operação contadas por dia de tc (tc em minutos)
+#   window_days    janela da taxa de falhas (λ = falhas / window_days)
+#   risk_scale     coeficiente multiplicativo sobre R
+#   thresholds     limiares das fases SEGURO / ALERTA / FALHA IMINENTE
+# Campos omitidos herdam o bloco "default" (o modelo original). A frota é
+# agrupada pelos parâmetros do kernel (perfis iguais formam um só grupo) e
+# cada grupo passa por uma única chamada vetorizada; risk_scale e os
+# limiares são aplicados por tabelas indexadas pelo código do perfil.
+# =====================================================================
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from quimera import metrics
+from quimera.fast import compute_log_r_fast
+from quimera.kernel import HOURS_PER_DAY, PHASE_THRESHOLDS, WINDOW_DAYS, compute_log_r
+
+PROFILES_PATH = os.path.join(os.path.dirname(__file__), "profiles.json")
+
+# Valores do select 'engineType' do formulário, na ordem dos códigos
+ENGINE_TYPES = ("Combustão", "Aeroespacial", "Propulsor", "Gerador")
+UNKNOWN_ENGINE_TYPE = -1
+
+DEFAULT_PARAMETERS = {
+    "hours_per_day": HOURS_PER_DAY,
+    "window_days": WINDOW_DAYS,
+    "risk_scale": 1.0,
+    "thresholds": PHASE_THRESHOLDS.tolist(),
+}
+
+
+def encode_engine_types(values):
+    """Converte nomes de engineType em códigos int8 (-1 se desconhecido)."""
+    lookup = {name: code for code, name in enumerate(ENGINE_TYPES)}
+    return np.fromiter(
+        (lookup.get(value, UNKNOWN_ENGINE_TYPE) for value in values), np.int8, len(values)
+    )
+
+
+def _validate(name, parameters):
+    unknown = set(parameters) - set(DEFAULT_PARAMETERS)
+    if unknown:
+        raise ValueError(
+            f"Parâmetros desconhecidos no perfil {name}: {', '.join(sorted(unknown))}"
+        )
+    thresholds = parameters.get("thresholds")
+    if thresholds is not None and (
+        len(thresholds) != len(PHASE_THRESHOLDS) or np.any(np.diff(thresholds) <= 0)
+    ):
+        raise ValueError(f"Limiares do perfil {name} devem ser 3 valores crescentes")
+
+
+class ProfileSet:
+    """Parâmetros por perfil em tabelas indexadas pelo código de engineType.
+
+    A última linha de cada tabela guarda o perfil padrão, de modo que o
+    código -1 (engineType desconhecido) cai nela sem tratamento especial.
+    """
+
+    def __init__(self, config):
+        default = {**DEFAULT_PARAMETERS, **config.get("default", {})}
+        _validate("default", default)
+        profiles = config.get("profiles", {})
+        unknown = set(profiles) - set(ENGINE_TYPES)
+        if unknown:
+            raise ValueError(f"Perfis desconhecidos: {', '.join(sorted(unknown))}")
+
+        self.parameters = {}
+        for name in ENGINE_TYPES:
+            _validate(name, profiles.get(name, {}))
+            self.parameters[name] = {**default, **profiles.get(name, {})}
+        self.parameters[None] = default
+
+        rows = [self.parameters[name] for name in ENGINE_TYPES + (None,)]
+        self.hours_per_day = np.array([row["hours_per_day"] for row in rows], np.float64)
+        self.window_days = np.array([row["window_days"] for row in rows], np.float64)
+        self.risk_scale = np.array([row["risk_scale"] for row in rows], np.float64)
+        self.thresholds = np.array([row["thresholds"] for row in rows], np.float64)
+        self.shared_thresholds = bool(np.all(self.thresholds == self.thresholds[-1]))
+
+        # Grupos de kernel: perfis com as mesmas conversões compartilham a chamada
+        kernel_params = np.stack([self.hours_per_day, self.window_days], axis=1)
+        self.kernel_params, self.kernel_group = np.unique(
+            kernel_params, axis=0, return_inverse=True
+        )
+        self.kernel_group = self.kernel_group.reshape(-1).astype(np.int8)
+
+        canonical = json.dumps(self.as_dict(), sort_keys=True)
+        self.digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+    def as_dict(self):
+        """Parâmetros de cada perfil, mais "default", em formato JSON."""
+        return {name or "default": dict(params) for name, params in self.parameters.items()}
+
+    # -----------------------------------------------------------------
+    # PONTUAÇÃO AGRUPADA
+    # -----------------------------------------------------------------
+    def compute_log_r(self, failures, tc_days, u_hours, codes, fast=False):
+        """(log R, R) com os parâmetros do perfil de cada linha.
+
+        codes vem de encode_engine_types. Cada grupo de kernel presente
+        custa uma chamada vetorizada sobre as suas linhas; com um único
+        grupo (ex.: todos os perfis no padrão) não há seleção de linhas.
+        """
+        failures, tc_days, u_hours, codes = np.broadcast_arrays(
+            np.asarray(failures, dtype=np.float64),
+            np.asarray(tc_days, dtype=np.float64),
+            np.asarray(u_hours, dtype=np.float64),
+            np.asarray(codes, dtype=np.int8),
+        )
+        kernel = compute_log_r_fast if fast else compute_log_r
+        if len(self.kernel_params) == 1:
+            log_r, _ = kernel(failures, tc_days, u_hours, *self.kernel_params[0])
+        else:
+            groups = self.kernel_group[codes]
+            log_r = np.empty(failures.shape)
+            for group in np.unique(groups).tolist():
+                rows = groups == group
+                log_r[rows], _ = kernel(
+                    failures[rows], tc_days[rows], u_hours[rows], *self.kernel_params[group]
+                )
+        if np.any(self.risk_scale != 1.0):
+            log_r = log_r + np.log(self.risk_scale)[codes]
+        with np.errstate(over="ignore"):
+            r = np.exp(log_r)
+        return log_r, r
+
+    def classify_phase(self, r, codes):
+        """Códigos de fase 0..3 com os limiares do perfil de cada linha."""
+        with metrics.timed("phase"):
+            r = np.asarray(r, dtype=np.float64)
+            if self.shared_thresholds:
+                # Mesma escada para todos: busca binária, sem tabela por linha
+                codes = np.searchsorted(self.thresholds[-1], r, side="right")
+                return np.where(np.isnan(r), 0, codes).astype(np.int8)
+            thresholds = self.thresholds[np.asarray(codes, dtype=np.int8)]
+            codes = np.sum(r[..., np.newaxis] >= thresholds, axis=-1)
+            return codes.astype(np.int8)
+
+
+def load_profiles(path=PROFILES_PATH):
+    """Lê o arquivo de perfis (por padrão, o profiles.json do pacote)."""
+    with open(path, encoding="utf-8") as handle:
+        return ProfileSet(json.load(handle))
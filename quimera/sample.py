@@ -0,0 +1,17 @@
+# =====================================================================
+# FROTA SINTÉTICA
+# Entradas aleatórias na faixa do formulário, para benchmarks e para a
+# amostra do modo diagnóstico. Só depende do NumPy, de modo que o app
+# não precisa importar o benchmark (e o harness de paridade) para usá-la.
+# =====================================================================
+import numpy as np
+
+
+def synthetic_fleet(n, seed=0):
+    """Frota sintética (failures, tc_days, u_hours) na faixa do formulário."""
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(0, 21, n).astype(np.float64),
+        np.round(rng.uniform(0, 7000, n), 2),
+        np.round(rng.uniform(0.1, 24, n), 2),
+    )
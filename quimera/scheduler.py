@@ -0,0 +1,164 @@
+# =====================================================================
+# AGENDADOR DE MANUTENÇÃO (FILA DE PRIORIDADE COM ATUALIZAÇÃO PREGUIÇOSA)
+# Cada motor entra em FALHA IMINENTE no dia
+#
+#   due = dia do último reparo + span,   span = dias de tc = 0 até R >= 0.06
+#
+# (span vem de time_to_threshold partindo de tc = 0, com as falhas e o uso
+# atuais). Com capacidade diária fixa e reparos de um dia, atender sempre
+# o menor 'due' (EDD) minimiza a soma de motor-dias em FALHA IMINENTE.
+# Eventos (reparo, nova falha, novo uso) apenas empilham uma entrada nova
+# com versão incrementada; entradas obsoletas são descartadas ao sair do
+# heap. Assim, replanejar custa O(log n) por evento, sem reordenar a frota.
+# Com um ProfileSet, span usa o kernel e o limiar de FALHA IMINENTE do
+# perfil de engineType de cada motor.
+# =====================================================================
+import copy
+import heapq
+
+import numpy as np
+
+from quimera.forecast import DEFAULT_HORIZON_DAYS, time_to_threshold
+from quimera.kernel import PHASE_THRESHOLDS
+from quimera.profiles import UNKNOWN_ENGINE_TYPE
+
+FAILURE_THRESHOLD = PHASE_THRESHOLDS[-1]  # limiar de FALHA IMINENTE (0.06)
+DEFAULT_LOOKAHEAD_DAYS = 90.0
+
+
+def _repair_span(failures, u_hours, profiles=None, codes=UNKNOWN_ENGINE_TYPE):
+    """Dias de um reparo (tc = 0) até a entrada em FALHA IMINENTE."""
+    if profiles is None:
+        threshold = FAILURE_THRESHOLD
+    else:
+        threshold = profiles.thresholds[np.asarray(codes, dtype=np.int8), -1]
+    return time_to_threshold(
+        failures, 0.0, u_hours, threshold, DEFAULT_HORIZON_DAYS, profiles=profiles, codes=codes
+    )
+
+
+class MaintenanceScheduler:
+    """Fila de reparos da frota, priorizada pelo dia previsto de FALHA IMINENTE.
+
+    Dias são números (float) numa escala arbitrária, porém comum a todas as
+    chamadas (ex.: dias desde uma data de referência). Só são despachados
+    motores que entram em FALHA IMINENTE em até lookahead_days. profiles é
+    um ProfileSet opcional; sem ele vale o modelo padrão.
+    """
+
+    def __init__(
+        self, capacity_per_day, lookahead_days=DEFAULT_LOOKAHEAD_DAYS, profiles=None
+    ):
+        self.capacity_per_day = capacity_per_day
+        self.lookahead_days = lookahead_days
+        self.profiles = profiles
+        self.index = {}
+        self.engine_ids = []
+        self.codes = np.empty(0, np.int8)
+        self.failures = np.empty(0)
+        self.u_hours = np.empty(0)
+        self.last_repair = np.empty(0)
+        self.span = np.empty(0)
+        self.version = np.empty(0, np.int64)
+        self.heap = []
+
+    def due(self, row):
+        return self.last_repair[row] + self.span[row]
+
+    # -----------------------------------------------------------------
+    # CARGA E EVENTOS
+    # -----------------------------------------------------------------
+    def load(self, engine_ids, failures, tc_days, u_hours, day=0.0, codes=None):
+        """Carrega a frota (previsão vetorizada + heapify em O(n)).
+
+        codes são os códigos de engineType (encode_engine_types); ausentes,
+        todos os motores usam o perfil padrão.
+        """
+        engine_ids = list(engine_ids)
+        failures = np.asarray(failures, dtype=np.float64)
+        u_hours = np.asarray(u_hours, dtype=np.float64)
+        if codes is None:
+            codes = np.full(len(engine_ids), UNKNOWN_ENGINE_TYPE, np.int8)
+        self.index = {engine_id: row for row, engine_id in enumerate(engine_ids)}
+        self.engine_ids = engine_ids
+        self.codes = np.asarray(codes, dtype=np.int8).copy()
+        self.failures = failures.copy()
+        self.u_hours = u_hours.copy()
+        self.last_repair = day - np.asarray(tc_days, dtype=np.float64)
+        self.span = _repair_span(failures, u_hours, self.profiles, self.codes)
+        self.version = np.zeros(len(engine_ids), np.int64)
+
+        due = self.last_repair + self.span
+        self.heap = [
+            (float(due[row]), row, 0) for row in np.flatnonzero(np.isfinite(due)).tolist()
+        ]
+        heapq.heapify(self.heap)
+
+    def _push(self, row):
+        self.version[row] += 1
+        due = self.due(row)
+        if np.isfinite(due):
+            heapq.heappush(self.heap, (float(due), row, int(self.version[row])))
+
+    def update(self, engine_id, day, failures=None, u_hours=None, repaired=False):
+        """Registra um evento do motor e reagenda apenas ele (O(log n))."""
+        row = self.index[engine_id]
+        if repaired:
+            self.last_repair[row] = day
+        if failures is not None or u_hours is not None:
+            if failures is not None:
+                self.failures[row] = failures
+            if u_hours is not None:
+                self.u_hours[row] = u_hours
+            self.span[row] = _repair_span(
+                self.failures[row], self.u_hours[row], self.profiles, self.codes[row]
+            )
+        self._push(row)
+
+    # -----------------------------------------------------------------
+    # DESPACHO E PLANEJAMENTO
+    # -----------------------------------------------------------------
+    def dispatch(self, day):
+        """Retira da fila os reparos do dia e os efetiva.
+
+        Atende, em ordem de 'due', até capacity_per_day motores que entram
+        em FALHA IMINENTE em até lookahead_days. Retorna [(engine_id, due)].
+        """
+        repairs = []
+        repaired = []
+        limit = day + self.lookahead_days
+        while self.heap and len(repairs) < self.capacity_per_day:
+            due, row, version = self.heap[0]
+            if version != self.version[row]:
+                heapq.heappop(self.heap)  # entrada obsoleta
+                continue
+            if due > limit:
+                break
+            heapq.heappop(self.heap)
+            repairs.append((self.engine_ids[row], due))
+            repaired.append(row)
+        # Reagenda só depois do laço: um motor não é reparado duas vezes no dia
+        for row in repaired:
+            self.last_repair[row] = day
+            self._push(row)
+        return repairs
+
+    def plan(self, start_day, days):
+        """Simula o despacho de days dias sem alterar o agendador.
+
+        Retorna (agenda, custo): agenda é [(dia, [(engine_id, due), ...])] e
+        custo é o total de motor-dias em FALHA IMINENTE até o fim da janela.
+        """
+        simulation = copy.deepcopy(self)
+        end = start_day + days
+        schedule = []
+        cost = 0.0
+        for day in range(int(start_day), int(end)):
+            repairs = simulation.dispatch(float(day))
+            cost += sum(max(0.0, day - due) for _, due in repairs)
+            schedule.append((day, repairs))
+
+        # Motores ainda em FALHA IMINENTE ao fim da janela
+        due = simulation.last_repair + simulation.span
+        cost += float(np.sum(np.clip(end - due[np.isfinite(due)], 0.0, None)))
+        return schedule, cost
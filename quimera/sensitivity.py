@@ -0,0 +1,103 @@
+# =====================================================================
+# SENSIBILIDADES ANALÍTICAS DE R
+# Derivadas parciais fechadas de R em relação a failures, tc_days e
+# u_hours, via log R (∂R/∂x = R · ∂log R/∂x):
+#
+#   ∂log R/∂α   = λ + ψ(α + 2) / (ln Γ(α + 2) · ln ln Γ(α + 2))
+#   ∂log R/∂f   = ∂log R/∂α · 0 + α / janela          (λ = f / janela)
+#   ∂log R/∂tcd = (∂log R/∂α · ∂α/∂tc + log1p(1/tc) - 1/(tc + 1)) · dtc/dtcd
+#                 + 1 / (2 · tcd)
+#   ∂log R/∂uh  = ∂log R/∂α · ∂α/∂u · 60 - 1 / uh
+#
+# ψ é a digama (derivada de ln Γ). Onde a proteção de domínio trava
+# ln Γ(α + 2) em INNER_LOG_FLOOR, o termo de ψ some. O custo é uma
+# avaliação extra dos termos, contra seis para diferenças finitas centrais.
+# Com um ProfileSet, as conversões são as do perfil de cada linha e o
+# risk_scale, constante em log R, só entra pelo fator R.
+# =====================================================================
+import numpy as np
+from scipy.special import gammaln, psi
+
+from quimera.kernel import (
+    HOURS_PER_DAY,
+    INNER_LOG_FLOOR,
+    WINDOW_DAYS,
+    _alpha,
+    compute_log_r,
+)
+from quimera.profiles import UNKNOWN_ENGINE_TYPE
+
+
+def _alpha_partials(tc, u):
+    """(∂α/∂tc, ∂α/∂u) nos três ramos de α (tc em minutos, u em minutos)."""
+    scale = tc + 1
+    sign = np.sign(tc - u)
+    general_tc = (sign * scale - np.abs(tc - u)) / scale**2
+    general_u = -sign / scale
+    d_tc = np.where(tc == u, -1 / scale**2, general_tc)
+    d_u = np.where(tc == u, 0.0, general_u)
+    # tc === 0: α = ln|u| (o ramo só existe no ponto; ∂α/∂tc segue o ramo geral)
+    d_u = np.where(tc == 0, 1 / u, d_u)
+    return d_tc, d_u
+
+
+def compute_sensitivities(
+    failures,
+    tc_days,
+    u_hours,
+    hours_per_day=HOURS_PER_DAY,
+    window_days=WINDOW_DAYS,
+    profiles=None,
+    codes=UNKNOWN_ENGINE_TYPE,
+):
+    """Calcula (log R, R, derivadas) numa única passada vetorizada.
+
+    derivadas é um dict com ∂R/∂failures, ∂R/∂tc_days (por dia) e
+    ∂R/∂u_hours (por hora), nas chaves 'failures', 'tc_days' e 'u_hours'.
+    Onde R = 0 (tcd = 0, u <= 0 ou trava no ponto zero) as derivadas são 0.
+    Com profiles (ProfileSet), R e as derivadas usam o perfil de cada
+    código, como em ProfileSet.compute_log_r; hours_per_day e window_days
+    são ignorados.
+    """
+    failures, tc_days, u_hours, codes = np.broadcast_arrays(
+        np.asarray(failures, dtype=np.float64),
+        np.asarray(tc_days, dtype=np.float64),
+        np.asarray(u_hours, dtype=np.float64),
+        np.asarray(codes, dtype=np.int8),
+    )
+    if profiles is None:
+        log_r, r = compute_log_r(failures, tc_days, u_hours, hours_per_day, window_days)
+    else:
+        log_r, r = profiles.compute_log_r(failures, tc_days, u_hours, codes)
+        hours_per_day = profiles.hours_per_day[codes]
+        window_days = profiles.window_days[codes]
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        minutes_per_day = hours_per_day * 60
+        tc = tc_days * minutes_per_day
+        u = u_hours * 60
+        lam = failures / window_days
+        alpha = _alpha(tc, u)
+
+        # Derivada do logaritmo duplo: zero onde o piso de domínio atua
+        z = alpha + 2
+        inner_log = gammaln(z)
+        clamped = inner_log <= 0
+        inner_log = np.where(clamped, INNER_LOG_FLOOR, inner_log)
+        d_lnln = np.where(clamped, 0.0, psi(z) / (inner_log * np.log(inner_log)))
+        d_alpha = lam + d_lnln
+
+        d_alpha_tc, d_alpha_u = _alpha_partials(tc, u)
+        d_euler = np.where(tc > 0, np.log1p(1 / tc) - 1 / (tc + 1), 0.0)
+
+        d_log_r = {
+            "failures": alpha / window_days,
+            "tc_days": (d_alpha * d_alpha_tc + d_euler) * minutes_per_day + 0.5 / tc_days,
+            "u_hours": d_alpha * d_alpha_u * 60 - 1 / u_hours,
+        }
+        zero = r == 0
+        derivatives = {
+            name: np.where(zero, 0.0, r * partial) for name, partial in d_log_r.items()
+        }
+
+    return log_r, r, derivatives
@@ -0,0 +1,280 @@
+# =====================================================================
+# ESTADO INCREMENTAL POR MOTOR (λ EM JANELA MÓVEL DE 365 DIAS)
+# Em vez de exigir que o operador conte as falhas do último ano, o estado
+# ingere eventos individuais (falha, reparo, amostra de uso) e mantém:
+#   - a contagem de falhas na janela de 365 dias (fila de timestamps; com
+#     perfis, na window_days do perfil do motor);
+#   - tc, zerado a cada reparo;
+#   - o R corrente de cada motor.
+# Cada evento custa O(1) amortizado: a fila só é podada pela esquerda e o
+# R é recalculado em Python puro (log_r_scalar), sem varrer o histórico.
+# Eventos fora de ordem são aceitos: a falha atrasada entra na posição
+# ordenada da fila (bisect.insort), o reparo só avança tc se for mais
+# recente e o motor nunca é reavaliado num instante anterior ao último.
+# Em lotes (apply_events), cada motor afetado é reavaliado uma só vez,
+# numa chamada vetorizada sobre as linhas tocadas.
+# As colunas numéricas vivem em arrays NumPy contíguos, que crescem por
+# duplicação, de modo que a frota inteira pode ser reavaliada vetorizada.
+# Com um ProfileSet, cada motor guarda o código do seu engineType e é
+# avaliado com as conversões, a janela de falhas e o risk_scale desse
+# perfil.
+# =====================================================================
+import bisect
+import math
+from collections import deque
+
+import numpy as np
+
+from quimera.kernel import WINDOW_DAYS, compute_log_r, log_r_scalar
+from quimera.profiles import UNKNOWN_ENGINE_TYPE
+
+SECONDS_PER_DAY = 86_400.0
+WINDOW_SECONDS = WINDOW_DAYS * SECONDS_PER_DAY
+
+INITIAL_CAPACITY = 1024
+
+EVENT_KINDS = ("failure", "repair", "usage")
+
+# Colunas do estado: nome -> dtype
+COLUMNS = {
+    "failures": np.int32,       # falhas na janela (365 dias no padrão)
+    "last_repair": np.float64,  # timestamp (s) do último reparo (início de tc)
+    "u_hours": np.float64,      # uso diário médio mais recente
+    "updated": np.float64,      # timestamp (s) da última avaliação
+    "r": np.float64,            # R na última avaliação
+    "code": np.int8,            # código de engineType (-1: perfil padrão)
+}
+
+
+def check_event(kind, ts, u_hours=math.nan):
+    """Levanta ValueError se o evento não puder ser aplicado ao estado."""
+    if kind not in EVENT_KINDS:
+        raise ValueError(f"Evento desconhecido: {kind}")
+    if not math.isfinite(ts):
+        raise ValueError(f"Timestamp inválido: {ts}")
+    if kind == "usage" and not math.isfinite(u_hours):
+        raise ValueError(f"Uso diário inválido: {u_hours}")
+
+
+class FleetState:
+    """Estado compacto de uma frota, alimentado por eventos.
+
+    Timestamps são segundos Unix. Os métodos on_* retornam o R corrente
+    do motor após o evento. profiles é um ProfileSet opcional; sem ele
+    vale o modelo padrão para todos os motores.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY, profiles=None):
+        self.index = {}      # engine_id -> linha
+        self.engine_ids = []
+        self.windows = []    # por linha: deque de timestamps de falha
+        self.size = 0
+        self.columns = {name: np.zeros(capacity, dtype) for name, dtype in COLUMNS.items()}
+        self.profiles = profiles
+        if profiles is not None:
+            # Parâmetros por código para o caminho escalar; o código -1 cai
+            # na última linha (perfil padrão), como nas tabelas do ProfileSet
+            self.profile_params = list(
+                zip(
+                    profiles.hours_per_day.tolist(),
+                    profiles.window_days.tolist(),
+                    np.log(profiles.risk_scale).tolist(),
+                )
+            )
+            # A janela de falhas segue a window_days de λ no mesmo perfil
+            self.window_seconds = (profiles.window_days * SECONDS_PER_DAY).tolist()
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        for name, column in self.columns.items():
+            grown = np.zeros(2 * len(column), column.dtype)
+            grown[: self.size] = column[: self.size]
+            self.columns[name] = grown
+
+    def register(self, engine_id, ts, u_hours, tc_days=0.0, code=UNKNOWN_ENGINE_TYPE):
+        """Cadastra um motor (ou retorna a linha existente).
+
+        code é o código de engineType (encode_engine_types).
+        """
+        row = self.index.get(engine_id)
+        if row is not None:
+            return row
+        row = self._add(engine_id, ts, u_hours, tc_days, code)
+        self._rescore(row, ts)
+        return row
+
+    def _add(self, engine_id, ts, u_hours, tc_days=0.0, code=UNKNOWN_ENGINE_TYPE):
+        """Acrescenta a linha de um motor novo, sem avaliá-lo."""
+        if self.size == len(self.columns["r"]):
+            self._grow()
+
+        row = self.size
+        self.size += 1
+        self.index[engine_id] = row
+        self.engine_ids.append(engine_id)
+        self.windows.append(deque())
+        self.columns["failures"][row] = 0
+        self.columns["last_repair"][row] = ts - tc_days * SECONDS_PER_DAY
+        self.columns["u_hours"][row] = u_hours
+        self.columns["updated"][row] = -math.inf
+        self.columns["code"][row] = code
+        return row
+
+    def _add_failure(self, row, ts):
+        """Insere a falha na fila mantendo a ordem dos timestamps."""
+        window = self.windows[row]
+        if not window or ts >= window[-1]:
+            window.append(ts)
+        else:
+            bisect.insort(window, ts)
+        self.columns["failures"][row] += 1
+
+    def _set_repair(self, row, ts):
+        """Reinicia tc em ts, exceto se já houver um reparo mais recente."""
+        if ts > self.columns["last_repair"][row]:
+            self.columns["last_repair"][row] = ts
+
+    # -----------------------------------------------------------------
+    # EVENTOS
+    # -----------------------------------------------------------------
+    def on_failure(self, engine_id, ts):
+        check_event("failure", ts)
+        row = self.index[engine_id]
+        self._add_failure(row, ts)
+        return self._rescore(row, ts)
+
+    def on_repair(self, engine_id, ts):
+        check_event("repair", ts)
+        row = self.index[engine_id]
+        self._set_repair(row, ts)
+        return self._rescore(row, ts)
+
+    def on_usage(self, engine_id, ts, u_hours):
+        check_event("usage", ts, u_hours)
+        row = self.index[engine_id]
+        self.columns["u_hours"][row] = u_hours
+        return self._rescore(row, ts)
+
+    def apply_events(self, events):
+        """Aplica um lote de eventos e reavalia cada motor afetado uma vez.
+
+        events é uma sequência de (kind, engine_id, ts, u_hours), com kind
+        em EVENT_KINDS; u_hours só é lido em 'usage'. Motores desconhecidos
+        são cadastrados com u_hours NaN (R = 0, como u <= 0, até a primeira
+        amostra de uso). Cada motor é avaliado no maior ts do lote (ou da
+        sua última avaliação, se posterior), numa única chamada
+        vetorizada. Retorna as linhas reavaliadas.
+
+        O lote inteiro é validado (check_event) antes de qualquer mudança:
+        um evento inválido levanta ValueError e deixa o estado intacto.
+        """
+        for kind, _, ts, u_hours in events:
+            check_event(kind, ts, u_hours)
+
+        columns = self.columns
+        touched = {}
+        for kind, engine_id, ts, u_hours in events:
+            row = self.index.get(engine_id)
+            if row is None:
+                row = self._add(engine_id, ts, math.nan)
+                columns = self.columns
+            if kind == "failure":
+                self._add_failure(row, ts)
+            elif kind == "repair":
+                self._set_repair(row, ts)
+            else:
+                columns["u_hours"][row] = u_hours
+            if ts > touched.get(row, -math.inf):
+                touched[row] = ts
+
+        rows = np.fromiter(touched, np.int64, len(touched))
+        ts = np.fromiter(touched.values(), np.float64, len(touched))
+        ts = np.maximum(ts, columns["updated"][rows])
+        self._rescore_rows(rows, ts)
+        return rows
+
+    # -----------------------------------------------------------------
+    # AVALIAÇÃO
+    # -----------------------------------------------------------------
+    def _expire(self, row, ts):
+        """Remove da janela as falhas mais antigas que a window_days do motor."""
+        window = self.windows[row]
+        if self.profiles is None:
+            cutoff = ts - WINDOW_SECONDS
+        else:
+            cutoff = ts - self.window_seconds[int(self.columns["code"][row])]
+        expired = 0
+        while window and window[0] <= cutoff:
+            window.popleft()
+            expired += 1
+        if expired:
+            self.columns["failures"][row] -= expired
+
+    def _rescore(self, row, ts):
+        columns = self.columns
+        # Evento atrasado: avalia no instante mais recente já visto
+        ts = max(ts, columns["updated"][row])
+        self._expire(row, ts)
+        tc_days = max(ts - columns["last_repair"][row], 0.0) / SECONDS_PER_DAY
+        failures = float(columns["failures"][row])
+        u_hours = float(columns["u_hours"][row])
+        if self.profiles is None:
+            log_r = log_r_scalar(failures, tc_days, u_hours)
+        else:
+            hours_per_day, window_days, log_scale = self.profile_params[int(columns["code"][row])]
+            log_r = log_r_scalar(failures, tc_days, u_hours, hours_per_day, window_days)
+            log_r += log_scale
+        # NaN (tcd negativo, Γ negativa) passa adiante em vez de virar inf
+        try:
+            r = math.exp(log_r)
+        except OverflowError:
+            r = math.inf
+        columns["updated"][row] = ts
+        columns["r"][row] = r
+        return r
+
+    def _rescore_rows(self, rows, ts):
+        """Reavalia as linhas dadas, cada uma no seu ts, vetorizado."""
+        for row, row_ts in zip(rows.tolist(), ts.tolist()):
+            self._expire(row, row_ts)
+        columns = self.columns
+        tc_days = np.maximum(ts - columns["last_repair"][rows], 0.0) / SECONDS_PER_DAY
+        _, r = self._compute_log_r(
+            columns["failures"][rows].astype(np.float64),
+            tc_days,
+            columns["u_hours"][rows],
+            columns["code"][rows],
+        )
+        columns["r"][rows] = r
+        columns["updated"][rows] = ts
+        return r
+
+    def _compute_log_r(self, failures, tc_days, u_hours, codes):
+        if self.profiles is None:
+            return compute_log_r(failures, tc_days, u_hours)
+        return self.profiles.compute_log_r(failures, tc_days, u_hours, codes)
+
+    def r(self, engine_id):
+        """R da última avaliação do motor."""
+        return float(self.columns["r"][self.index[engine_id]])
+
+    def inputs(self, ts):
+        """Arrays (failures, tc_days, u_hours) de toda a frota no instante ts."""
+        for row in range(self.size):
+            self._expire(row, ts)
+        n = self.size
+        tc_days = np.maximum(ts - self.columns["last_repair"][:n], 0.0) / SECONDS_PER_DAY
+        return (
+            self.columns["failures"][:n].astype(np.float64),
+            tc_days,
+            self.columns["u_hours"][:n].copy(),
+        )
+
+    def rescore_all(self, ts):
+        """Reavalia a frota inteira em ts numa única chamada vetorizada."""
+        _, r = self._compute_log_r(*self.inputs(ts), self.columns["code"][: self.size])
+        self.columns["r"][: self.size] = r
+        self.columns["updated"][: self.size] = ts
+        return r
@@ -0,0 +1,220 @@
+# =====================================================================
+# ARMAZÉM COLUNAR DA FROTA EM DISCO (MEMORY-MAP)
+# Um diretório com um arquivo .npy de largura fixa por coluna, aberto via
+# memory-map: o dashboard e os jobs em lote compartilham o mesmo armazém
+# sem carregá-lo na RAM. Operações de envelhecimento ("avançar N dias")
+# e de atualização alteram as colunas in-place e repontuam apenas as
+# linhas tocadas, bloco a bloco. R e fase usam os parâmetros do perfil
+# (engine_type) de cada motor.
+# =====================================================================
+import json
+import os
+
+import numpy as np
+
+from quimera.kernel import MODEL_VERSION
+from quimera.profiles import (
+    ENGINE_TYPES,
+    UNKNOWN_ENGINE_TYPE,
+    encode_engine_types,
+    load_profiles,
+)
+from quimera.stream import DEFAULT_CHUNK_ROWS, iter_fleet_chunks
+
+# Identificadores com até 32 bytes em UTF-8; ids maiores são rejeitados
+# (o dtype fixo os truncaria em silêncio)
+ENGINE_ID_DTYPE = "S32"
+ENGINE_ID_BYTES = np.dtype(ENGINE_ID_DTYPE).itemsize
+
+COLUMNS = {
+    "engine_id": ENGINE_ID_DTYPE,
+    "engine_type": np.int8,
+    "failures": np.float64,
+    "tc_days": np.float64,
+    "u_hours": np.float64,
+    "last_r": np.float64,
+    "last_phase": np.int8,
+}
+
+META_FILE = "meta.json"
+
+
+def encode_engine_ids(engine_ids):
+    """Codifica uma Series de ids em UTF-8, recusando ids longos demais."""
+    encoded = engine_ids.astype(str).str.encode("utf-8")
+    too_long = encoded.str.len() > ENGINE_ID_BYTES
+    if too_long.any():
+        engine_id = engine_ids[too_long].iloc[0]
+        raise ValueError(
+            f"engine_id com mais de {ENGINE_ID_BYTES} bytes em UTF-8: {engine_id!r}"
+        )
+    return encoded
+
+
+class FleetStore:
+    """Armazém colunar memory-mapped; use FleetStore.create / FleetStore.open.
+
+    profiles é um ProfileSet (padrão: o profiles.json do pacote).
+    """
+
+    def __init__(self, path, columns, meta, profiles=None):
+        self.path = path
+        self.columns = columns
+        self.meta = meta
+        self.profiles = profiles or load_profiles()
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def __getattr__(self, name):
+        # Acesso direto às colunas: store.tc_days, store.last_r, ...
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    # -----------------------------------------------------------------
+    # CRIAÇÃO E ABERTURA
+    # -----------------------------------------------------------------
+    def _write_meta(self):
+        with open(os.path.join(self.path, META_FILE), "w") as handle:
+            json.dump(self.meta, handle, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def create(cls, path, rows, profiles=None):
+        """Cria um armazém vazio (zerado) com espaço para rows motores."""
+        os.makedirs(path, exist_ok=True)
+        columns = {
+            name: np.lib.format.open_memmap(
+                os.path.join(path, name + ".npy"), mode="w+", dtype=dtype, shape=(rows,)
+            )
+            for name, dtype in COLUMNS.items()
+        }
+        store = cls(path, columns, {"rows": rows}, profiles)
+        store.meta.update(
+            model_version=MODEL_VERSION,
+            profiles_digest=store.profiles.digest,
+            engine_types=ENGINE_TYPES,
+        )
+        store._write_meta()
+        return store
+
+    @classmethod
+    def open(cls, path, mode="r+", profiles=None):
+        """Abre um armazém existente ('r' para somente leitura)."""
+        with open(os.path.join(path, META_FILE)) as handle:
+            meta = json.load(handle)
+        columns = {
+            name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mode)
+            for name in COLUMNS
+        }
+        store = cls(path, columns, meta, profiles)
+        stale = (
+            meta.get("model_version") != MODEL_VERSION
+            or meta.get("profiles_digest") != store.profiles.digest
+        )
+        if stale and mode != "r":
+            # R gravado por outra versão do modelo ou dos perfis deixa de valer
+            store.rescore()
+            store.meta["model_version"] = MODEL_VERSION
+            store.meta["profiles_digest"] = store.profiles.digest
+            store._write_meta()
+        return store
+
+    @classmethod
+    def import_fleet(
+        cls, path, source, fmt="csv", chunk_rows=DEFAULT_CHUNK_ROWS, profiles=None
+    ):
+        """Cria o armazém a partir de um arquivo de frota, em duas passadas.
+
+        A primeira passada conta as linhas e valida os engine_id, de modo
+        que um id longo demais gera ValueError antes de qualquer arquivo ser
+        criado; a segunda preenche as colunas bloco a bloco. source deve
+        ser um caminho (é lido duas vezes).
+        """
+        rows = 0
+        for chunk, _ in iter_fleet_chunks(source, fmt, chunk_rows):
+            if "engine_id" in chunk:
+                encode_engine_ids(chunk["engine_id"])
+            rows += len(chunk)
+        store = cls.create(path, rows, profiles)
+        start = 0
+        for chunk, _ in iter_fleet_chunks(source, fmt, chunk_rows):
+            stop = start + len(chunk)
+            if "engine_id" in chunk:
+                store.engine_id[start:stop] = encode_engine_ids(chunk["engine_id"])
+            if "engineType" in chunk:
+                store.engine_type[start:stop] = encode_engine_types(chunk["engineType"].tolist())
+            else:
+                store.engine_type[start:stop] = UNKNOWN_ENGINE_TYPE
+            store.failures[start:stop] = chunk["failures"].to_numpy(np.float64)
+            store.tc_days[start:stop] = chunk["tc_days"].to_numpy(np.float64)
+            store.u_hours[start:stop] = chunk["u_hours"].to_numpy(np.float64)
+            store._score(slice(start, stop))
+            start = stop
+        store.flush()
+        return store
+
+    def flush(self):
+        for column in self.columns.values():
+            if isinstance(column, np.memmap):
+                column.flush()
+
+    # -----------------------------------------------------------------
+    # PONTUAÇÃO IN-PLACE
+    # -----------------------------------------------------------------
+    def _score(self, rows):
+        """Repontua as linhas indicadas (slice ou array de índices)."""
+        codes = self.engine_type[rows]
+        _, r = self.profiles.compute_log_r(
+            self.failures[rows], self.tc_days[rows], self.u_hours[rows], codes
+        )
+        self.last_r[rows] = r
+        self.last_phase[rows] = self.profiles.classify_phase(r, codes)
+
+    def _chunks(self, rows, chunk_rows):
+        """Divide a seleção de linhas em blocos para limitar a memória."""
+        if rows is None:
+            for start in range(0, len(self), chunk_rows):
+                yield slice(start, min(start + chunk_rows, len(self)))
+            return
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        for start in range(0, len(rows), chunk_rows):
+            yield rows[start : start + chunk_rows]
+
+    def rescore(self, rows=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Repontua as linhas indicadas (todas, se rows=None)."""
+        for block in self._chunks(rows, chunk_rows):
+            self._score(block)
+        self.flush()
+
+    def advance_days(self, days, rows=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Envelhece in-place: soma days a tc_days e repontua só essas linhas.
+
+        rows aceita índices, máscara booleana ou None (frota inteira).
+        """
+        for block in self._chunks(rows, chunk_rows):
+            self.tc_days[block] += days
+            self._score(block)
+        self.flush()
+
+    def update(self, rows, failures=None, u_hours=None, repaired=False):
+        """Atualiza entradas de algumas linhas e repontua apenas elas.
+
+        repaired=True zera tc_days (reparo reinicia o ciclo).
+        """
+        rows = np.asarray(rows)
+        if failures is not None:
+            self.failures[rows] = failures
+        if u_hours is not None:
+            self.u_hours[rows] = u_hours
+        if repaired:
+            self.tc_days[rows] = 0.0
+        self._score(rows)
+        self.flush()
+
+    def phase_counts(self):
+        """Quantidade de motores em cada uma das 4 fases."""
+        return np.bincount(self.last_phase, minlength=4)
@@ -0,0 +1,188 @@
+# =====================================================================
+# PONTUAÇÃO DE FROTA EM FLUXO (CSV / PARQUET)
+# Pipeline de geradores que lê o arquivo da frota em blocos de tamanho
+# fixo, calcula R e a fase de cada bloco e grava o resultado de forma
+# incremental. Nenhuma etapa materializa o arquivo inteiro em memória.
+# =====================================================================
+import os
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from quimera import metrics
+from quimera.fast import compute_log_r_fast
+from quimera.kernel import PHASE_LABELS, classify_phase, compute_log_r
+from quimera.profiles import encode_engine_types
+
+# Colunas obrigatórias para o cálculo (mesmos nomes do engineForm)
+REQUIRED_COLUMNS = ("failures", "tc_days", "u_hours")
+
+# Tipos de leitura do CSV: as colunas do cálculo como float64 e todas as
+# demais (engine_id, engineType, colunas extras) como texto, repassadas
+# sem alteração. Sem isso o pandas deduz o tipo bloco a bloco: IDs como
+# 007 perdem o zero à esquerda e um bloco só com IDs numéricos seguido de
+# outro com E-101 muda o esquema no meio do arquivo.
+CSV_DTYPES = defaultdict(lambda: str, {column: np.float64 for column in REQUIRED_COLUMNS})
+
+# Tamanho padrão do bloco: ~100k linhas mantêm a memória em poucos MB
+DEFAULT_CHUNK_ROWS = 100_000
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+def detect_format(name):
+    """Deduz o formato ('csv' ou 'parquet') pela extensão do arquivo."""
+    return "parquet" if str(name).lower().endswith(PARQUET_SUFFIXES) else "csv"
+
+
+def _source_size(source):
+    """Tamanho total da fonte em bytes, ou None se não for possível medir."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    try:
+        position = source.tell()
+        size = source.seek(0, os.SEEK_END)
+        source.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+
+def iter_fleet_chunks(source, fmt="csv", chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Gera tuplas (DataFrame, progresso) com até chunk_rows linhas cada.
+
+    O progresso é uma fração em [0, 1]: para Parquet usa o total de linhas
+    dos metadados; para CSV usa a posição de leitura sobre o tamanho do
+    arquivo (ou None quando a fonte não permite medição). Colunas de CSV
+    fora de REQUIRED_COLUMNS são lidas como texto (CSV_DTYPES).
+    """
+    if fmt == "parquet":
+        parquet = pq.ParquetFile(source)
+        total = parquet.metadata.num_rows or 1
+        done = 0
+        batches = parquet.iter_batches(batch_size=chunk_rows)
+        for batch in metrics.timed_iter(batches, "parsing"):
+            done += batch.num_rows
+            yield batch.to_pandas(), done / total
+        return
+
+    size = _source_size(source)
+    handle = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    try:
+        reader = pd.read_csv(handle, chunksize=chunk_rows, dtype=CSV_DTYPES)
+        for chunk in metrics.timed_iter(reader, "parsing"):
+            progress = min(handle.tell() / size, 1.0) if size else None
+            yield chunk, progress
+    finally:
+        if handle is not source:
+            handle.close()
+
+
+def score_chunk(chunk, fast=False, profiles=None):
+    """Acrescenta as colunas R, log_R, phase (código 0..3) e status a um bloco.
+
+    Usa a avaliação em espaço logarítmico: log_R permanece finito mesmo
+    quando R excede o float64 (R = inf), sem tratamento por linha. Com
+    fast=True usa o kernel aproximado de quimera.fast. Com um ProfileSet
+    em profiles e a coluna engineType presente, cada linha é pontuada e
+    classificada com os parâmetros do seu perfil.
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise ValueError(
+            "Colunas obrigatórias ausentes no arquivo da frota: " + ", ".join(missing)
+        )
+
+    by_profile = profiles is not None and "engineType" in chunk.columns
+    with metrics.timed("parsing"):
+        inputs = (
+            chunk["failures"].to_numpy(np.float64),
+            chunk["tc_days"].to_numpy(np.float64),
+            chunk["u_hours"].to_numpy(np.float64),
+        )
+        codes = encode_engine_types(chunk["engineType"].tolist()) if by_profile else None
+    if by_profile:
+        log_r, r = profiles.compute_log_r(*inputs, codes, fast=fast)
+        phase = profiles.classify_phase(r, codes)
+    else:
+        kernel = compute_log_r_fast if fast else compute_log_r
+        log_r, r = kernel(*inputs)
+        phase = classify_phase(r)
+    with metrics.timed("rendering"):
+        chunk = chunk.assign(R=r, log_R=log_r, phase=phase)
+        chunk["status"] = np.asarray(PHASE_LABELS, dtype=object)[phase]
+    return chunk
+
+
+def score_chunks(chunks, fast=False, profiles=None):
+    """Aplica score_chunk sobre um gerador de (bloco, progresso)."""
+    for chunk, progress in chunks:
+        yield score_chunk(chunk, fast, profiles), progress
+
+
+def write_scored(scored, sink, fmt="csv"):
+    """Grava os blocos pontuados em sink (caminho ou arquivo aberto).
+
+    É também um gerador: devolve (linhas gravadas, progresso) após cada
+    bloco, para que a interface atualize a barra de progresso. Em Parquet o
+    esquema é o do primeiro bloco; os seguintes são convertidos para ele.
+    """
+    rows = 0
+    if fmt == "parquet":
+        writer = None
+        try:
+            for chunk, progress in scored:
+                with metrics.timed("rendering"):
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(sink, table.schema)
+                    else:
+                        table = table.cast(writer.schema)
+                    writer.write_table(table)
+                rows += len(chunk)
+                yield rows, progress
+        finally:
+            if writer is not None:
+                writer.close()
+        return
+
+    handle = open(sink, "w", newline="") if isinstance(sink, (str, os.PathLike)) else sink
+    try:
+        header = True
+        for chunk, progress in scored:
+            with metrics.timed("rendering"):
+                chunk.to_csv(handle, header=header, index=False)
+            header = False
+            rows += len(chunk)
+            yield rows, progress
+    finally:
+        if handle is not sink:
+            handle.close()
+
+
+def stream_score(
+    source,
+    sink,
+    fmt_in="csv",
+    fmt_out="csv",
+    chunk_rows=DEFAULT_CHUNK_ROWS,
+    fast=False,
+    profiles=None,
+    history=None,
+):
+    """Pipeline completo: leitura em blocos -> cálculo de R -> gravação.
+
+    Com um ScoreHistory em history, cada bloco pontuado também é gravado
+    no histórico, por engine_id e com o instante de início do
+    processamento (ids repetidos ficam com a última linha; sem a coluna
+    engine_id nada é gravado).
+    """
+    chunks = iter_fleet_chunks(source, fmt_in, chunk_rows)
+    scored = score_chunks(chunks, fast, profiles)
+    if history is not None:
+        scored = history.record_chunks(scored, time.time())
+    return write_scored(scored, sink, fmt_out)
@@ -0,0 +1,52 @@
+# =====================================================================
+# VARREDURA DE PARÂMETROS (MAPA DE SENSIBILIDADE)
+# Avalia R sobre uma grade densa tc_days × u_hours em uma única chamada
+# vetorizada e reduz a grade antes do envio ao navegador.
+# =====================================================================
+import math
+
+import numpy as np
+
+from quimera.kernel import compute_log_r
+
+
+def sweep_r(failures, tc_days, u_hours):
+    """Calcula R na grade (u_hours × tc_days) para uma contagem de falhas.
+
+    As linhas seguem u_hours e as colunas tc_days, a mesma orientação
+    z[y][x] esperada pelos heatmaps do Plotly.
+    """
+    tc_days = np.asarray(tc_days, dtype=np.float64)
+    u_hours = np.asarray(u_hours, dtype=np.float64)
+    _, r = compute_log_r(failures, tc_days[None, :], u_hours[:, None])
+    return r
+
+
+def decimate(z, x, y, max_x, max_y):
+    """Reduz z para no máximo max_y × max_x células por máximo em blocos.
+
+    O máximo (e não a média) garante que nenhuma região de risco alto
+    desapareça na redução; os eixos recebem o centro de cada bloco.
+    Retorna (z, x, y) reduzidos.
+    """
+    z = np.asarray(z)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    step_x = max(1, math.ceil(z.shape[1] / max_x))
+    step_y = max(1, math.ceil(z.shape[0] / max_y))
+    if step_x == 1 and step_y == 1:
+        return z, x, y
+
+    # Completa as bordas repetindo a última linha/coluna para blocos inteiros
+    pad_y = -z.shape[0] % step_y
+    pad_x = -z.shape[1] % step_x
+    z = np.pad(z, ((0, pad_y), (0, pad_x)), mode="edge")
+    x = np.pad(x, (0, pad_x), mode="edge")
+    y = np.pad(y, (0, pad_y), mode="edge")
+
+    blocks = z.reshape(z.shape[0] // step_y, step_y, z.shape[1] // step_x, step_x)
+    return (
+        np.nanmax(blocks, axis=(1, 3)),
+        x.reshape(-1, step_x).mean(axis=1),
+        y.reshape(-1, step_y).mean(axis=1),
+    )
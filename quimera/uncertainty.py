@@ -0,0 +1,145 @@
+# =====================================================================
+# INCERTEZA DE R POR MONTE CARLO QUASI-ALEATÓRIO
+# failures e u_hours são estimativas ruidosas. Cada motor é reavaliado
+# sobre uma amostra conjunta:
+#   failures ~ Poisson(failures observadas)
+#   u_hours  ~ distribuição configurável em torno do uso observado
+# gerada a partir de uma sequência de Sobol embaralhada (scipy.stats.qmc),
+# que cobre o espaço de probabilidade de forma mais uniforme que amostras
+# pseudoaleatórias. R é avaliado como uma matriz amostras × motores, em
+# blocos de motores com número limitado de células. Com um ProfileSet,
+# R e as fases seguem o perfil de engineType de cada motor.
+# =====================================================================
+import math
+
+import numpy as np
+from scipy.stats import norm, poisson, qmc
+
+from quimera.fast import compute_log_r_fast
+from quimera.kernel import PHASE_LABELS, classify_phase, compute_log_r
+from quimera.profiles import UNKNOWN_ENGINE_TYPE
+
+# Amostras por motor (potência de 2, exigida pelo equilíbrio da Sobol)
+DEFAULT_SAMPLES = 1024
+
+# Células (amostras × motores) por bloco: ~32 MB por matriz float64
+CHUNK_CELLS = 4_000_000
+
+PERCENTILES = (5, 50, 95)
+
+# Distribuições de u_hours; spread é o desvio relativo (ou meia-largura
+# relativa, na uniforme). z e q são os quantis normal e uniforme da amostra.
+U_DISTRIBUTIONS = {
+    "normal": lambda u, spread, q, z: u * (1 + spread * z),
+    "lognormal": lambda u, spread, q, z: u * np.exp(spread * z - 0.5 * spread**2),
+    "uniform": lambda u, spread, q, z: u * (1 + spread * (2 * q - 1)),
+}
+
+# Uso diário válido no formulário: (0, 24] horas
+MAX_U_HOURS = 24.0
+MIN_U_HOURS = 1e-6
+
+
+def sobol_points(samples=DEFAULT_SAMPLES, seed=None):
+    """Pontos (n, 2) em [0, 1)²; n é samples arredondado para potência de 2."""
+    sampler = qmc.Sobol(d=2, scramble=True, seed=seed)
+    return sampler.random_base2(max(0, math.ceil(math.log2(samples))))
+
+
+def _poisson_quantiles(q, mu):
+    """Inversa da CDF de Poisson, matriz len(q) × len(mu).
+
+    poisson.ppf elemento a elemento é lento; como os pontos q são comuns a
+    todos os motores, basta inverter uma vez por média distinta. Médias não
+    finitas (falhas NaN ou inf) dão colunas NaN, que os kernels propagam.
+    """
+    finite = np.isfinite(mu)
+    unique, inverse = np.unique(mu[finite], return_inverse=True)
+    counts = np.empty((len(q), len(unique)))
+    for column, mean in enumerate(unique.tolist()):
+        # Suporte truncado em ±(12σ + 12): massa de fora abaixo de 1e-30
+        width = 12 * math.sqrt(mean) + 12
+        support = np.arange(max(0, math.floor(mean - width)), math.ceil(mean + width) + 1)
+        cdf = poisson.cdf(support, mean)
+        position = np.minimum(np.searchsorted(cdf, q, side="left"), len(support) - 1)
+        counts[:, column] = support[position]
+    quantiles = np.full((len(q), len(mu)), np.nan)
+    quantiles[:, finite] = counts[:, inverse.reshape(-1)]
+    return quantiles
+
+
+def sample_inputs(failures, u_hours, points, u_distribution="normal", u_spread=0.1):
+    """Matrizes amostras × motores de (failures, u_hours) para os pontos dados."""
+    failures = np.atleast_1d(np.asarray(failures, dtype=np.float64))
+    u_hours = np.atleast_1d(np.asarray(u_hours, dtype=np.float64))
+    if u_distribution not in U_DISTRIBUTIONS:
+        raise ValueError(
+            f"Distribuição de uso desconhecida: {u_distribution} "
+            f"(use {', '.join(U_DISTRIBUTIONS)})"
+        )
+    q_failures, q_usage = points[:, 0], points[:, 1]
+    sampled_failures = _poisson_quantiles(q_failures, np.maximum(failures, 0.0))
+
+    z = norm.ppf(q_usage)[:, np.newaxis]
+    spread = U_DISTRIBUTIONS[u_distribution]
+    sampled_u = spread(u_hours[np.newaxis, :], u_spread, q_usage[:, np.newaxis], z)
+    np.clip(sampled_u, MIN_U_HOURS, MAX_U_HOURS, out=sampled_u)
+    return sampled_failures, sampled_u
+
+
+def r_uncertainty(
+    failures,
+    tc_days,
+    u_hours,
+    samples=DEFAULT_SAMPLES,
+    u_distribution="normal",
+    u_spread=0.1,
+    seed=None,
+    fast=False,
+    chunk_cells=CHUNK_CELLS,
+    profiles=None,
+    codes=UNKNOWN_ENGINE_TYPE,
+):
+    """Percentis de R e probabilidade de cada fase, por motor.
+
+    Retorna um dict com 'P5', 'P50', 'P95' (arrays por motor) e
+    'phase_prob' (motores × 4, colunas na ordem de PHASE_LABELS). Os
+    mesmos pontos de Sobol servem a todos os motores, de modo que as
+    comparações entre motores não carregam ruído de amostragem próprio.
+    Com profiles (ProfileSet), cada motor usa o perfil do seu código.
+    """
+    failures, tc_days, u_hours, codes = (
+        a.reshape(-1)
+        for a in np.broadcast_arrays(
+            np.asarray(failures, dtype=np.float64),
+            np.asarray(tc_days, dtype=np.float64),
+            np.asarray(u_hours, dtype=np.float64),
+            np.asarray(codes, dtype=np.int8),
+        )
+    )
+    points = sobol_points(samples, seed)
+    n = failures.size
+    kernel = compute_log_r_fast if fast else compute_log_r
+    step = max(1, chunk_cells // len(points))
+
+    result = {f"P{p}": np.empty(n) for p in PERCENTILES}
+    result["phase_prob"] = np.empty((n, len(PHASE_LABELS)))
+    for start in range(0, n, step):
+        block = slice(start, min(start + step, n))
+        sampled_failures, sampled_u = sample_inputs(
+            failures[block], u_hours[block], points, u_distribution, u_spread
+        )
+        if profiles is None:
+            _, r = kernel(sampled_failures, tc_days[np.newaxis, block], sampled_u)
+            phase = classify_phase(r)
+        else:
+            block_codes = codes[np.newaxis, block]
+            _, r = profiles.compute_log_r(
+                sampled_failures, tc_days[np.newaxis, block], sampled_u, block_codes, fast
+            )
+            phase = profiles.classify_phase(r, block_codes)
+        for p, values in zip(PERCENTILES, np.percentile(r, PERCENTILES, axis=0)):
+            result[f"P{p}"][block] = values
+        for code in range(len(PHASE_LABELS)):
+            result["phase_prob"][block, code] = np.mean(phase == code, axis=0)
+    return result
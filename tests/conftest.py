@@ -0,0 +1,61 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, "app_0.py")
+PAGE_PATH = os.path.join(ROOT_DIR, "frontend", "index.html")
+
+# Trecho puro do script da página (sem DOM): de gamma() até renderResult()
+PAGE_JS_START = "function gamma(z)"
+PAGE_JS_END = "function renderResult"
+
+
+def page_text():
+    with open(PAGE_PATH, encoding="utf-8") as handle:
+        return handle.read()
+
+
+@pytest.fixture(scope="session")
+def page_js():
+    """Avalia expressões JS no Node sobre as funções puras da página.
+
+    A expressão é serializada com JSON.stringify; use String() para
+    valores não representáveis em JSON (NaN, Infinity).
+    """
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("Node.js não encontrado")
+    page = page_text()
+    start = page.index(PAGE_JS_START)
+    script = page[start : page.index(PAGE_JS_END, start)]
+
+    def run(expression):
+        completed = subprocess.run(
+            [node, "-e", script + f"\nprocess.stdout.write(JSON.stringify({expression}));"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(completed.stdout)
+
+    return run
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Fábrica de AppTest do app_0.py com histórico e snapshot em tmp_path."""
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.setenv("ENGINEREL_HISTORY", str(tmp_path / "history.db"))
+    monkeypatch.setenv("ENGINEREL_LIVE", str(tmp_path / "live.npz"))
+    # O pacote offline (gitignored) pode existir na máquina; os testes usam a fonte
+    monkeypatch.setenv("ENGINEREL_ASSETS", "cdn")
+
+    def make(path=APP_PATH):
+        return AppTest.from_file(path, default_timeout=60)
+
+    return make
@@ -0,0 +1,155 @@
+import asyncio
+import json
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from quimera.api import (
+    ARROW_TYPE,
+    JSON_TYPE,
+    BadRequest,
+    create_app,
+    parse_arrow,
+    parse_json,
+)
+from quimera.kernel import PHASE_LABELS, compute_log_r
+from quimera.profiles import ProfileSet
+
+COLUMNS = {"failures": [3, 1], "tc_days": [7000, 365], "u_hours": [18, 12]}
+
+
+def request(app, path, body=b"", content_type=JSON_TYPE, accept=None, method="POST"):
+    """Chama a aplicação ASGI diretamente; retorna (status, cabeçalhos, corpo)."""
+    headers = [(b"content-type", content_type.encode())]
+    if accept is not None:
+        headers.append((b"accept", accept.encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "server": ("test", 80),
+        "client": ("test", 1),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = sent[0]
+    payload = b"".join(message.get("body", b"") for message in sent[1:])
+    return start["status"], dict(start["headers"]), payload
+
+
+def arrow_body(table):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+@pytest.fixture(scope="module")
+def app():
+    return create_app()
+
+
+def test_json_round_trip(app):
+    body = json.dumps({**COLUMNS, "engineType": ["Gerador", None]}).encode()
+    status, _, payload = request(app, "/score", body)
+    assert status == 200
+    result = json.loads(payload)
+    expected = compute_log_r(COLUMNS["failures"], COLUMNS["tc_days"], COLUMNS["u_hours"])[1]
+    np.testing.assert_allclose(result["R"], expected, rtol=1e-15)
+    assert result["phase_labels"] == list(PHASE_LABELS)
+
+
+def test_arrow_round_trip_with_dictionary_engine_type(app):
+    table = pa.table(
+        {
+            **{name: pa.array(values, pa.float64()) for name, values in COLUMNS.items()},
+            "engineType": pa.array(["Gerador", None]).dictionary_encode(),
+        }
+    )
+    status, headers, payload = request(app, "/score", arrow_body(table), ARROW_TYPE)
+    assert status == 200 and headers[b"content-type"].decode() == ARROW_TYPE
+    result = pa.ipc.open_stream(payload).read_all()
+    assert result.column("phase").to_pylist() == [3, 1]
+
+
+def test_profiles_change_phase():
+    profiles = ProfileSet({"profiles": {"Gerador": {"thresholds": [0.1, 0.2, 0.3]}}})
+    columns = parse_json(json.dumps({**COLUMNS, "engineType": "Gerador"}).encode())
+    np.testing.assert_array_equal(columns[3], [3, 3])
+    status, _, payload = request(
+        create_app(profiles), "/score", json.dumps({**COLUMNS, "engineType": "Gerador"}).encode()
+    )
+    assert status == 200 and json.loads(payload)["phase"] == [0, 0]
+
+
+@pytest.mark.parametrize(
+    "engine_type",
+    [5, {"Gerador": 1}, [["Gerador"], ["Gerador"]], ["Gerador", 3], ["Gerador"], True],
+)
+def test_invalid_engine_type_is_bad_request(app, engine_type):
+    body = json.dumps({**COLUMNS, "engineType": engine_type}).encode()
+    with pytest.raises(BadRequest, match="engineType"):
+        parse_json(body)
+    status, _, payload = request(app, "/score", body)
+    assert status == 400 and "engineType" in json.loads(payload)["error"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"{malformado",
+        b"[1, 2, 3]",
+        json.dumps({"failures": [1], "tc_days": [1]}).encode(),
+        json.dumps({**COLUMNS, "u_hours": [18]}).encode(),
+        json.dumps({**COLUMNS, "u_hours": ["a", "b"]}).encode(),
+        json.dumps({**COLUMNS, "failures": [[1, 2], [3, 4]]}).encode(),
+    ],
+)
+def test_invalid_json_body_is_bad_request(app, body):
+    with pytest.raises(BadRequest):
+        parse_json(body)
+    assert request(app, "/score", body)[0] == 400
+
+
+def test_nested_columns_are_not_flattened():
+    body = json.dumps({"failures": [[1, 2], [3, 4]], "tc_days": [1] * 4, "u_hours": [1] * 4})
+    with pytest.raises(BadRequest, match="listas de números"):
+        parse_json(body.encode())
+
+
+def test_invalid_arrow_is_bad_request(app):
+    table = pa.table(
+        {
+            **{name: pa.array(values, pa.float64()) for name, values in COLUMNS.items()},
+            "engineType": pa.array([1, 2]),
+        }
+    )
+    with pytest.raises(BadRequest, match="engineType"):
+        parse_arrow(arrow_body(table))
+    assert request(app, "/score", arrow_body(table), ARROW_TYPE)[0] == 400
+    assert request(app, "/score", b"nao e arrow", ARROW_TYPE)[0] == 400
+
+
+def test_unsupported_media_type(app):
+    assert request(app, "/score", b"a,b", "text/csv")[0] == 415
+
+
+def test_health(app):
+    status, _, payload = request(app, "/health", method="GET")
+    assert status == 200 and "model_version" in json.loads(payload)
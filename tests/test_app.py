@@ -0,0 +1,99 @@
+import hashlib
+import json
+import shutil
+
+import pytest
+
+from quimera import metrics
+from tests.conftest import APP_PATH, PAGE_PATH
+
+
+def component(at):
+    """Elemento do componente EngineRel na árvore do AppTest."""
+    for element in at.main:
+        proto = getattr(element, "proto", None)
+        if proto is not None and getattr(proto, "component_name", "").count("enginerel_"):
+            return proto
+    raise AssertionError("componente EngineRel não renderizado")
+
+
+def test_console_renders_content_hashed_component(app):
+    at = app().run()
+    assert not at.exception
+    with open(PAGE_PATH, "rb") as page:
+        digest = hashlib.sha256(page.read()).hexdigest()[:12]
+    assert component(at).component_name.endswith("enginerel_" + digest)
+
+
+def test_reruns_send_only_arguments(app):
+    at = app().run()
+    first = component(at)
+    at.run()
+    second = component(at)
+    assert second.component_name == first.component_name
+    # O documento não viaja nos argumentos: só os perfis
+    args = json.loads(second.json_args)
+    assert "profiles" in args
+    assert "<html" not in second.json_args
+    assert len(second.json_args) < 5_000
+
+
+def stage_app(root, bundle_hash):
+    """Cópia do app com frontend/index.html e um pacote gerado da fonte de hash dado."""
+    shutil.copy(APP_PATH, root / "app_0.py")
+    (root / "frontend" / "bundled").mkdir(parents=True)
+    shutil.copy(PAGE_PATH, root / "frontend" / "index.html")
+    (root / "frontend" / "bundled" / "index.html").write_text("<html>pacote</html>")
+    if bundle_hash is not None:
+        (root / "frontend" / "bundled" / "bundle.json").write_text(
+            json.dumps({"source_sha256": bundle_hash})
+        )
+    return str(root / "app_0.py")
+
+
+def page_hash(path):
+    with open(path, "rb") as page:
+        return hashlib.sha256(page.read()).hexdigest()
+
+
+def test_current_bundle_is_served(app, tmp_path, monkeypatch):
+    monkeypatch.delenv("ENGINEREL_ASSETS")
+    at = app(stage_app(tmp_path, page_hash(PAGE_PATH))).run()
+    assert not at.warning
+    bundled = hashlib.sha256(b"<html>pacote</html>").hexdigest()[:12]
+    assert component(at).component_name.endswith(bundled)
+
+
+@pytest.mark.parametrize("bundle_hash", ["0" * 64, None])
+def test_stale_bundle_falls_back_to_source(app, tmp_path, monkeypatch, bundle_hash):
+    monkeypatch.delenv("ENGINEREL_ASSETS")
+    at = app(stage_app(tmp_path, bundle_hash)).run()
+    assert "build_assets.py" in at.warning[0].value
+    assert component(at).component_name.endswith(page_hash(PAGE_PATH)[:12])
+
+
+def diagnostics(at):
+    at.radio[0].set_value("Diagnóstico").run()
+    assert not at.exception
+    return at
+
+
+def test_diagnostics_does_not_toggle_metrics(app, monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", False)
+    at = diagnostics(app().run())
+    assert "ENGINEREL_METRICS=1" in at.info[0].value
+    assert at.button[0].disabled
+    at.run()
+    assert not metrics.is_enabled()
+
+
+def test_diagnostics_scores_sample_when_enabled(app, monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", True)
+    metrics.REGISTRY.reset()
+    at = diagnostics(app().run())
+    assert not at.info
+    at.button[0].click().run()
+    assert metrics.REGISTRY.snapshot()["counters"]["rows"] >= 100_000
+    at.button[1].click().run()
+    assert metrics.REGISTRY.snapshot()["counters"]["rows"] == 0
+    assert metrics.is_enabled()
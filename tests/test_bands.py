@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from quimera.bands import PhaseIndex
+from quimera.kernel import PHASE_THRESHOLDS, classify_phase
+
+
+def assert_consistent(index, r):
+    """Confere o índice contra uma ordenação e classificação do zero."""
+    keys = np.nan_to_num(r, nan=-np.inf, posinf=np.inf)
+    np.testing.assert_array_equal(index.keys[: len(index)], np.sort(keys))
+    np.testing.assert_array_equal(keys[index.order[: len(index)]], np.sort(keys))
+    np.testing.assert_array_equal(index.counts(), np.bincount(classify_phase(r), minlength=4))
+    for phase in range(4):
+        assert set(index.band(phase).tolist()) == set(
+            np.flatnonzero(classify_phase(r) == phase).tolist()
+        )
+
+
+def test_build_matches_classify_phase():
+    r = np.concatenate([PHASE_THRESHOLDS, PHASE_THRESHOLDS - 1e-12, [0.0, np.nan, np.inf]])
+    assert_consistent(PhaseIndex(r), r)
+
+
+def test_random_single_updates_and_appends():
+    rng = np.random.default_rng(5)
+    r = rng.uniform(0.0, 0.1, 50)
+    index = PhaseIndex(r, capacity=1)
+    for _ in range(500):
+        row = int(rng.integers(0, len(r) + 1))
+        value = rng.choice([rng.uniform(0.0, 0.1), np.nan, float(r[0])])
+        if row == len(r):
+            r = np.append(r, value)
+        else:
+            r[row] = value
+        index.update(row, value)
+    assert_consistent(index, r)
+
+
+@pytest.mark.parametrize("batch", [3, 200])
+def test_update_many_small_and_rebuild_paths(batch):
+    rng = np.random.default_rng(batch)
+    r = rng.uniform(0.0, 0.1, 1000)
+    index = PhaseIndex(r)
+    rows = rng.choice(1000, batch, replace=False)
+    r[rows] = rng.uniform(0.0, 0.1, batch)
+    index.update_many(rows, r[rows])
+    assert_consistent(index, r)
+
+
+def test_range_and_top():
+    r = np.array([0.05, 0.001, 0.2, 0.03, 0.07])
+    index = PhaseIndex(r)
+    assert index.range(0.03, 0.07).tolist() == [3, 0]
+    assert index.top(2).tolist() == [2, 4]
+    assert index.top(10).tolist() == [2, 4, 0, 3, 1]
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from quimera import bench
+
+
+@pytest.fixture(autouse=True)
+def quick(monkeypatch):
+    # Uma repetição por medição: os testes conferem a mecânica, não o tempo
+    monkeypatch.setattr(bench, "MIN_REPEATS", 1)
+    monkeypatch.setattr(bench, "MIN_SECONDS", 0.0)
+
+
+def test_measure_reports_rates():
+    result = bench.measure("compute_log_r", 2500, chunk_rows=1000)
+    assert result["kernel"] == "compute_log_r" and result["rows"] == 2500
+    assert result["rows_per_s"] == pytest.approx(2500 / result["seconds"])
+    assert result["ns_per_row"] == pytest.approx(result["seconds"] / 2500 * 1e9)
+    assert result["peak_mib"] > 0 and result["repeats"] == 1
+
+
+def test_scalar_kernels_stop_at_limit():
+    results = bench.run_benchmarks((100, 1000), ("reference", "compute_r"), scalar_max_rows=100)
+    assert [(r["kernel"], r["rows"]) for r in results] == [
+        ("reference", 100),
+        ("compute_r", 100),
+        ("compute_r", 1000),
+    ]
+
+
+def test_main_writes_json(tmp_path, capsys):
+    path = tmp_path / "bench.json"
+    bench.main(["--sizes", "1e3", "--kernels", "score_parallel", "--json", str(path)])
+    assert "score_parallel" in capsys.readouterr().out
+    (result,) = json.loads(path.read_text())
+    assert result["kernel"] == "score_parallel" and result["rows"] == 1000
+
+
+def test_main_rejects_unknown_kernel():
+    with pytest.raises(SystemExit):
+        bench.main(["--kernels", "inexistente"])
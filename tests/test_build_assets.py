@@ -0,0 +1,51 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+import build_assets  # noqa: E402
+
+FONT_CSS = (
+    "/* cyrillic */\n@font-face { src: url(https://fonts.gstatic.com/c.woff2); }\n"
+    "/* latin */\n@font-face { src: url(https://fonts.gstatic.com/l.woff2); }\n"
+)
+
+
+def fake_fetch(url):
+    if "fonts.googleapis.com" in url:
+        return FONT_CSS.encode()
+    return b"asset:" + url.encode()
+
+
+@pytest.fixture
+def bundle_dir(tmp_path, monkeypatch):
+    bundle = tmp_path / "bundled"
+    monkeypatch.setattr(build_assets, "BUNDLE_DIR", str(bundle))
+    monkeypatch.setattr(build_assets, "ASSETS_DIR", str(bundle / "assets"))
+    monkeypatch.setattr(build_assets, "fetch", fake_fetch)
+    build_assets.build()
+    return bundle
+
+
+def test_bundle_has_no_cdn_references(bundle_dir):
+    page = (bundle_dir / "index.html").read_text(encoding="utf-8")
+    for host in ("fonts.googleapis.com", "fonts.gstatic.com", "polyfill.io", "MathJax", "unsplash"):
+        assert host not in page
+    assert "$$" not in page
+    assert 'src="assets/math/' in page
+
+
+def test_bundle_keeps_only_latin_fonts(bundle_dir):
+    css = (bundle_dir / "assets" / "fonts.css").read_text(encoding="utf-8")
+    assert "/* latin */" in css and "cyrillic" not in css
+    assert len(os.listdir(bundle_dir / "assets" / "fonts")) == 1
+
+
+def test_bundle_records_source_hash(bundle_dir):
+    with open(build_assets.SOURCE_HTML, "rb") as source:
+        expected = hashlib.sha256(source.read()).hexdigest()
+    manifest = json.loads((bundle_dir / build_assets.BUNDLE_MANIFEST).read_text())
+    assert manifest == {"source_sha256": expected}
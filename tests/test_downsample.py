@@ -0,0 +1,59 @@
+import math
+
+import numpy as np
+import pytest
+
+from quimera.downsample import lttb
+
+
+def reference_lttb(x, y, n_out):
+    """LTTB clássico, ponto a ponto, para comparação."""
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    selected = [0]
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        next_lo, next_hi = hi, min(int((i + 2) * every) + 1, n - 1)
+        if i == n_out - 3:
+            hi, next_lo, next_hi = n - 1, n - 1, n
+        mean_x = sum(x[next_lo:next_hi]) / (next_hi - next_lo)
+        mean_y = sum(y[next_lo:next_hi]) / (next_hi - next_lo)
+        areas = [
+            abs((x[a] - mean_x) * (y[j] - y[a]) - (x[a] - x[j]) * (mean_y - y[a]))
+            for j in range(lo, hi)
+        ]
+        a = lo + areas.index(max(areas))
+        selected.append(a)
+    return selected + [n - 1]
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 50), (1001, 7), (100, 99), (10, 3)])
+def test_matches_reference(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.cumsum(rng.uniform(0.5, 1.5, n))
+    y = rng.normal(size=n)
+    assert lttb(x, y, n_out).tolist() == reference_lttb(x.tolist(), y.tolist(), n_out)
+
+
+def test_keeps_endpoints_and_spike():
+    x = np.arange(10_000.0)
+    y = np.zeros(10_000)
+    y[4321] = 1.0
+    keep = lttb(x, y, 100)
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == 9999 and 4321 in keep
+    assert np.all(np.diff(keep) > 0)
+
+
+@pytest.mark.parametrize("n_out", [2, 500])
+def test_short_series_or_tiny_target_keep_everything(n_out):
+    np.testing.assert_array_equal(lttb(np.arange(100.0), np.ones(100), n_out), np.arange(100))
+
+
+def test_non_finite_r_does_not_break_selection():
+    x = np.arange(1000.0)
+    y = np.full(1000, 0.01)
+    y[100], y[500], y[900] = math.inf, math.nan, 1e300
+    keep = lttb(x, y, 20)
+    assert len(keep) == 20 and 100 in keep and 900 in keep
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from quimera.fast import MAX_RELATIVE_ERROR, compute_log_r_fast, max_relative_error
+from quimera.kernel import compute_log_r
+from quimera.stream import score_chunk
+
+
+def test_error_bound_holds():
+    assert max_relative_error(samples=200_000) <= MAX_RELATIVE_ERROR
+
+
+def test_rows_outside_domain_use_exact_kernel():
+    # tc < 1 dia, α > 1 (tc ≈ 0), tc = 0, u <= 0 e tcd negativo
+    failures = np.array([3.0, 3.0, 3.0, 3.0, 3.0])
+    tc_days = np.array([0.5, 1e-4, 0.0, 100.0, -2.0])
+    u_hours = np.array([12.0, 12.0, 12.0, 0.0, 12.0])
+    fast_log_r, fast_r = compute_log_r_fast(failures, tc_days, u_hours)
+    exact_log_r, exact_r = compute_log_r(failures, tc_days, u_hours)
+    np.testing.assert_array_equal(fast_log_r, exact_log_r)
+    np.testing.assert_array_equal(fast_r, exact_r)
+
+
+def test_broadcasts_like_exact_kernel():
+    failures = np.array([[1.0], [5.0]])
+    tc_days = np.array([10.0, 700.0, 7000.0])
+    log_r, r = compute_log_r_fast(failures, tc_days, 18.0)
+    assert log_r.shape == r.shape == (2, 3)
+    exact = compute_log_r(failures, tc_days, 18.0)[1]
+    np.testing.assert_allclose(r, exact, rtol=MAX_RELATIVE_ERROR)
+
+
+def test_stream_fast_option():
+    chunk = pd.DataFrame({"failures": [3.0, 0.0], "tc_days": [7000.0, 0.0], "u_hours": [18.0, 8.0]})
+    exact = score_chunk(chunk)
+    fast = score_chunk(chunk, fast=True)
+    np.testing.assert_allclose(fast["R"], exact["R"], rtol=MAX_RELATIVE_ERROR)
+    np.testing.assert_array_equal(fast["phase"], exact["phase"])
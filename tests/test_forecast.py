@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from quimera.forecast import forecast_phases, time_to_threshold
+from quimera.kernel import PHASE_LABELS, PHASE_THRESHOLDS, compute_log_r
+
+
+def test_crossing_lands_just_past_threshold():
+    failures = np.array([3.0, 1.0, 10.0])
+    tc_days = np.array([10.0, 100.0, 1.0])
+    u_hours = np.array([18.0, 12.0, 6.0])
+    days = time_to_threshold(failures, tc_days, u_hours, 0.03, tol_days=1e-6)
+    assert np.all(np.isfinite(days)) and np.all(days > 0)
+    crossed = tc_days + days
+    # Folga de arredondamento: tc_days + dias refaz a soma do solver
+    assert np.all(compute_log_r(failures, crossed, u_hours)[1] >= 0.03 * (1 - 1e-12))
+    assert np.all(compute_log_r(failures, crossed - 1e-3, u_hours)[1] < 0.03)
+
+
+def test_already_above_threshold_is_zero():
+    assert time_to_threshold(3.0, 7000.0, 18.0, 0.06) == 0.0
+
+
+def test_unreachable_within_horizon_is_inf():
+    assert np.isinf(time_to_threshold(0.0, 1.0, 24.0, 0.06, horizon_days=30.0))
+
+
+@pytest.mark.parametrize("horizon_days", [1076.0, 1332.0, 1947.0])
+def test_crossing_between_last_doubling_and_horizon(horizon_days):
+    # Sondas em 1, 2, ..., 1024 dias; a seguinte já passaria do horizonte
+    threshold = compute_log_r(3.0, 1024.9, 18.0)[1]
+    days = time_to_threshold(3.0, 0.0, 18.0, threshold, horizon_days=horizon_days)
+    assert days == pytest.approx(1024.9, abs=1e-3)
+    assert np.isinf(time_to_threshold(3.0, 0.0, 18.0, threshold, horizon_days=1000.0))
+
+
+def test_spike_at_tc_equal_u_is_skipped():
+    # Logo após o reparo, R passa de ALERTA perto de tc = u (12 h = 0,5 dia)
+    assert compute_log_r(3.0, 0.5 + 1e-9, 12.0)[1] > 0.03
+    days = time_to_threshold(3.0, 0.0, 12.0, 0.03)
+    assert days > 100
+    assert compute_log_r(3.0, days, 12.0)[1] == pytest.approx(0.03, rel=1e-4)
+
+
+def test_invalid_inputs_are_nan():
+    assert np.isnan(time_to_threshold(3.0, -5.0, 18.0, 0.03))
+
+
+def test_scalar_and_matrix_shapes():
+    assert np.ndim(time_to_threshold(3.0, 10.0, 18.0, 0.03)) == 0
+    days = time_to_threshold(np.array([[1.0], [5.0]]), np.array([10.0, 500.0]), 18.0, 0.03)
+    assert days.shape == (2, 2)
+
+
+def test_forecast_phases_orders_alert_before_failure():
+    forecast = forecast_phases([3.0, 1.0], [10.0, 100.0], [18.0, 12.0])
+    assert set(forecast) == {PHASE_LABELS[2], PHASE_LABELS[3]}
+    assert np.all(forecast[PHASE_LABELS[2]] <= forecast[PHASE_LABELS[3]])
+    expected = time_to_threshold([3.0, 1.0], [10.0, 100.0], [18.0, 12.0], PHASE_THRESHOLDS[2])
+    np.testing.assert_array_equal(forecast[PHASE_LABELS[3]], expected)
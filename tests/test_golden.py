@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from quimera import golden, parallel
+from quimera.golden import KERNELS, check_kernels, compare, golden_inputs, reference_r
+
+
+@pytest.mark.parametrize("name", list(KERNELS))
+def test_kernel_matches_golden_table(name):
+    (result,) = check_kernels([name])
+    assert result["ok"], result
+    assert result["rows"] > 0
+
+
+def test_reference_port_matches_page_value():
+    r = reference_r(3.0, 7000.0, 18.0)
+    assert r == pytest.approx(0.07784797579479119, rel=1e-12)
+
+
+def test_golden_inputs_are_reproducible():
+    first, second = golden_inputs(), golden_inputs()
+    for a, b in zip(first, second):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_compare_counts_special_values_exactly():
+    expected = np.array([0.0, np.inf, np.nan, 1.0, 2.0])
+    r = np.array([0.0, np.inf, np.nan, 1.0 + 1e-9, 2.5])
+    max_error, mismatches = compare(r, expected, tolerance=1e-6)
+    assert mismatches == 1 and max_error == pytest.approx(0.25)
+    assert compare(np.array([np.nan, 1.0]), np.array([0.0, 1.0]), 1e-6)[1] == 1
+
+
+def test_parallel_kernel_reuses_one_pool(monkeypatch):
+    kernel = KERNELS["score_parallel"][0]
+    inputs = tuple(np.array(values) for values in ([3.0, 1.0], [7000.0, 365.0], [18.0, 12.0]))
+    kernel(*inputs)
+
+    def no_new_pools(*args, **kwargs):
+        raise AssertionError("score_parallel criou um pool novo")
+
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", no_new_pools)
+    np.testing.assert_array_equal(kernel(*inputs), KERNELS["compute_log_r"][0](*inputs))
+    assert golden._process_pool() is golden._process_pool()
+
+
+def test_profiles_kernel_reads_profiles_once(monkeypatch):
+    kernel = KERNELS["profiles"][0]
+    inputs = tuple(np.array(values) for values in ([3.0, 1.0], [7000.0, 365.0], [18.0, 12.0]))
+    kernel(*inputs)
+
+    def no_reads(*args, **kwargs):
+        raise AssertionError("profiles.json relido a cada chamada")
+
+    monkeypatch.setattr(golden, "load_profiles", no_reads)
+    np.testing.assert_array_equal(kernel(*inputs), KERNELS["compute_log_r"][0](*inputs))
+
+
+def test_r_from_log_keeps_finite_values_near_float_max():
+    assert golden._r_from_log(709.5) == pytest.approx(np.exp(709.5))
+    assert golden._r_from_log(710.0) == np.inf
+    assert np.isnan(golden._r_from_log(np.nan))
@@ -0,0 +1,75 @@
+import io
+
+import numpy as np
+import pytest
+
+from quimera.history import SECONDS_PER_DAY, ScoreHistory
+from quimera.kernel import PHASE_LABELS, classify_phase
+from quimera.stream import stream_score
+
+DAY = SECONDS_PER_DAY
+
+
+@pytest.fixture
+def history(tmp_path):
+    with ScoreHistory(str(tmp_path / "history.db")) as history:
+        yield history
+
+
+def phase_totals(history):
+    return history.daily_phase_counts().sum().to_numpy()
+
+
+def test_record_and_read_trend(history):
+    history.record(["E-1", "E-1", "E-2"], [2 * DAY, DAY, DAY], 3.0, 100.0, 12.0, [0.02, 0.07, 0.0])
+    trend = history.trend("E-1")
+    assert trend["ts"].tolist() == [DAY, 2 * DAY]
+    assert trend["phase"].tolist() == [3, 1]
+    ts, r = history.series("E-1", start=1.5 * DAY)
+    assert ts.tolist() == [2 * DAY] and r.tolist() == [0.02]
+    assert history.last_ts("E-2") == DAY and history.last_ts("E-9") is None
+    assert sorted(history.engine_ids()) == ["E-1", "E-2"]
+
+
+def test_daily_rollup_matches_scores(history):
+    r = np.array([0.0, 0.02, 0.04, 0.07, 0.07])
+    history.record(list("ABCDE"), [0.0, 0.0, DAY, DAY, DAY], 1.0, 10.0, 4.0, r)
+    daily = history.daily_phase_counts()
+    assert list(daily.columns) == list(PHASE_LABELS)
+    assert daily.to_numpy().tolist() == [[1, 1, 0, 0], [0, 0, 1, 2]]
+
+
+def test_duplicate_key_in_one_batch_keeps_last(history):
+    history.record(["E-1", "E-2", "E-1"], DAY, 3.0, 100.0, 12.0, [0.07, 0.0, 0.02])
+    assert history.trend("E-1")["R"].tolist() == [0.02]
+    np.testing.assert_array_equal(phase_totals(history), [1, 1, 0, 0])
+
+
+def test_rewriting_a_key_replaces_score_and_rollup(history):
+    history.record(["E-1", "E-2"], DAY, 3.0, 100.0, 12.0, [0.07, 0.02])
+    history.record(["E-1"], DAY, 4.0, 100.0, 12.0, [0.04])
+    trend = history.trend("E-1")
+    assert trend["R"].tolist() == [0.04] and trend["failures"].tolist() == [4.0]
+    np.testing.assert_array_equal(phase_totals(history), [0, 1, 1, 0])
+
+
+def test_stream_with_repeated_ids_across_chunks(history):
+    source = io.BytesIO(
+        b"engine_id,failures,tc_days,u_hours\n"
+        b"E-1,3,7000,18\nE-2,1,365,12\nE-1,0,10,4\nE-2,5,2000,20\n"
+    )
+    sink = io.BytesIO()
+    list(stream_score(source, sink, chunk_rows=2, history=history))
+    assert sorted(history.engine_ids()) == ["E-1", "E-2"]
+    e1 = history.trend("E-1")
+    assert len(e1) == 1 and e1["tc_days"].tolist() == [10.0]
+    assert phase_totals(history).sum() == 2
+    assert classify_phase(e1["R"].to_numpy())[0] == e1["phase"][0]
+
+
+def test_stream_without_id_column_records_nothing(history):
+    source = io.BytesIO(b"failures,tc_days,u_hours\n3,7000,18\n1,365,12\n")
+    sink = io.BytesIO()
+    list(stream_score(source, sink, history=history))
+    assert history.engine_ids() == []
+    assert sink.getvalue().count(b"\n") == 3
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import math
+
+import numpy as np
+import pytest
+
+from quimera.ingest import (
+    MAX_LINE_BYTES,
+    READ_BYTES,
+    IngestServer,
+    parse_events,
+    read_snapshot,
+    send_lines,
+    write_snapshot,
+)
+from quimera.kernel import compute_log_r
+from quimera.state import SECONDS_PER_DAY, FleetState
+
+DAY = SECONDS_PER_DAY
+
+
+def line(**message):
+    return (json.dumps(message) + "\n").encode()
+
+
+def test_parse_events_validates_each_line():
+    lines = [
+        line(event="failure", engine_id=7, ts=10.0),
+        line(event="repair", engine_id="M-1"),
+        line(event="usage", engine_id="M-1", ts=5.0, u_hours=12.5),
+        b"",
+        b"{malformado",
+        line(event="overhaul", engine_id="M-1"),
+        line(event="usage", engine_id="M-1"),
+        line(event="failure", engine_id="M-1", ts="NaN"),
+        line(event="usage", engine_id="M-1", u_hours="Infinity"),
+        b"[1, 2]",
+    ]
+    events, rejected = parse_events(lines, now=99.0)
+    assert rejected == 6
+    assert events[0] == ("failure", "7", 10.0, pytest.approx(math.nan, nan_ok=True))
+    assert events[1][:3] == ("repair", "M-1", 99.0)
+    assert events[2] == ("usage", "M-1", 5.0, 12.5)
+
+
+def test_invalid_event_leaves_state_untouched():
+    state = FleetState()
+    state.apply_events([("usage", "M-1", 0.0, 12.0)])
+    before = {name: column[: len(state)].copy() for name, column in state.columns.items()}
+    batch = [("failure", "M-1", DAY, math.nan), ("failure", "M-2", math.nan, math.nan)]
+    with pytest.raises(ValueError, match="Timestamp"):
+        state.apply_events(batch)
+    assert len(state) == 1 and list(state.windows[0]) == []
+    for name, column in before.items():
+        np.testing.assert_array_equal(state.columns[name][:1], column)
+
+
+def test_snapshot_round_trip(tmp_path):
+    state = FleetState()
+    state.apply_events(
+        [("usage", "M-1", 0.0, 12.0), ("failure", "M-1", DAY, math.nan), ("usage", "M-2", 0.0, 6.0)]
+    )
+    path = str(tmp_path / "live.npz")
+    write_snapshot(state, path)
+    frame = read_snapshot(path)
+    assert frame["engine_id"].tolist() == ["M-1", "M-2"]
+    np.testing.assert_array_equal(frame["R"], state.columns["r"][:2])
+    np.testing.assert_allclose(frame["tc_days"], [1.0, 0.0])
+
+
+def serve_and_send(payloads, **kwargs):
+    """Sobe o serviço numa porta livre, envia cada payload por uma conexão e para."""
+
+    async def run():
+        server = IngestServer(**kwargs)
+        await server.start("127.0.0.1", 0)
+        port = server.server.sockets[0].getsockname()[1]
+        for payload in payloads:
+            await send_lines(payload, port=port, block=1)
+        await server.stop()
+        return server
+
+    return asyncio.run(run())
+
+
+def test_server_applies_events_and_caps_long_lines():
+    # Evento válido, porém maior que uma leitura do socket: só o limite o descarta
+    padding = "x" * (3 * READ_BYTES)
+    long_line = line(event="usage", engine_id="M-9", ts=0.0, u_hours=1.0, pad=padding)
+    assert len(long_line) > MAX_LINE_BYTES
+    payload = [
+        line(event="usage", engine_id="M-1", ts=0.0, u_hours=12.0),
+        long_line,
+        line(event="failure", engine_id="M-1", ts=DAY),
+        b'{"event": "failure", "engine_id": "M-1", "ts": 172800.0}',  # sem '\n' no EOF
+    ]
+    server = serve_and_send([payload])
+    assert server.stats["rejected"] == 1
+    assert server.stats["failed"] == 0
+    assert server.stats["events"] == 3
+    assert server.state.engine_ids == ["M-1"]
+    expected = float(compute_log_r(2.0, 2.0, 12.0)[1])
+    assert server.state.r("M-1") == pytest.approx(expected, rel=1e-12)
+
+
+def test_failed_micro_batch_is_counted_and_not_applied():
+    class BrokenState(FleetState):
+        def apply_events(self, events):
+            raise RuntimeError("falha simulada")
+
+    server = serve_and_send([[line(event="repair", engine_id="M-1", ts=0.0)]], state=BrokenState())
+    assert server.stats["failed"] == 1 and server.stats["events"] == 0
+    assert len(server.state) == 0
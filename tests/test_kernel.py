@@ -0,0 +1,108 @@
+import math
+
+import numpy as np
+import pytest
+
+from quimera.kernel import (
+    PHASE_THRESHOLDS,
+    _alpha,
+    classify_phase,
+    compute_log_r,
+    compute_r,
+    gamma,
+    log_r_scalar,
+)
+
+# Valores de R calculados pelo computeRisk() da página (Node)
+PAGE_VALUES = [
+    ((3.0, 7000.0, 18.0), 0.07784797579479119),
+    ((2.0, 365.5, 12.0), 0.0267317850008234),
+]
+
+
+@pytest.mark.parametrize("inputs, expected", PAGE_VALUES)
+def test_compute_r_matches_page(inputs, expected):
+    assert compute_r(*inputs) == pytest.approx(expected, rel=1e-12)
+
+
+def test_compute_r_broadcasts_scalars_and_arrays():
+    failures = np.array([[0.0], [3.0]])
+    tc_days = np.array([10.0, 700.0, 7000.0])
+    r = compute_r(failures, tc_days, 18.0)
+    assert r.shape == (2, 3)
+    assert r[1, 2] == pytest.approx(PAGE_VALUES[0][1], rel=1e-12)
+
+
+def test_zero_r_cases():
+    # tcd = 0 anula a raiz; u <= 0 cai no ramo R = 0 do JS
+    assert compute_r(5.0, 0.0, 12.0) == 0.0
+    assert compute_r(5.0, 100.0, 0.0) == 0.0
+
+
+@pytest.mark.parametrize("z", [0.1, 0.5, 1.0, 2.5, 7.3, 50.0, -0.5, -2.7])
+def test_gamma_matches_math_gamma(z):
+    assert gamma(z) == pytest.approx(math.gamma(z), rel=1e-12)
+
+
+def test_classify_phase_boundaries_and_nan():
+    r = np.concatenate([PHASE_THRESHOLDS - 1e-12, PHASE_THRESHOLDS, [0.0, np.nan, np.inf]])
+    np.testing.assert_array_equal(classify_phase(r), [0, 1, 2, 1, 2, 3, 0, 0, 3])
+
+
+def test_alpha_branches():
+    tc = np.array([0.0, 60.0, 100.0])
+    u = np.array([30.0, 60.0, 40.0])
+    np.testing.assert_allclose(_alpha(tc, u), [math.log(30.0), 1 / 61, 60 / 101])
+
+
+def test_log_space_matches_direct_kernel():
+    rng = np.random.default_rng(1)
+    failures = rng.integers(0, 21, 500).astype(np.float64)
+    tc_days = rng.uniform(0.01, 7000, 500)
+    u_hours = rng.uniform(0.1, 24, 500)
+    log_r, r = compute_log_r(failures, tc_days, u_hours)
+    np.testing.assert_allclose(r, compute_r(failures, tc_days, u_hours), rtol=1e-6)
+    np.testing.assert_allclose(np.exp(log_r), r, rtol=1e-15)
+
+
+def test_log_space_survives_overflow():
+    # O JS (e compute_r) estouram para inf; log R continua finito
+    log_r, r = compute_log_r(1e6, 7000.0, 0.1)
+    assert np.isfinite(log_r) and np.isinf(r)
+    assert np.isinf(compute_r(1e6, 7000.0, 0.1))
+
+
+def test_log_space_zero_and_nan_cases():
+    log_r, r = compute_log_r([5.0, 5.0, 5.0], [0.0, 100.0, -3.0], [12.0, 0.0, 12.0])
+    assert log_r[0] == -np.inf and r[0] == 0.0
+    assert log_r[1] == -np.inf and r[1] == 0.0
+    assert np.isnan(log_r[2]) and np.isnan(r[2])
+
+
+def test_log_space_profile_conversions():
+    # 12 h por dia de tc e janela de 730 dias equivalem a tc e falhas reescalados
+    log_r, _ = compute_log_r(4.0, 100.0, 6.0, hours_per_day=12, window_days=730.0)
+    expected, _ = compute_log_r(2.0, 50.0, 6.0)
+    assert log_r == pytest.approx(expected + 0.5 * math.log(2.0), rel=1e-12)
+
+
+@pytest.mark.parametrize(
+    "inputs",
+    [
+        (3.0, 7000.0, 18.0),
+        (0.0, 0.0, 5.0),
+        (4.0, 1 / 24, 1.0),
+        (2.0, 10.0, 0.0),
+        (2.0, 10.0, math.nan),
+        (2.0, -1.0, 12.0),
+    ],
+)
+def test_log_r_scalar_matches_vectorized(inputs):
+    expected = float(compute_log_r(*inputs)[0])
+    result = log_r_scalar(*inputs)
+    if math.isnan(expected):
+        assert math.isnan(result)
+    elif math.isinf(expected):
+        assert result == expected
+    else:
+        assert result == pytest.approx(expected, rel=1e-12)
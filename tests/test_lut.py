@@ -0,0 +1,63 @@
+import json
+
+import numpy as np
+import pytest
+
+from quimera.kernel import compute_log_r
+from quimera.lut import DEFAULT_TOLERANCE, RLookupTable
+
+
+@pytest.fixture(scope="module")
+def lut_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("lut") / "r_table.npy")
+    RLookupTable.load_or_build(path)
+    return path
+
+
+def test_persisted_table_is_memory_mapped(lut_path):
+    lut = RLookupTable.load(lut_path)
+    assert isinstance(lut.table, np.memmap)
+    assert lut.max_rel_error <= DEFAULT_TOLERANCE
+
+
+def test_lookup_within_tolerance(lut_path):
+    lut = RLookupTable.load(lut_path)
+    rng = np.random.default_rng(7)
+    failures = rng.integers(0, 50, 20_000).astype(np.float64)
+    tc_days = rng.uniform(2.0, 20_000.0, 20_000)
+    u_hours = rng.uniform(0.1, 24.0, 20_000)
+    approx, _ = lut.compute_log_r(failures, tc_days, u_hours)
+    exact, _ = compute_log_r(failures, tc_days, u_hours)
+    assert np.max(np.abs(np.expm1(approx - exact))) <= DEFAULT_TOLERANCE
+
+
+def test_points_outside_grid_use_exact_kernel(lut_path):
+    lut = RLookupTable.load(lut_path)
+    # Fora da grade, NaN e tcd negativo (coordenada NaN) seguem o kernel exato
+    failures = np.array([3.0, 3.0, 3.0, 3.0, np.nan])
+    tc_days = np.array([0.5, 50_000.0, -1.0, 100.0, 100.0])
+    u_hours = np.array([12.0, 12.0, 12.0, np.nan, 12.0])
+    log_r, r = lut.compute_log_r(failures, tc_days, u_hours)
+    exact_log_r, exact_r = compute_log_r(failures, tc_days, u_hours)
+    np.testing.assert_array_equal(log_r[:4], exact_log_r[:4])
+    np.testing.assert_array_equal(r[:4], exact_r[:4])
+    assert np.isnan(r[4])
+
+
+def test_scalar_input_keeps_shape(lut_path):
+    log_r, r = RLookupTable.load(lut_path).compute_log_r(3.0, 7000.0, 18.0)
+    assert np.shape(log_r) == np.shape(r) == ()
+    exact = float(compute_log_r(3.0, 7000.0, 18.0)[1])
+    assert float(r) == pytest.approx(exact, rel=DEFAULT_TOLERANCE)
+
+
+def test_other_model_version_is_rejected(lut_path, tmp_path):
+    with open(lut_path + ".json") as handle:
+        meta = json.load(handle)
+    meta["model_version"] = "0.0.0"
+    stale = str(tmp_path / "stale.npy")
+    np.save(stale, np.load(lut_path))
+    with open(stale + ".json", "w") as handle:
+        json.dump(meta, handle)
+    assert RLookupTable.load(stale) is None
+    assert RLookupTable.load(str(tmp_path / "ausente.npy")) is None
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from quimera import metrics
+from quimera.kernel import classify_phase, compute_log_r, compute_r
+
+KERNEL_STAGES = ("conversion", "alpha", "exp_term", "gamma_lnln", "euler", "synthesis")
+
+# Linha normal, piso + trava (tc = 0, u = 30 s, α < 0), R = 0 (u = 0), Γ negativa
+# (NaN) e estouro do termo exponencial (inf)
+FAILURES = np.array([3.0, 0.0, 2.0, 1.0, 1e6])
+TC_DAYS = np.array([120.0, 0.0, 30.0, 0.0, 1.0])
+U_HOURS = np.array([8.0, 0.5 / 60, 0.0, 0.001, 0.001])
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", True)
+    metrics.REGISTRY.reset()
+    yield metrics.REGISTRY
+    metrics.REGISTRY.reset()
+
+
+@pytest.mark.parametrize("kernel", [compute_r, lambda f, t, u: compute_log_r(f, t, u)[1]])
+def test_kernels_count_special_cases(enabled, kernel):
+    kernel(FAILURES, TC_DAYS, U_HOURS)
+    snapshot = enabled.snapshot()
+    assert snapshot["counters"] == {
+        "rows": 5,
+        "inner_log_floor": 1,
+        "tc_zero_lock": 1,
+        "nan": 1,
+        "inf": 1,
+    }
+    for stage in KERNEL_STAGES:
+        assert snapshot["stages"][stage][0] == 1
+    assert snapshot["stages"]["phase"][0] == 0
+
+
+def test_disabled_records_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", False)
+    metrics.REGISTRY.reset()
+    compute_r(FAILURES, TC_DAYS, U_HOURS)
+    compute_log_r(FAILURES, TC_DAYS, U_HOURS)
+    classify_phase(np.array([0.02]))
+    snapshot = metrics.REGISTRY.snapshot()
+    assert all(calls == 0 for calls, _ in snapshot["stages"].values())
+    assert not any(snapshot["counters"].values())
+
+
+def test_timed_iter_measures_each_item(enabled):
+    assert list(metrics.timed_iter(iter([1, 2, 3]), "parsing")) == [1, 2, 3]
+    # A chamada que encerra o iterador (ex.: o fim do arquivo) também conta
+    assert enabled.snapshot()["stages"]["parsing"][0] == 4
+
+
+def test_render_prometheus(enabled):
+    compute_r(FAILURES, TC_DAYS, U_HOURS)
+    classify_phase(np.array([0.02]))
+    lines = metrics.render_prometheus().splitlines()
+    assert 'enginerel_stage_calls_total{stage="phase"} 1' in lines
+    assert 'enginerel_clamped_total{case="tc_zero_lock"} 1' in lines
+    assert 'enginerel_outcomes_total{outcome="nan"} 1' in lines
+    assert "enginerel_rows_total 5" in lines
+    assert "enginerel_metrics_enabled 1" in lines
+    # Cada métrica é declarada uma única vez, mesmo com vários rótulos
+    assert lines.count("# TYPE enginerel_clamped_total counter") == 1
@@ -0,0 +1,225 @@
+import json
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from quimera.golden import LOG_SPACE_TOLERANCE
+from quimera.kernel import compute_log_r, compute_r
+from quimera.profiles import ENGINE_TYPES, ProfileSet, encode_engine_types
+from quimera.sample import synthetic_fleet
+from tests.conftest import PAGE_JS_END, PAGE_JS_START, page_text
+
+CASES = [(3.0, 7000.0, 18.0), (0.0, 70.0, 8.0), (12.0, 2500.5, 23.9), (1.0, 0.0, 6.0)]
+
+
+def test_submit_has_no_artificial_delay():
+    assert "setTimeout" not in page_text()
+
+
+def test_compute_risk_matches_python_kernel(page_js):
+    r = page_js(f"{[list(case) for case in CASES]}.map(([f, t, u]) => computeRisk(f, t, u).R)")
+    np.testing.assert_allclose(r, [float(compute_r(*case)) for case in CASES], rtol=1e-12)
+
+
+def test_compute_risk_is_pure_and_exposes_terms(page_js):
+    result = page_js("computeRisk(3, 7000, 18)")
+    assert result["tc"] == 7000 * 24 * 60
+    assert result["u"] == 18 * 60
+    assert result["lambda"] == pytest.approx(3 / 365)
+    assert result["alpha"] == pytest.approx((result["tc"] - result["u"]) / (result["tc"] + 1))
+
+
+def test_phase_ladder_matches_thresholds(page_js):
+    labels = page_js(
+        "[0, 0.0099, 0.01, 0.0299, 0.03, 0.06, 5, NaN].map("
+        "r => PHASES[DEFAULT_PROFILE.thresholds.filter(t => r >= t).length].label)"
+    )
+    assert labels == [
+        "EXTREMAMENTE SEGURO",
+        "EXTREMAMENTE SEGURO",
+        "SEGURO",
+        "SEGURO",
+        "ALERTA",
+        "FALHA IMINENTE",
+        "FALHA IMINENTE",
+        "EXTREMAMENTE SEGURO",
+    ]
+
+
+def test_live_mode_coalesces_input_events():
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("Node.js não encontrado")
+    page = page_text()
+    start = page.index("function scheduleLiveUpdate")
+    source = page[start : page.index("\n        }\n", start) + 10]
+    # Três eventos no mesmo quadro viram um único recálculo
+    script = (
+        "let pendingFrame = 0, evaluations = 0; const frames = [];"
+        "const document = { getElementById: () => ({ checked: true }) };"
+        "function requestAnimationFrame(callback) { frames.push(callback); return frames.length; }"
+        "function evaluate(silent) { evaluations += silent ? 1 : 100; }"
+        + source
+        + "scheduleLiveUpdate(); scheduleLiveUpdate(); scheduleLiveUpdate();"
+        "frames.splice(0).forEach(callback => callback());"
+        "scheduleLiveUpdate(); frames.splice(0).forEach(callback => callback());"
+        "process.stdout.write(String(evaluations));"
+    )
+    completed = subprocess.run([node, "-e", script], capture_output=True, text=True, check=True)
+    assert completed.stdout == "2"
+
+
+# Roda o BATCH_WORKER_SOURCE da página num contexto vm vazio, como num Web
+# Worker: só enxerga as funções que o próprio worker carrega. A entrada
+# ({source, profiles}) vem pelo stdin, no formato enviado pelo Streamlit.
+WORKER_HARNESS = """
+const vm = require('vm');
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const messages = [];
+const context = vm.createContext({
+    performance,
+    postMessage: (message, transfer) =>
+        messages.push({ message, transfer: (transfer || []).length })
+});
+vm.runInContext(BATCH_WORKER_SOURCE, context);
+const profileNames = Object.keys(input.profiles).filter(name => name !== 'default');
+const profileList = profileNames.map(name => input.profiles[name])
+    .concat([input.profiles['default']]);
+context.onmessage({ data: { source: input.source, profileNames, profileList } });
+const plain = value => ArrayBuffer.isView(value)
+    ? Array.from(value, x => Number.isFinite(x) ? x : String(x)) : value;
+process.stdout.write(JSON.stringify(messages.map(({ message, transfer }) => Object.assign(
+    Object.fromEntries(Object.entries(message).map(([key, value]) => [key, plain(value)])),
+    { transfer }
+))));
+"""
+
+PROFILES = ProfileSet(
+    {
+        "profiles": {
+            "Aeroespacial": {"risk_scale": 2.0},
+            "Propulsor": {"window_days": 730},
+            "Gerador": {"hours_per_day": 12, "thresholds": [0.02, 0.05, 0.1]},
+        }
+    }
+)
+
+
+@pytest.fixture(scope="session")
+def batch_worker():
+    """Executa o worker de lote sobre um CSV e devolve as mensagens postadas."""
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("Node.js não encontrado")
+    page = page_text()
+    start = page.index(PAGE_JS_START)
+    pure = page[start : page.index(PAGE_JS_END, start)]
+    start = page.index("function parseCsv")
+    worker = page[start : page.index("\n", page.index("onmessage = batchWorkerMain;", start))]
+
+    def run(source, profiles=PROFILES):
+        completed = subprocess.run(
+            [node, "-e", pure + worker + WORKER_HARNESS],
+            input=json.dumps({"source": source, "profiles": profiles.as_dict()}),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(completed.stdout)
+
+    return run
+
+
+def fleet_csv(n):
+    """CSV de n motores (tipos em rodízio, incluindo desconhecido) e suas colunas."""
+    failures, tc_days, u_hours = synthetic_fleet(n, seed=2)
+    # Casos de borda: tc = 0, u = 0 e Γ negativa (NaN)
+    tc_days[:3] = (0.0, 10.0, 0.0)
+    u_hours[:3] = (6.0, 0.0, 0.001)
+    types = np.resize(np.array(ENGINE_TYPES + ("Turbina",), dtype=object), n)
+    lines = ["engine_id,engineType,failures,tc_days,u_hours"]
+    lines += [
+        f"E{i},{kind},{f!r},{t!r},{u!r}"
+        for i, (kind, f, t, u) in enumerate(
+            zip(types, failures.tolist(), tc_days.tolist(), u_hours.tolist())
+        )
+    ]
+    return "\n".join(lines) + "\n", (failures, tc_days, u_hours, types)
+
+
+def done(messages):
+    (result,) = [m for m in messages if m["type"] == "done"]
+    return result
+
+
+def test_batch_worker_matches_profile_kernel(batch_worker):
+    text, (failures, tc_days, u_hours, types) = fleet_csv(500)
+    result = done(batch_worker(text))
+    codes = encode_engine_types(types)
+    _, expected = PROFILES.compute_log_r(failures, tc_days, u_hours, codes)
+    r = np.array(result["R"], dtype=float)
+
+    assert result["n"] == 500 and result["invalid"] == 0
+    np.testing.assert_allclose(r, expected, rtol=LOG_SPACE_TOLERANCE, atol=0)
+    assert r[0] == 0 and r[1] == 0 and np.isnan(r[2])
+    # Perfil desconhecido vira o último da lista (padrão)
+    np.testing.assert_array_equal(result["codes"], np.where(codes < 0, 4, codes))
+    # Fase pelos limiares do perfil de cada linha, com NaN na fase 0
+    phase = PROFILES.classify_phase(r, codes)
+    np.testing.assert_array_equal(result["phase"], phase)
+    assert result["counts"] == np.bincount(phase, minlength=4).tolist()
+    assert result["transfer"] == 7
+
+
+def test_batch_worker_returns_ids_as_offsets(batch_worker):
+    result = done(batch_worker("engine_id,failures,tc_days,u_hours\nA1,1,2,3\nB22,1,2,3\n"))
+    assert result["hasIds"] and result["idText"] == "A1B22"
+    assert result["idOffsets"] == [0, 2, 5]
+
+
+def test_batch_worker_reads_semicolon_csv(batch_worker):
+    text = (
+        "\ufeff\"u_hours\";\"tc_days\";\"failures\";\"engineType\"\r\n"
+        "8,5;120;3;\"Gerador\"\r\n"
+        "\r\n"
+        "18;;2;Combustão\r\n"
+        "6\r\n"
+    )
+    result = done(batch_worker(text))
+    assert result["n"] == 3 and result["invalid"] == 2 and not result["hasIds"]
+    assert result["uHours"] == [8.5, 18, 6]
+    assert result["tcDays"] == [120, "NaN", "NaN"]
+    assert result["codes"] == [3, 0, 4]
+
+
+def test_batch_worker_unquotes_numbers(batch_worker):
+    text = 'failures,tc_days,u_hours\n"3","700", 18 \n"","700","18"\n'
+    result = done(batch_worker(text))
+    assert result["failures"] == [3, "NaN"] and result["tcDays"] == [700, 700]
+    assert result["uHours"] == [18, 18] and result["invalid"] == 1
+    _, r = compute_log_r(3.0, 700.0, 18.0)
+    assert result["R"][0] == pytest.approx(float(r), rel=LOG_SPACE_TOLERANCE)
+    semicolon = done(batch_worker('failures;tc_days;u_hours\n"3";"700";"8,5"\n'))
+    assert semicolon["uHours"] == [8.5] and semicolon["invalid"] == 0
+
+
+def test_batch_worker_reports_missing_columns(batch_worker):
+    messages = batch_worker("failures,u_hours\n1,2\n")
+    assert messages == [
+        {
+            "type": "error",
+            "message": "Colunas obrigatórias ausentes no CSV: tc_days",
+            "transfer": 0,
+        }
+    ]
+
+
+def test_batch_worker_reports_progress(batch_worker):
+    text, _ = fleet_csv(70_000)
+    messages = batch_worker(text)
+    progress = [m for m in messages if m["type"] == "progress"]
+    assert {m["stage"] for m in progress} == {"parsing", "scoring"}
+    assert all(0 < m["fraction"] <= 1 for m in progress)
+    assert messages[-1]["type"] == "done" and messages[-1]["n"] == 70_000
@@ -0,0 +1,58 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from quimera.kernel import classify_phase, compute_log_r
+from quimera.parallel import SharedColumns, score_parallel, score_shared
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def fleet(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(0, 21, n).astype(np.float64),
+        rng.uniform(0.0, 7000.0, n),
+        rng.uniform(0.0, 24.0, n),
+    )
+
+
+def test_score_parallel_matches_serial(executor):
+    failures, tc_days, u_hours = fleet(10_001)
+    r, phase = score_parallel(failures, tc_days, u_hours, workers=3, executor=executor)
+    _, expected = compute_log_r(failures, tc_days, u_hours)
+    np.testing.assert_array_equal(r, expected)
+    np.testing.assert_array_equal(phase, classify_phase(expected))
+    assert phase.dtype == np.int8
+
+
+def test_score_parallel_broadcasts(executor):
+    tc_days = np.array([[10.0, 700.0], [7000.0, 0.0]])
+    r, phase = score_parallel(3.0, tc_days, 18.0, executor=executor)
+    assert r.shape == phase.shape == (2, 2)
+    np.testing.assert_array_equal(r, compute_log_r(3.0, tc_days, 18.0)[1])
+
+
+def test_score_shared_writes_in_place(executor):
+    failures, tc_days, u_hours = fleet(1000)
+    with SharedColumns(1000) as columns:
+        columns.failures[:] = failures
+        columns.tc_days[:] = tc_days
+        columns.u_hours[:] = u_hours
+        assert score_shared(columns, workers=4, executor=executor) == 1000
+        np.testing.assert_array_equal(columns.r, compute_log_r(failures, tc_days, u_hours)[1])
+
+
+def test_score_parallel_empty_fleet(executor):
+    r, phase = score_parallel([], [], [], executor=executor)
+    assert r.shape == phase.shape == (0,)
+
+
+def test_score_parallel_owns_pool_without_executor():
+    r, _ = score_parallel([3.0], [7000.0], [18.0], workers=1)
+    np.testing.assert_array_equal(r, compute_log_r(3.0, 7000.0, 18.0)[1].reshape(1))
@@ -0,0 +1,134 @@
+import math
+
+import numpy as np
+import pytest
+
+from quimera.bands import PhaseIndex
+from quimera.forecast import forecast_phases, time_to_threshold
+from quimera.kernel import PHASE_LABELS, classify_phase, compute_log_r
+from quimera.parallel import score_parallel
+from quimera.profiles import (
+    ENGINE_TYPES,
+    UNKNOWN_ENGINE_TYPE,
+    ProfileSet,
+    encode_engine_types,
+    load_profiles,
+)
+from quimera.scheduler import MaintenanceScheduler
+from quimera.state import FleetState
+from quimera.uncertainty import r_uncertainty
+
+CONFIG = {
+    "profiles": {
+        "Aeroespacial": {"risk_scale": 2.0},
+        "Propulsor": {"window_days": 730},
+        "Gerador": {"hours_per_day": 12, "thresholds": [0.02, 0.05, 0.1]},
+    }
+}
+
+# Combustão, Aeroespacial, Propulsor, Gerador e desconhecido
+CODES = np.array([0, 1, 2, 3, UNKNOWN_ENGINE_TYPE], np.int8)
+FAILURES = np.array([3.0, 3.0, 3.0, 3.0, 3.0])
+TC_DAYS = np.array([700.0, 700.0, 700.0, 700.0, 700.0])
+U_HOURS = np.array([18.0, 18.0, 18.0, 18.0, 18.0])
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    return ProfileSet(CONFIG)
+
+
+def test_encode_engine_types():
+    codes = encode_engine_types(list(ENGINE_TYPES) + ["Outro", None])
+    np.testing.assert_array_equal(codes, [0, 1, 2, 3, -1, -1])
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"profiles": {"Turbina": {}}},
+        {"profiles": {"Gerador": {"escala": 2}}},
+        {"profiles": {"Gerador": {"thresholds": [0.03, 0.01, 0.06]}}},
+    ],
+)
+def test_invalid_config(config):
+    with pytest.raises(ValueError):
+        ProfileSet(config)
+
+
+def test_packaged_profiles_match_default_model():
+    profiles = load_profiles()
+    _, r = profiles.compute_log_r(FAILURES, TC_DAYS, U_HOURS, CODES)
+    np.testing.assert_array_equal(r, compute_log_r(FAILURES, TC_DAYS, U_HOURS)[1])
+    assert profiles.digest != ProfileSet(CONFIG).digest
+
+
+def test_grouped_scoring_uses_each_profile(profiles):
+    log_r, r = profiles.compute_log_r(FAILURES, TC_DAYS, U_HOURS, CODES)
+    base = compute_log_r(3.0, 700.0, 18.0)[0]
+    assert log_r[0] == log_r[4] == base
+    assert log_r[1] == pytest.approx(base + math.log(2.0), rel=1e-12)
+    assert log_r[2] == compute_log_r(3.0, 700.0, 18.0, window_days=730)[0]
+    assert log_r[3] == compute_log_r(3.0, 700.0, 18.0, hours_per_day=12)[0]
+    phase = profiles.classify_phase(r, CODES)
+    expected = [
+        np.searchsorted(profiles.thresholds[code], value, side="right")
+        for code, value in zip(CODES, r)
+    ]
+    np.testing.assert_array_equal(phase, expected)
+
+
+def test_forecast_uses_profile_kernel_and_thresholds(profiles):
+    forecast = forecast_phases(FAILURES, 10.0, U_HOURS, profiles=profiles, codes=CODES)
+    days = forecast[PHASE_LABELS[3]]
+    _, r = profiles.compute_log_r(FAILURES, 10.0 + days, U_HOURS, CODES)
+    np.testing.assert_allclose(r, profiles.thresholds[CODES, -1], rtol=1e-5)
+    # Sem profiles continua valendo o modelo padrão
+    np.testing.assert_array_equal(
+        forecast_phases(FAILURES, 10.0, U_HOURS)[PHASE_LABELS[3]][[0, 4]], days[[0, 4]]
+    )
+
+
+def test_scheduler_span_follows_profiles(profiles):
+    scheduler = MaintenanceScheduler(1, profiles=profiles)
+    scheduler.load(list("ABCDE"), FAILURES, TC_DAYS, U_HOURS, codes=CODES)
+    expected = time_to_threshold(
+        FAILURES, 0.0, U_HOURS, profiles.thresholds[CODES, -1], profiles=profiles, codes=CODES
+    )
+    np.testing.assert_array_equal(scheduler.span, expected)
+    scheduler.update("D", 5.0, failures=4.0)
+    expected_d = time_to_threshold(4.0, 0.0, 18.0, 0.1, profiles=profiles, codes=3)
+    assert scheduler.span[3] == expected_d
+
+
+def test_uncertainty_applies_risk_scale(profiles):
+    kwargs = dict(samples=64, seed=7)
+    scaled = r_uncertainty(3.0, 700.0, 18.0, profiles=profiles, codes=1, **kwargs)
+    plain = r_uncertainty(3.0, 700.0, 18.0, **kwargs)
+    np.testing.assert_allclose(scaled["P50"], 2 * plain["P50"], rtol=1e-12)
+
+
+def test_score_parallel_with_profiles(profiles):
+    r, phase = score_parallel(
+        FAILURES, TC_DAYS, U_HOURS, workers=2, profiles=profiles, codes=CODES
+    )
+    _, expected = profiles.compute_log_r(FAILURES, TC_DAYS, U_HOURS, CODES)
+    np.testing.assert_array_equal(r, expected)
+    np.testing.assert_array_equal(phase, profiles.classify_phase(expected, CODES))
+
+
+def test_state_scalar_and_batch_paths_use_profiles(profiles):
+    state = FleetState(profiles=profiles)
+    for row, code in enumerate(CODES.tolist()):
+        state.register(f"E-{row}", 0.0, 18.0, tc_days=700.0, code=code)
+    single = [state.on_failure(f"E-{row}", 0.0) for row in range(len(CODES))]
+    _, expected = profiles.compute_log_r(1.0, TC_DAYS, U_HOURS, CODES)
+    np.testing.assert_allclose(single, expected, rtol=1e-12)
+    np.testing.assert_allclose(state.rescore_all(0.0), expected, rtol=1e-12)
+
+
+def test_phase_index_with_profile_thresholds(profiles):
+    r = np.array([0.015, 0.04, 0.07, 0.2])
+    index = PhaseIndex(r, thresholds=profiles.thresholds[3])
+    np.testing.assert_array_equal(index.counts(), [1, 1, 1, 1])
+    np.testing.assert_array_equal(PhaseIndex(r).counts(), np.bincount(classify_phase(r)))
@@ -0,0 +1,17 @@
+import numpy as np
+
+from quimera.sample import synthetic_fleet
+
+
+def test_synthetic_fleet_is_in_form_range():
+    failures, tc_days, u_hours = synthetic_fleet(10_000, seed=1)
+    assert failures.min() >= 0 and failures.max() <= 20
+    assert tc_days.min() >= 0 and tc_days.max() <= 7000
+    assert u_hours.min() >= 0.1 and u_hours.max() <= 24
+
+
+def test_synthetic_fleet_is_reproducible():
+    first = synthetic_fleet(100, seed=3)
+    second = synthetic_fleet(100, seed=3)
+    for a, b in zip(first, second):
+        np.testing.assert_array_equal(a, b)
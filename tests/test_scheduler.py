@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from quimera.forecast import time_to_threshold
+from quimera.kernel import compute_log_r
+from quimera.profiles import UNKNOWN_ENGINE_TYPE, ProfileSet
+from quimera.scheduler import FAILURE_THRESHOLD, MaintenanceScheduler, _repair_span
+
+ENGINE_IDS = ["E-1", "E-2", "E-3"]
+FAILURES = [3.0, 10.0, 0.0]
+TC_DAYS = [1000.0, 10.0, 50.0]
+U_HOURS = [18.0, 12.0, 24.0]
+
+
+def make_scheduler(capacity=1, lookahead_days=90.0):
+    scheduler = MaintenanceScheduler(capacity, lookahead_days)
+    scheduler.load(ENGINE_IDS, FAILURES, TC_DAYS, U_HOURS, day=0.0)
+    return scheduler
+
+
+def test_load_computes_due_days():
+    scheduler = make_scheduler()
+    span = time_to_threshold(FAILURES, 0.0, U_HOURS, FAILURE_THRESHOLD)
+    np.testing.assert_array_equal(scheduler.span, span)
+    for row, tc in enumerate(TC_DAYS):
+        assert scheduler.due(row) == pytest.approx(span[row] - tc)
+
+
+def test_repair_span_past_last_doubling():
+    # Span entre 2^15 = 32768 dias e o horizonte de 36500 dias
+    scale = FAILURE_THRESHOLD / compute_log_r(0.0, 34_000.0, 24.0)[1]
+    profiles = ProfileSet({"default": {"risk_scale": scale}})
+    span = _repair_span(0.0, 24.0, profiles, UNKNOWN_ENGINE_TYPE)
+    assert span == pytest.approx(34_000.0, abs=1e-2)
+
+
+def test_dispatch_serves_earliest_due_within_capacity():
+    scheduler = make_scheduler(capacity=1, lookahead_days=1e6)
+    order = sorted(range(3), key=scheduler.due)
+    finite = [row for row in order if np.isfinite(scheduler.due(row))]
+    repairs = scheduler.dispatch(0.0)
+    assert [engine_id for engine_id, _ in repairs] == [ENGINE_IDS[finite[0]]]
+    # O motor reparado volta para a fila com tc = 0
+    assert scheduler.last_repair[finite[0]] == 0.0
+
+
+def test_dispatch_respects_lookahead():
+    scheduler = make_scheduler(capacity=3, lookahead_days=0.0)
+    repairs = scheduler.dispatch(0.0)
+    assert all(due <= 0.0 for _, due in repairs)
+
+
+def test_update_discards_stale_entries():
+    scheduler = make_scheduler(capacity=3, lookahead_days=1e6)
+    scheduler.update("E-1", 5.0, repaired=True)
+    scheduler.update("E-2", 5.0, failures=0.0)
+    assert scheduler.span[1] == _repair_span(0.0, 12.0)
+    assert len(scheduler.heap) == 5  # 3 da carga + 2 reagendamentos
+    repairs = dict(scheduler.dispatch(5.0))
+    # Uma única entrada por motor, com o 'due' mais recente
+    assert sorted(repairs) == ENGINE_IDS
+    assert repairs["E-1"] == pytest.approx(5.0 + scheduler.span[0])
+    assert repairs["E-2"] == pytest.approx(scheduler.span[1] - TC_DAYS[1])
+
+
+def test_engine_is_repaired_at_most_once_per_day():
+    scheduler = make_scheduler(capacity=10, lookahead_days=1e6)
+    repairs = scheduler.dispatch(0.0)
+    assert len(repairs) == len({engine_id for engine_id, _ in repairs}) == 3
+
+
+def test_plan_does_not_mutate_scheduler():
+    scheduler = make_scheduler(capacity=1)
+    heap, last_repair = list(scheduler.heap), scheduler.last_repair.copy()
+    schedule, cost = scheduler.plan(0, 10)
+    assert [day for day, _ in schedule] == list(range(10))
+    assert cost >= 0.0
+    assert scheduler.heap == heap
+    np.testing.assert_array_equal(scheduler.last_repair, last_repair)
+
+
+def test_more_capacity_never_costs_more():
+    _, cost_one = make_scheduler(capacity=1).plan(0, 30)
+    _, cost_three = make_scheduler(capacity=3).plan(0, 30)
+    assert cost_three <= cost_one
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from quimera.kernel import compute_log_r
+from quimera.profiles import ENGINE_TYPES, UNKNOWN_ENGINE_TYPE, ProfileSet
+from quimera.sensitivity import compute_sensitivities
+
+# tc > u (caso comum), tc < u (tc de minutos) e α grande
+FAILURES = np.array([3.0, 5.0, 20.0])
+TC_DAYS = np.array([700.0, 0.005, 7000.0])
+U_HOURS = np.array([18.0, 10.0, 0.5])
+
+
+def central_difference(argument, kwargs):
+    inputs = [FAILURES, TC_DAYS, U_HOURS]
+    step = 1e-6 * inputs[argument]
+    up, down = list(inputs), list(inputs)
+    up[argument] = inputs[argument] + step
+    down[argument] = inputs[argument] - step
+    return (compute_log_r(*up, **kwargs)[1] - compute_log_r(*down, **kwargs)[1]) / (2 * step)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"hours_per_day": 12, "window_days": 730.0}])
+@pytest.mark.parametrize("argument, name", [(0, "failures"), (1, "tc_days"), (2, "u_hours")])
+def test_matches_finite_differences(argument, name, kwargs):
+    log_r, r, derivatives = compute_sensitivities(FAILURES, TC_DAYS, U_HOURS, **kwargs)
+    np.testing.assert_array_equal(r, compute_log_r(FAILURES, TC_DAYS, U_HOURS, **kwargs)[1])
+    np.testing.assert_allclose(
+        derivatives[name], central_difference(argument, kwargs), rtol=1e-5
+    )
+
+
+def test_profiles_scale_derivatives_with_r():
+    profiles = ProfileSet(
+        {
+            "profiles": {
+                "Aeroespacial": {"risk_scale": 2.0},
+                "Gerador": {"hours_per_day": 12, "window_days": 730},
+            }
+        }
+    )
+    codes = np.array(
+        [ENGINE_TYPES.index("Aeroespacial"), ENGINE_TYPES.index("Gerador"), UNKNOWN_ENGINE_TYPE],
+        np.int8,
+    )
+    _, r, derivatives = compute_sensitivities(
+        FAILURES, TC_DAYS, U_HOURS, profiles=profiles, codes=codes
+    )
+    np.testing.assert_array_equal(
+        r, profiles.compute_log_r(FAILURES, TC_DAYS, U_HOURS, codes)[1]
+    )
+    inputs = [FAILURES, TC_DAYS, U_HOURS]
+    for argument, name in enumerate(("failures", "tc_days", "u_hours")):
+        step = 1e-6 * inputs[argument]
+        up, down = list(inputs), list(inputs)
+        up[argument] = inputs[argument] + step
+        down[argument] = inputs[argument] - step
+        expected = (
+            profiles.compute_log_r(*up, codes)[1] - profiles.compute_log_r(*down, codes)[1]
+        ) / (2 * step)
+        np.testing.assert_allclose(derivatives[name], expected, rtol=1e-5)
+    # risk_scale 2: o dobro das derivadas do modelo padrão
+    default = compute_sensitivities(FAILURES[0], TC_DAYS[0], U_HOURS[0])[2]
+    for name, values in derivatives.items():
+        assert values[0] == pytest.approx(2 * default[name], rel=1e-12)
+
+
+def test_zero_r_has_zero_derivatives():
+    _, r, derivatives = compute_sensitivities([3.0, 3.0], [0.0, 100.0], [12.0, 0.0])
+    np.testing.assert_array_equal(r, [0.0, 0.0])
+    for values in derivatives.values():
+        np.testing.assert_array_equal(values, [0.0, 0.0])
+
+
+def test_broadcasts_scalars():
+    _, r, derivatives = compute_sensitivities(3.0, [10.0, 700.0], 18.0)
+    assert r.shape == (2,)
+    assert all(values.shape == (2,) for values in derivatives.values())
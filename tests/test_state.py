@@ -0,0 +1,127 @@
+import math
+
+import numpy as np
+import pytest
+
+from quimera.kernel import compute_r, log_r_scalar
+from quimera.profiles import ENGINE_TYPES, ProfileSet
+from quimera.state import SECONDS_PER_DAY, FleetState
+
+DAY = SECONDS_PER_DAY
+
+
+def make_state():
+    state = FleetState(capacity=2)
+    state.register("E-1", 0.0, u_hours=12.0)
+    return state
+
+
+def test_failures_expire_after_window():
+    state = make_state()
+    state.on_failure("E-1", 10 * DAY)
+    state.on_failure("E-1", 20 * DAY)
+    r = state.on_usage("E-1", 376 * DAY, 12.0)
+    failures, tc_days, u_hours = state.inputs(376 * DAY)
+    assert failures[0] == 1.0
+    assert r == pytest.approx(float(compute_r(1.0, 376.0, 12.0)), rel=1e-9)
+
+
+def test_failures_expire_after_profile_window():
+    profiles = ProfileSet({"profiles": {"Propulsor": {"window_days": 730}}})
+    state = FleetState(profiles=profiles)
+    state.register("E-1", 0.0, u_hours=12.0, code=ENGINE_TYPES.index("Propulsor"))
+    state.on_failure("E-1", 10 * DAY)
+    state.on_failure("E-1", 20 * DAY)
+    # Em 400 dias as duas falhas seguem na janela de 730 dias
+    r = state.on_usage("E-1", 400 * DAY, 12.0)
+    assert state.columns["failures"][0] == 2
+    assert r == pytest.approx(math.exp(log_r_scalar(2.0, 400.0, 12.0, 24, 730)), rel=1e-9)
+    state.on_usage("E-1", 745 * DAY, 12.0)
+    assert list(state.windows[0]) == [20 * DAY]
+
+
+def test_out_of_order_failure_expires_in_order():
+    state = make_state()
+    state.on_failure("E-1", 300 * DAY)
+    state.on_failure("E-1", 10 * DAY)  # chega atrasada
+    assert list(state.windows[0]) == [10 * DAY, 300 * DAY]
+    # Em 400 dias só a falha do dia 10 saiu da janela
+    state.on_usage("E-1", 400 * DAY, 12.0)
+    assert state.columns["failures"][0] == 1
+    assert list(state.windows[0]) == [300 * DAY]
+
+
+def test_late_events_do_not_rewind_state():
+    state = make_state()
+    state.on_repair("E-1", 100 * DAY)
+    state.on_repair("E-1", 50 * DAY)
+    assert state.columns["last_repair"][0] == 100 * DAY
+    state.on_usage("E-1", 200 * DAY, 12.0)
+    r = state.on_failure("E-1", 150 * DAY)
+    assert state.columns["updated"][0] == 200 * DAY
+    assert r == pytest.approx(float(compute_r(1.0, 100.0, 12.0)), rel=1e-9)
+
+
+def test_apply_events_matches_single_events():
+    events = [
+        ("failure", "E-1", 30 * DAY, None),
+        ("usage", "E-2", 40 * DAY, 6.0),
+        ("failure", "E-1", 5 * DAY, None),
+        ("repair", "E-1", 20 * DAY, None),
+        ("failure", "E-2", 35 * DAY, None),
+    ]
+    batch = FleetState(capacity=1)
+    batch.apply_events(events)
+
+    single = FleetState()
+    single.register("E-1", 30 * DAY, math.nan)
+    single.register("E-2", 40 * DAY, math.nan)
+    for kind, engine_id, ts, u_hours in events:
+        if kind == "failure":
+            single.on_failure(engine_id, ts)
+        elif kind == "repair":
+            single.on_repair(engine_id, ts)
+        else:
+            single.on_usage(engine_id, ts, u_hours)
+
+    assert batch.engine_ids == ["E-1", "E-2"]
+    for name in ("failures", "last_repair", "updated"):
+        np.testing.assert_array_equal(batch.columns[name][:2], single.columns[name][:2])
+    assert list(batch.windows[0]) == [5 * DAY, 30 * DAY]
+    # E-1 nunca recebeu uso: R = 0 nos dois caminhos, como u <= 0
+    assert batch.r("E-1") == single.r("E-1") == 0.0
+    assert batch.r("E-2") == pytest.approx(single.r("E-2"), rel=1e-9)
+
+
+def test_nan_log_r_is_not_inf():
+    # tc = 0 e u < e^-2 min: α = ln u < -2 e Γ(α + 2) negativa gera NaN
+    state = FleetState()
+    state.register("E-1", 0.0, u_hours=0.001)
+    assert math.isnan(state.r("E-1"))
+
+
+def test_r_near_float_max_stays_finite():
+    # log R entre 709 e ln(float64 máx) ≈ 709.78: R ainda é finito
+    base = log_r_scalar(3650.0, 100.0, 12.0)
+    profiles = ProfileSet({"default": {"risk_scale": math.exp(709.5 - base)}})
+    state = FleetState(profiles=profiles)
+    state.register("E-1", 0.0, u_hours=12.0, tc_days=100.0)
+    # Caminho escalar (on_failure), que converte log R um motor por vez
+    for _ in range(3650):
+        r = state.on_failure("E-1", 0.0)
+    assert r == pytest.approx(math.exp(709.5), rel=1e-9)
+
+
+def test_state_grows_past_capacity():
+    state = FleetState(capacity=1)
+    for number in range(5):
+        state.register(f"E-{number}", 0.0, u_hours=12.0, tc_days=100.0)
+    assert len(state) == 5
+    np.testing.assert_allclose(
+        state.rescore_all(0.0), compute_r(0.0, 100.0, 12.0), rtol=1e-9
+    )
+
+
+def test_unknown_event_kind():
+    with pytest.raises(ValueError):
+        FleetState().apply_events([("overhaul", "E-1", 0.0, None)])
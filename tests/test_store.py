@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pytest
+
+from quimera.profiles import load_profiles
+from quimera.store import ENGINE_ID_BYTES, FleetStore
+
+FLEET_CSV = (
+    "engine_id,failures,tc_days,u_hours,engineType\n"
+    "007,3,7000,18,Combustão\n"
+    "E-101,0,10,4,\n"
+    "E-102,5,2000,20,Gerador\n"
+)
+
+
+@pytest.fixture
+def fleet_csv(tmp_path):
+    path = tmp_path / "frota.csv"
+    path.write_text(FLEET_CSV, encoding="utf-8")
+    return str(path)
+
+
+def expected_scores(store):
+    profiles = load_profiles()
+    codes = np.asarray(store.engine_type)
+    _, r = profiles.compute_log_r(store.failures, store.tc_days, store.u_hours, codes)
+    return r, profiles.classify_phase(r, codes)
+
+
+def test_import_and_reopen(tmp_path, fleet_csv):
+    store = FleetStore.import_fleet(str(tmp_path / "armazem"), fleet_csv, chunk_rows=2)
+    assert len(store) == 3
+    assert list(store.engine_id) == [b"007", b"E-101", b"E-102"]
+    r, phase = expected_scores(store)
+    np.testing.assert_array_equal(store.last_r, r)
+    np.testing.assert_array_equal(store.last_phase, phase)
+
+    reopened = FleetStore.open(str(tmp_path / "armazem"), mode="r")
+    assert isinstance(reopened.last_r, np.memmap)
+    np.testing.assert_array_equal(reopened.last_r, r)
+
+
+def test_advance_days_rescores_only_selected_rows(tmp_path, fleet_csv):
+    store = FleetStore.import_fleet(str(tmp_path / "armazem"), fleet_csv)
+    before = np.array(store.last_r)
+    store.advance_days(100.0, rows=[1])
+    np.testing.assert_array_equal(store.tc_days, [7000.0, 110.0, 2000.0])
+    assert store.last_r[0] == before[0] and store.last_r[2] == before[2]
+    np.testing.assert_array_equal(store.last_r, expected_scores(store)[0])
+
+
+def test_update_with_repair(tmp_path, fleet_csv):
+    store = FleetStore.import_fleet(str(tmp_path / "armazem"), fleet_csv)
+    store.update([0], failures=4.0, repaired=True)
+    assert store.failures[0] == 4.0 and store.tc_days[0] == 0.0
+    assert store.last_r[0] == 0.0 and store.phase_counts()[0] >= 1
+
+
+def test_rejects_engine_id_that_would_be_truncated(tmp_path):
+    source = tmp_path / "frota.csv"
+    long_id = "Ê" * (ENGINE_ID_BYTES // 2 + 1)  # cabe em caracteres, não em bytes
+    source.write_text(
+        f"engine_id,failures,tc_days,u_hours\nE-1,3,7000,18\n{long_id},1,365,12\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match=long_id):
+        FleetStore.import_fleet(str(tmp_path / "armazem"), str(source), chunk_rows=1)
+    # A validação acontece antes de qualquer arquivo ser criado
+    assert not os.path.exists(tmp_path / "armazem")
+
+
+def test_stale_model_version_is_rescored(tmp_path, fleet_csv):
+    path = str(tmp_path / "armazem")
+    store = FleetStore.import_fleet(path, fleet_csv)
+    expected = np.array(store.last_r)
+    store.last_r[:] = 0.0
+    store.meta["model_version"] = "antiga"
+    store._write_meta()
+    store.flush()
+    np.testing.assert_array_equal(FleetStore.open(path).last_r, expected)
@@ -0,0 +1,88 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from quimera.kernel import PHASE_LABELS, classify_phase, compute_log_r
+from quimera.stream import detect_format, iter_fleet_chunks, score_chunk, stream_score
+
+# IDs numéricos com zero à esquerda num bloco e alfanuméricos no seguinte
+MIXED_IDS_CSV = (
+    "engine_id,failures,tc_days,u_hours,engineType\n"
+    "007,3,7000,18,Combustão\n"
+    "012,1,365,12,Gerador\n"
+    "E-101,0,10,4,\n"
+    "E-102,5,2000,20,Propulsor\n"
+    "0099,2,0,8,Aeroespacial\n"
+)
+
+
+def run(source, sink, **kwargs):
+    for _ in stream_score(source, sink, chunk_rows=2, **kwargs):
+        pass
+
+
+def test_detect_format():
+    assert detect_format("frota.PARQUET") == "parquet"
+    assert detect_format("frota.pq") == "parquet"
+    assert detect_format("frota.csv") == "csv"
+
+
+def test_csv_reads_non_kernel_columns_as_text():
+    source = io.BytesIO(MIXED_IDS_CSV.encode())
+    chunks = [chunk for chunk, _ in iter_fleet_chunks(source, chunk_rows=2)]
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0]["engine_id"].tolist() == ["007", "012"]
+    assert chunks[0]["failures"].dtype == np.float64
+
+
+def test_mixed_id_types_across_chunks_csv_to_parquet(tmp_path):
+    source = tmp_path / "frota.csv"
+    source.write_text(MIXED_IDS_CSV, encoding="utf-8")
+    sink = tmp_path / "saida.parquet"
+    run(str(source), str(sink), fmt_out="parquet")
+
+    table = pq.read_table(sink)
+    assert table.num_rows == 5
+    assert table.column("engine_id").to_pylist() == ["007", "012", "E-101", "E-102", "0099"]
+
+
+def test_mixed_id_types_across_chunks_csv_to_csv(tmp_path):
+    sink = io.StringIO()
+    run(io.BytesIO(MIXED_IDS_CSV.encode()), sink)
+    lines = sink.getvalue().splitlines()
+    assert lines[0].startswith("engine_id,failures,tc_days,u_hours,engineType,R,log_R,phase")
+    assert [line.split(",")[0] for line in lines[1:]] == ["007", "012", "E-101", "E-102", "0099"]
+
+
+def test_parquet_round_trip(tmp_path):
+    fleet = pd.DataFrame(
+        {
+            "failures": [3.0, 1.0, 0.0],
+            "tc_days": [7000.0, 365.0, 10.0],
+            "u_hours": [18.0, 12.0, 4.0],
+        }
+    )
+    source = tmp_path / "frota.parquet"
+    fleet.to_parquet(source)
+    sink = tmp_path / "saida.parquet"
+    run(str(source), str(sink), fmt_in="parquet", fmt_out="parquet")
+
+    scored = pd.read_parquet(sink)
+    log_r, r = compute_log_r(fleet["failures"], fleet["tc_days"], fleet["u_hours"])
+    np.testing.assert_allclose(scored["R"], r)
+    np.testing.assert_array_equal(scored["phase"], classify_phase(r))
+
+
+def test_score_chunk_adds_columns():
+    chunk = pd.DataFrame({"failures": [3.0], "tc_days": [7000.0], "u_hours": [18.0]})
+    scored = score_chunk(chunk)
+    assert scored["R"].iloc[0] == pytest.approx(0.07784797579479119, rel=1e-9)
+    assert scored["status"].iloc[0] == PHASE_LABELS[scored["phase"].iloc[0]]
+
+
+def test_missing_required_column():
+    with pytest.raises(ValueError, match="u_hours"):
+        score_chunk(pd.DataFrame({"failures": [1.0], "tc_days": [2.0]}))
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from quimera.kernel import compute_r
+from quimera.sweep import decimate, sweep_r
+
+
+def test_sweep_orientation_matches_plotly():
+    tc_days = np.array([10.0, 700.0, 7000.0])
+    u_hours = np.array([1.0, 18.0])
+    r = sweep_r(3, tc_days, u_hours)
+    assert r.shape == (2, 3)
+    for row, u in enumerate(u_hours):
+        for column, tc in enumerate(tc_days):
+            assert r[row, column] == pytest.approx(float(compute_r(3, tc, u)), rel=1e-9)
+
+
+def test_decimate_keeps_small_grid():
+    z = np.arange(6.0).reshape(2, 3)
+    x = np.array([1.0, 2.0, 3.0])
+    y = np.array([0.5, 1.5])
+    reduced, rx, ry = decimate(z, x, y, max_x=3, max_y=2)
+    np.testing.assert_array_equal(reduced, z)
+    np.testing.assert_array_equal(rx, x)
+    np.testing.assert_array_equal(ry, y)
+
+
+def test_decimate_takes_block_maximum():
+    z = np.zeros((4, 4))
+    z[3, 0] = 1.0
+    reduced, rx, ry = decimate(z, np.arange(4.0), np.arange(4.0), max_x=2, max_y=2)
+    np.testing.assert_array_equal(reduced, [[0.0, 0.0], [1.0, 0.0]])
+    np.testing.assert_array_equal(rx, [0.5, 2.5])
+    np.testing.assert_array_equal(ry, [0.5, 2.5])
+
+
+def test_decimate_pads_uneven_edges():
+    # 5 colunas em blocos de 2: a última coluna é repetida, não descartada
+    z = np.array([[0.0, 0.0, 0.0, 0.0, 9.0]])
+    reduced, rx, _ = decimate(z, np.arange(5.0), np.array([0.0]), max_x=3, max_y=1)
+    np.testing.assert_array_equal(reduced, [[0.0, 0.0, 9.0]])
+    np.testing.assert_array_equal(rx, [0.5, 2.5, 4.0])
+
+
+def test_decimate_ignores_nan_cells():
+    z = np.array([[np.nan, 2.0], [1.0, np.nan]])
+    reduced, _, _ = decimate(z, np.arange(2.0), np.arange(2.0), max_x=1, max_y=1)
+    np.testing.assert_array_equal(reduced, [[2.0]])
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from scipy.stats import poisson
+
+from quimera.kernel import PHASE_LABELS, compute_log_r
+from quimera.uncertainty import (
+    MAX_U_HOURS,
+    _poisson_quantiles,
+    r_uncertainty,
+    sample_inputs,
+    sobol_points,
+)
+
+
+def test_sobol_points_round_up_to_power_of_two():
+    points = sobol_points(100, seed=1)
+    assert points.shape == (128, 2)
+    assert np.all((points >= 0) & (points < 1))
+    np.testing.assert_array_equal(points, sobol_points(100, seed=1))
+
+
+def test_poisson_quantiles_match_scipy():
+    q = np.linspace(0.001, 0.999, 50)
+    mu = np.array([0.0, 0.5, 3.0, 3.0, 40.0])
+    counts = _poisson_quantiles(q, mu)
+    assert counts.shape == (50, 5)
+    np.testing.assert_array_equal(counts, poisson.ppf(q[:, None], mu[None, :]))
+
+
+def test_poisson_quantiles_of_non_finite_means_are_nan():
+    counts = _poisson_quantiles(np.array([0.1, 0.9]), np.array([np.nan, 3.0, np.inf]))
+    assert np.isnan(counts[:, [0, 2]]).all()
+    np.testing.assert_array_equal(counts[:, 1], poisson.ppf([0.1, 0.9], 3.0))
+
+
+def test_malformed_row_gives_nan_bounds():
+    result = r_uncertainty([np.nan, 3.0], [700.0, 700.0], 12.0, samples=64, seed=6)
+    for key in ("P5", "P50", "P95"):
+        assert np.isnan(result[key][0]) and np.isfinite(result[key][1])
+
+
+def test_sample_inputs_clips_usage():
+    points = sobol_points(256, seed=2)
+    _, sampled_u = sample_inputs([3.0], [23.9], points, "uniform", 0.5)
+    assert sampled_u.max() == MAX_U_HOURS and sampled_u.min() > 0
+
+
+def test_sample_inputs_rejects_unknown_distribution():
+    with pytest.raises(ValueError, match="Distribuição"):
+        sample_inputs([3.0], [12.0], sobol_points(8, seed=0), "gamma", 0.1)
+
+
+def test_zero_noise_collapses_to_point_estimate():
+    # Sem falhas o Poisson é degenerado; spread 0 fixa o uso
+    result = r_uncertainty([0.0, 0.0], [700.0, 10.0], [18.0, 6.0], samples=64, u_spread=0.0)
+    _, r = compute_log_r([0.0, 0.0], [700.0, 10.0], [18.0, 6.0])
+    for key in ("P5", "P50", "P95"):
+        np.testing.assert_allclose(result[key], r, rtol=1e-12)
+
+
+def test_percentiles_and_phase_probabilities():
+    result = r_uncertainty([3.0, 10.0, 1.0], [7000.0, 100.0, 30.0], 12.0, samples=256, seed=4)
+    assert np.all(result["P5"] <= result["P50"]) and np.all(result["P50"] <= result["P95"])
+    assert result["phase_prob"].shape == (3, len(PHASE_LABELS))
+    np.testing.assert_allclose(result["phase_prob"].sum(axis=1), 1.0)
+
+
+def test_chunking_does_not_change_result():
+    inputs = (np.arange(10.0), np.linspace(10.0, 7000.0, 10), 12.0)
+    whole = r_uncertainty(*inputs, samples=128, seed=5)
+    chunked = r_uncertainty(*inputs, samples=128, seed=5, chunk_cells=300)
+    for key in whole:
+        np.testing.assert_array_equal(whole[key], chunked[key])